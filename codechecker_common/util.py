@@ -136,3 +136,19 @@ def trim_path_prefixes(path, prefixes):
         return path
 
     return path[len(longest_matching_prefix):]
+
+
+def chunks(iterator, n):
+    """
+    Yield the elements of the given iterator in lists which contain at most
+    n elements.
+    """
+    chunk = []
+    for item in iterator:
+        chunk.append(item)
+        if len(chunk) == n:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
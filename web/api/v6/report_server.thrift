@@ -10,6 +10,7 @@ namespace py codeCheckerDBAccess_v6
 namespace js codeCheckerDBAccess_v6
 
 const i64 MAX_QUERY_SIZE = 500
+const i64 MAX_REPORT_DETAILS_BATCH_SIZE = 5000
 
 
 /**
@@ -79,6 +80,17 @@ enum StoreLimitKind {
   COMPILATION_DATABASE_SIZE // Limit of the compilation database file size.
 }
 
+/**
+ * State of a store operation which was submitted to the store queue of the
+ * server.
+ */
+enum StoreTaskStatus {
+  ENQUEUED,  // The store is waiting for a free store worker or for the previous store into the same run.
+  RUNNING,   // The store is being processed by a store worker.
+  COMPLETED, // The run has been stored successfully.
+  FAILED     // The store has failed, see the error fields of StoreTaskInfo.
+}
+
 enum ExtendedReportDataType {
   NOTE  = 0,
   MACRO = 10,
@@ -222,6 +234,12 @@ struct ReportData {
 }
 typedef list<ReportData> ReportDataList
 
+struct ReportDataPage {
+  1: ReportDataList reports,    // Reports of the page.
+  2: optional string nextCursor // Cursor of the next page. It is not set if
+                                // there are no more reports.
+}
+
 struct BugPathLengthRange {
   1: i64  min, // Minimum value of bug path length.
   2: i64  max, // Maximum value of bug path length.
@@ -263,6 +281,32 @@ struct CheckerCount {
 }
 typedef list<CheckerCount> CheckerCounts
 
+/**
+ * Report counts which can be requested together by getReportFacets().
+ */
+enum ReportFacet {
+  REPORT_COUNT,     // Number of reports, see getRunResultCount().
+  SEVERITY,         // See getSeverityCounts().
+  CHECKER_NAME,     // See getCheckerCounts().
+  CHECKER_MSG,      // See getCheckerMsgCounts().
+  REVIEW_STATUS,    // See getReviewStatusCounts().
+  DETECTION_STATUS, // See getDetectionStatusCounts().
+  FILE,             // See getFileCounts().
+  RUN_HISTORY_TAG   // See getRunHistoryTagCounts().
+}
+
+// Only the fields of the requested facets are set.
+struct ReportFacets {
+  1: i64                       reportCount,
+  2: map<Severity, i64>        severityCounts,
+  3: CheckerCounts             checkerCounts,
+  4: map<string, i64>          checkerMsgCounts,
+  5: map<ReviewStatus, i64>    reviewStatusCounts,
+  6: map<DetectionStatus, i64> detectionStatusCounts,
+  7: map<string, i64>          fileCounts,
+  8: RunTagCounts              runHistoryTagCounts
+}
+
 struct CommentData {
   1: i64     id,
   2: string  author,
@@ -313,6 +357,18 @@ struct SourceComponentData {
 }
 typedef list<SourceComponentData> SourceComponentDataList
 
+struct StoreTaskInfo {
+  1: string              token,        // Identifier of the store operation.
+  2: string              runName,      // Name of the run which is stored into.
+  3: StoreTaskStatus     status,
+  4: i64                 runId,        // ID of the stored run if the store has completed.
+  5: i64                 enqueuedAt,   // Timestamp (seconds) of the submission.
+  6: i64                 finishedAt,   // Timestamp (seconds) of the completion or failure.
+  7: shared.ErrorCode    errorCode,    // Set if the store has failed.
+  8: string              errorMessage, // Set if the store has failed.
+  9: list<string>        errorInfo     // Extra information of the failure (e.g. wrong source code comments).
+}
+
 service codeCheckerDBAccess {
 
   // Gives back all analyzed runs.
@@ -376,6 +432,21 @@ service codeCheckerDBAccess {
                                7: optional bool  getDetails)
                                throws (1: shared.RequestFailed requestError),
 
+  // Get the results for some runIds page by page. The first page is returned
+  // if no cursor is given, and the nextCursor of a page has to be given to
+  // get the next one with the same other arguments. The pages are not
+  // affected by reports stored or removed in the meantime before the cursor.
+  // The reports are ordered by their ID after the given sort types.
+  // PERMISSION: PRODUCT_ACCESS
+  ReportDataPage getRunResultsPage(1: list<i64>      runIds,
+                                   2: i64            limit,
+                                   3: string         cursor,
+                                   4: list<SortMode> sortType,
+                                   5: ReportFilter   reportFilter,
+                                   6: CompareData    cmpData,
+                                   7: optional bool  getDetails)
+                                   throws (1: shared.RequestFailed requestError),
+
 
   // Count the results separately for multiple runs.
   // If an empty run id list is provided the report
@@ -399,6 +470,13 @@ service codeCheckerDBAccess {
   ReportDetails getReportDetails(1: i64 reportId)
                                  throws (1: shared.RequestFailed requestError),
 
+  // Get the details of multiple reports in one request. The key of the
+  // result map is a report id. At most MAX_REPORT_DETAILS_BATCH_SIZE report
+  // ids can be given.
+  // PERMISSION: PRODUCT_ACCESS
+  map<i64, ReportDetails> getReportDetailsBatch(1: list<i64> reportIds)
+                                                throws (1: shared.RequestFailed requestError),
+
   // get file information, if fileContent is true the content of the source
   // file will be also returned
   // PERMISSION: PRODUCT_ACCESS
@@ -557,6 +635,20 @@ service codeCheckerDBAccess {
                                       3: CompareData  cmpData)
                                       throws (1: shared.RequestFailed requestError),
 
+  // Returns the requested report counts of getRunResultCount(),
+  // getSeverityCounts(), etc. in one call. The report filter and the
+  // comparison are evaluated only once for all of the facets.
+  // The limit and offset parameters are applied to the CHECKER_NAME,
+  // CHECKER_MSG and FILE facets.
+  // PERMISSION: PRODUCT_ACCESS
+  ReportFacets getReportFacets(1: list<i64>       runIds,
+                               2: ReportFilter    reportFilter,
+                               3: CompareData     cmpData,
+                               4: set<ReportFacet> facets,
+                               5: i64             limit,
+                               6: i64             offset)
+                               throws (1: shared.RequestFailed requestError),
+
   //============================================
   // Source component related API calls.
   //============================================
@@ -610,6 +702,26 @@ service codeCheckerDBAccess {
                    6: list<string> trimPathPrefixes)
                    throws (1: shared.RequestFailed requestError),
 
+  // Submits an entire run to the store queue of the server and returns the
+  // token of the store operation without waiting for its completion. The
+  // parameters are the same as the parameters of massStoreRun(). Store
+  // operations into the same run are processed in the order of submission.
+  // PERMISSION: PRODUCT_STORE
+  string massStoreRunAsynchronous(1: string       runName,
+                                  2: string       tag,
+                                  3: string       version,
+                                  4: string       zipfile,
+                                  5: bool         force,
+                                  6: list<string> trimPathPrefixes)
+                                  throws (1: shared.RequestFailed requestError),
+
+  // Returns the state of a store operation submitted by
+  // massStoreRunAsynchronous(). The state of finished store operations is
+  // kept by the server only for a limited time.
+  // PERMISSION: PRODUCT_STORE
+  StoreTaskInfo getStoreTaskInfo(1: string token)
+                                 throws (1: shared.RequestFailed requestError),
+
   // Returns true if analysis statistics information can be sent to the server,
   // otherwise it returns false.
   // PERMISSION: PRODUCT_STORE
@@ -19,10 +19,11 @@ import json
 import os
 import sys
 import tempfile
+import time
 import zipfile
 import zlib
 
-from codeCheckerDBAccess_v6.ttypes import StoreLimitKind
+from codeCheckerDBAccess_v6.ttypes import StoreLimitKind, StoreTaskStatus
 from shared.ttypes import RequestFailed, ErrorCode
 
 from codechecker_client import client as libclient
@@ -478,6 +479,36 @@ def storing_analysis_statistics(client, inputs, run_name):
         os.remove(zip_file)
 
 
+def wait_for_store(client, token):
+    """
+    Poll the state of the store operation of the given token until it is
+    finished. Returns the ID of the stored run, or raises RequestFailed if the
+    store has failed on the server.
+    """
+    poll_interval = 1
+    status = None
+    while True:
+        info = client.getStoreTaskInfo(token)
+
+        if info.status != status:
+            status = info.status
+            if status == StoreTaskStatus.ENQUEUED:
+                LOG.info("Waiting for the server to start the store...")
+            elif status == StoreTaskStatus.RUNNING:
+                LOG.info("The server is storing the results...")
+
+        if status == StoreTaskStatus.COMPLETED:
+            return info.runId
+        elif status == StoreTaskStatus.FAILED:
+            LOG.error("Storing the results failed on the server: %s",
+                      info.errorMessage)
+            raise RequestFailed(info.errorCode, info.errorMessage,
+                                info.errorInfo)
+
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, 10)
+
+
 def main(args):
     """
     Store the defect results in the specified input list as bug reports in the
@@ -533,12 +564,18 @@ def main(args):
         trim_path_prefixes = args.trim_path_prefix if \
             'trim_path_prefix' in args else None
 
-        client.massStoreRun(args.name,
-                            args.tag if 'tag' in args else None,
-                            str(context.version),
-                            b64zip,
-                            'force' in args,
-                            trim_path_prefixes)
+        token = client.massStoreRunAsynchronous(
+            args.name,
+            args.tag if 'tag' in args else None,
+            str(context.version),
+            b64zip,
+            'force' in args,
+            trim_path_prefixes)
+
+        # Release the memory of the uploaded ZIP while the server works.
+        del b64zip
+
+        wait_for_store(client, token)
 
         # Storing analysis statistics if the server allows them.
         if client.allowsStoringAnalysisStatistics():
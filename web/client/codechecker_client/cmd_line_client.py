@@ -16,10 +16,12 @@ from collections import defaultdict, namedtuple
 from datetime import datetime, timedelta
 import hashlib
 import io
+from multiprocessing.pool import ThreadPool
 import os
 import re
 import sys
 import shutil
+import threading
 import time
 
 from plist_to_html import PlistToHtml
@@ -44,6 +46,14 @@ from . import suppress_file_handler
 # Needs to be set in the handler functions.
 LOG = None
 
+# Number of the report details requested at once, and the number of the
+# requests sent in parallel.
+REPORT_DETAILS_BATCH_SIZE = 2000
+REPORT_DETAILS_PROCESSES = 4
+
+# Number of the source lines requested at once.
+SOURCE_LINES_BATCH_SIZE = 5000
+
 
 BugPathLengthRange = namedtuple('BugPathLengthRange', ['min', 'max'])
 
@@ -150,6 +160,112 @@ def get_run_data(client, run_filter, limit=constants.MAX_QUERY_SIZE):
     return all_runs
 
 
+def get_run_results(client, run_ids, sort_mode, report_filter, cmp_data,
+                    get_details, limit=constants.MAX_QUERY_SIZE):
+    """
+    Get all run results based on the given filters. The results are
+    requested page by page, each page continuing at the cursor of the
+    previous one.
+    """
+    all_results = []
+
+    cursor = None
+    while True:
+        page = client.getRunResultsPage(run_ids, limit, cursor, sort_mode,
+                                        report_filter, cmp_data, get_details)
+        all_results.extend(page.reports)
+        cursor = page.nextCursor
+
+        if not cursor:
+            break
+
+    return all_results
+
+
+def get_report_details(product_url, report_ids,
+                       batch_size=REPORT_DETAILS_BATCH_SIZE,
+                       processes=REPORT_DETAILS_PROCESSES):
+    """
+    Get the details of the given reports. The details are requested in
+    batches, and the batches are requested in parallel by separate clients of
+    the given product.
+    """
+    batches = [report_ids[i:i + batch_size]
+               for i in range(0, len(report_ids), batch_size)]
+    if not batches:
+        return {}
+
+    thread_data = threading.local()
+
+    def get_batch(batch):
+        if not hasattr(thread_data, 'client'):
+            thread_data.client = setup_client(product_url)
+
+        try:
+            return thread_data.client.getReportDetailsBatch(batch)
+        except SystemExit as ex:
+            # The failed client call has been logged already. The exit has
+            # to happen in the main thread, otherwise the pool would wait for
+            # the result of this batch forever.
+            return ex
+
+    pool = ThreadPool(min(processes, len(batches)))
+    try:
+        results = pool.map(get_batch, batches)
+    finally:
+        pool.close()
+        pool.join()
+
+    details = {}
+    for result in results:
+        if isinstance(result, SystemExit):
+            sys.exit(result.code)
+        details.update(result)
+
+    return details
+
+
+def get_source_lines(client, source_lines,
+                     batch_size=SOURCE_LINES_BATCH_SIZE):
+    """
+    Get the content of the given source lines. source_lines maps file ids to
+    the set of the requested line numbers of the file.
+
+    Returns a dict which maps file ids to dicts of line numbers and line
+    contents. The lines are requested in batches of at most the given number
+    of lines.
+    """
+    requests = []
+    for file_id, lines in source_lines.items():
+        lines = sorted(lines)
+        for i in range(0, len(lines), batch_size):
+            requests.append((file_id, lines[i:i + batch_size]))
+
+    batches = [[]]
+    batch_line_count = 0
+    for file_id, lines in requests:
+        if batches[-1] and batch_line_count + len(lines) > batch_size:
+            batches.append([])
+            batch_line_count = 0
+
+        batches[-1].append(ttypes.LinesInFilesRequested(fileId=file_id,
+                                                        lines=set(lines)))
+        batch_line_count += len(lines)
+
+    line_contents = defaultdict(dict)
+    for batch in batches:
+        if not batch:
+            continue
+
+        result = client.getLinesInSourceFileContents(batch,
+                                                     ttypes.Encoding.BASE64)
+        for file_id, contents in result.items():
+            for line, content in contents.items():
+                line_contents[file_id][line] = base64.b64decode(content)
+
+    return line_contents
+
+
 def validate_filter_values(user_values, valid_values, value_type):
     """
     Check if the value provided by the user is a valid value.
@@ -376,25 +492,14 @@ def handle_list_results(args):
         LOG.warning("No runs were found!")
         sys.exit(1)
 
-    limit = constants.MAX_QUERY_SIZE
-    offset = 0
-
     report_filter = ttypes.ReportFilter()
     add_filter_conditions(client, report_filter, args)
 
     query_report_details = args.details and args.output_format == 'json' \
         if 'details' in args else None
 
-    all_results = []
-    while True:
-        results = client.getRunResults(run_ids, limit, offset, None,
-                                       report_filter, None,
-                                       query_report_details)
-        all_results.extend(results)
-        offset += limit
-
-        if len(results) < limit:
-            break
+    all_results = get_run_results(client, run_ids, None, report_filter, None,
+                                  query_report_details)
 
     if args.output_format == 'json':
         print(CmdLineOutputEncoder().encode(all_results))
@@ -523,26 +628,8 @@ def handle_diff_results(args):
             ttypes.SortType.FILENAME,
             ttypes.Order.ASC))]
 
-        limit = constants.MAX_QUERY_SIZE
-        offset = 0
-
-        base_results = []
-        while True:
-            results = client.getRunResults(baseids,
-                                           limit,
-                                           offset,
-                                           sort_mode,
-                                           report_filter,
-                                           None,
-                                           False)
-
-            base_results.extend(results)
-            offset += limit
-
-            if len(results) < limit:
-                break
-
-        return base_results
+        return get_run_results(client, baseids, sort_mode, report_filter,
+                               None, False)
 
     def get_suppressed_reports(reports):
         """
@@ -706,24 +793,8 @@ def handle_diff_results(args):
         sort_mode = [(ttypes.SortMode(
             ttypes.SortType.FILENAME,
             ttypes.Order.ASC))]
-        limit = constants.MAX_QUERY_SIZE
-        offset = 0
-
-        all_results = []
-        while True:
-            results = client.getRunResults(base_ids,
-                                           limit,
-                                           offset,
-                                           sort_mode,
-                                           report_filter,
-                                           cmp_data,
-                                           False)
-
-            all_results.extend(results)
-            offset += limit
-
-            if len(results) < limit:
-                break
+        all_results = get_run_results(client, base_ids, sort_mode,
+                                      report_filter, cmp_data, False)
 
         return all_results, base_run_names, new_run_names
 
@@ -770,7 +841,7 @@ def handle_diff_results(args):
 
         return file_cache[file_id]
 
-    def get_report_data(client, reports, file_cache):
+    def get_report_data(client, reports, file_cache, report_details):
         """
         Returns necessary report files and report data events for the HTML
         plist parser.
@@ -782,7 +853,7 @@ def handle_diff_results(args):
             file_sources[report.fileId] = cached_report_file_lookup(
                 file_cache, report.fileId)
 
-            details = client.getReportDetails(report.reportId)
+            details = report_details[report.reportId]
             events = []
             for event in details.pathEvents:
                 file_sources[event.fileId] = cached_report_file_lookup(
@@ -926,6 +997,11 @@ def handle_diff_results(args):
             file_stats[file_path] += 1
             severity_stats[sev] += 1
 
+        report_details = get_report_details(
+            args.product_url,
+            [report.reportId for report in reports
+             if not isinstance(report, Report)])
+
         file_cache = {}
         for file_path, file_reports in file_report_map.items():
             checked_file = file_path
@@ -935,7 +1011,8 @@ def handle_diff_results(args):
             if isinstance(file_reports[0], Report):
                 report_data = reports_to_report_data(file_reports)
             else:
-                report_data = get_report_data(client, file_reports, file_cache)
+                report_data = get_report_data(client, file_reports,
+                                              file_cache, report_details)
 
             output_path = os.path.join(output_dir,
                                        filename + '_' + str(h) + '.html')
@@ -987,11 +1064,7 @@ def handle_diff_results(args):
             if not isinstance(report, Report) and report.line is not None:
                 source_lines[report.fileId].add(report.line)
 
-        lines_in_files_requested = []
-        for key in source_lines:
-            lines_in_files_requested.append(
-                ttypes.LinesInFilesRequested(fileId=key,
-                                             lines=source_lines[key]))
+        source_line_contents = get_source_lines(client, source_lines)
 
         file_stats = defaultdict(int)
         severity_stats = defaultdict(int)
@@ -1024,11 +1097,9 @@ def handle_diff_results(args):
                 check_name = report.checkerId
                 check_msg = report.checkerMsg
 
-                if lines_in_files_requested:
-                    source_line_contents = client.getLinesInSourceFileContents(
-                        lines_in_files_requested, ttypes.Encoding.BASE64)
-                    source_line = base64.b64decode(
-                        source_line_contents[report.fileId][bug_line])
+                if bug_line is not None:
+                    source_line = \
+                        source_line_contents[report.fileId].get(bug_line, '')
             rows.append(
                 (sev, checked_file, check_msg, check_name, source_line))
 
@@ -1184,12 +1255,16 @@ def handle_list_result_types(args):
     all_checkers_report_filter = ttypes.ReportFilter()
     add_filter_conditions(client, all_checkers_report_filter, args)
 
-    all_checkers = client.getCheckerCounts(run_ids,
-                                           all_checkers_report_filter,
-                                           None,
-                                           None,
-                                           0)
-    all_checkers_dict = dict((res.name, res) for res in all_checkers)
+    # The checker and the severity counts of all reports are counted in one
+    # request.
+    facets = client.getReportFacets(run_ids,
+                                    all_checkers_report_filter,
+                                    None,
+                                    {ttypes.ReportFacet.CHECKER_NAME,
+                                     ttypes.ReportFacet.SEVERITY},
+                                    None,
+                                    0)
+    all_checkers_dict = dict((res.name, res) for res in facets.checkerCounts)
 
     unrev_checkers = get_statistics(client, run_ids, 'reviewStatus',
                                     [ttypes.ReviewStatus.UNREVIEWED])
@@ -1203,11 +1278,7 @@ def handle_list_result_types(args):
     intentional_checkers = get_statistics(client, run_ids, 'reviewStatus',
                                           [ttypes.ReviewStatus.INTENTIONAL])
 
-    # Get severity counts
-    report_filter = ttypes.ReportFilter()
-    add_filter_conditions(client, report_filter, args)
-
-    sev_count = client.getSeverityCounts(run_ids, report_filter, None)
+    sev_count = facets.severityCounts
     severities = []
     severity_total = 0
     for key, count in sorted(sev_count.items(),
@@ -1331,8 +1402,6 @@ def handle_suppress(args):
 
     init_logger(args.verbose if 'verbose' in args else None)
 
-    limit = constants.MAX_QUERY_SIZE
-
     client = setup_client(args.product_url)
 
     run_info = check_run_names(client, [args.name])
@@ -1346,9 +1415,8 @@ def handle_suppress(args):
             file_name = '%' + file_name
             bug_hash_filter = ttypes.ReportFilter(filepath=[file_name],
                                                   reportHash=[bug_id])
-            reports = client.getRunResults([run.runId], limit, 0, None,
-                                           bug_hash_filter,
-                                           None, False)
+            reports = get_run_results(client, [run.runId], None,
+                                      bug_hash_filter, None, False)
 
             for report in reports:
                 rw_status = ttypes.ReviewStatus.FALSE_POSITIVE
@@ -10,8 +10,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
-from thrift.transport import THttpClient
-from thrift.protocol import TJSONProtocol
+from thrift.protocol import TBinaryProtocol
 
 from Configuration_v6 import configurationService
 
@@ -20,6 +19,7 @@ from codechecker_common.logger import get_logger
 from .credential_manager import SESSION_COOKIE_NAME
 from .product import create_product_url
 from .thrift_call import ThriftClientCall
+from .thrift_transport import THttpPersistentClient
 
 LOG = get_logger('system')
 
@@ -29,8 +29,9 @@ class ThriftConfigHelper(object):
         self.__host = host
         self.__port = port
         url = create_product_url(protocol, host, port, uri)
-        self.transport = THttpClient.THttpClient(url)
-        self.protocol = TJSONProtocol.TJSONProtocol(self.transport)
+        self.transport = THttpPersistentClient(url)
+        self.protocol = \
+            TBinaryProtocol.TBinaryProtocolAccelerated(self.transport)
         self.client = configurationService.Client(self.protocol)
 
         if session_token:
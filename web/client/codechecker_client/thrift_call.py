@@ -21,18 +21,22 @@ import shared
 
 from codechecker_common.logger import get_logger
 
+from .thrift_transport import is_read_only_method
+
 LOG = get_logger('system')
 
 
 def ThriftClientCall(function):
     """ Wrapper function for thrift client calls.
-        - open and close transport,
+        - open transport, which is kept open for the next calls,
         - log and handle errors
     """
     funcName = function.__name__
+    read_only = is_read_only_method(funcName)
 
     def wrapper(self, *args, **kwargs):
         self.transport.open()
+        self.transport.read_only = read_only
         func = getattr(self.client, funcName)
         try:
             res = func(*args, **kwargs)
@@ -77,13 +81,12 @@ def ThriftClientCall(function):
             LOG.exception("Request failed.")
             sys.exit(1)
         except socket.error as serr:
+            self.transport.close()
             LOG.error("Connection failed.")
             errCause = os.strerror(serr.errno)
             LOG.error(errCause)
             LOG.error(str(serr))
             LOG.error("Check if your CodeChecker server is running.")
             sys.exit(1)
-        finally:
-            self.transport.close()
 
     return wrapper
@@ -10,8 +10,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
-from thrift.transport import THttpClient
-from thrift.protocol import TJSONProtocol
+from thrift.protocol import TBinaryProtocol
 
 from codeCheckerDBAccess_v6 import codeCheckerDBAccess
 
@@ -20,6 +19,7 @@ from codechecker_common.logger import get_logger
 from .credential_manager import SESSION_COOKIE_NAME
 from .product import create_product_url
 from .thrift_call import ThriftClientCall
+from .thrift_transport import THttpPersistentClient
 
 LOG = get_logger('system')
 
@@ -30,8 +30,9 @@ class ThriftClientHelper(object):
         self.__host = host
         self.__port = port
         url = create_product_url(protocol, host, port, uri)
-        self.transport = THttpClient.THttpClient(url)
-        self.protocol = TJSONProtocol.TJSONProtocol(self.transport)
+        self.transport = THttpPersistentClient(url)
+        self.protocol = \
+            TBinaryProtocol.TBinaryProtocolAccelerated(self.transport)
         self.client = codeCheckerDBAccess.Client(self.protocol)
 
         if session_token:
@@ -50,6 +51,10 @@ class ThriftClientHelper(object):
     def getReportDetails(self, reportId):
         pass
 
+    @ThriftClientCall
+    def getReportDetailsBatch(self, reportIds):
+        pass
+
     @ThriftClientCall
     def getSourceFileData(self, fileId, fileContent, encoding):
         pass
@@ -111,6 +116,11 @@ class ThriftClientHelper(object):
                       cmpData, getDetails):
         pass
 
+    @ThriftClientCall
+    def getRunResultsPage(self, runIds, limit, cursor, sortType,
+                          reportFilter, cmpData, getDetails):
+        pass
+
     @ThriftClientCall
     def getRunResultCount(self, runIds, reportFilter, cmpData):
         pass
@@ -141,6 +151,11 @@ class ThriftClientHelper(object):
                          offset):
         pass
 
+    @ThriftClientCall
+    def getReportFacets(self, base_run_ids, reportFilter, cmpData, facets,
+                        limit, offset):
+        pass
+
     # SOURCE COMPONENT RELATED API CALLS
 
     @ThriftClientCall
@@ -166,6 +181,15 @@ class ThriftClientHelper(object):
                      trim_path_prefixes):
         pass
 
+    @ThriftClientCall
+    def massStoreRunAsynchronous(self, name, tag, version, zipdir, force,
+                                 trim_path_prefixes):
+        pass
+
+    @ThriftClientCall
+    def getStoreTaskInfo(self, token):
+        pass
+
     @ThriftClientCall
     def allowsStoringAnalysisStatistics(self):
         pass
@@ -0,0 +1,195 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+HTTP transport of the Thrift clients.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from io import BytesIO
+import re
+import socket
+import time
+import zlib
+
+try:
+    import httplib as http_client
+    from urlparse import urlparse
+except ImportError:
+    import http.client as http_client
+    from urllib.parse import urlparse
+
+from thrift.transport.TTransport import CReadableTransport, \
+    TMemoryBuffer, TTransportBase
+
+from codechecker_common.logger import get_logger
+
+from codechecker_web.shared.version import THRIFT_BINARY_CONTENT_TYPE
+
+LOG = get_logger('system')
+
+# Idle timeout of the connections if the server does not advertise it in the
+# Keep-Alive header.
+DEFAULT_IDLE_TIMEOUT = 5
+
+# The connections are not reused this many seconds before the idle timeout of
+# the server, so the server does not close them while a request is sent.
+IDLE_TIMEOUT_MARGIN = 1
+
+# Prefixes of the API methods which only read data. These calls can be sent
+# again safely if the connection is lost while their response is waited for.
+READ_ONLY_METHOD_PREFIXES = ('allows', 'check', 'get', 'has', 'is')
+
+KEEP_ALIVE_TIMEOUT_PATTERN = re.compile(r'timeout\s*=\s*(\d+)')
+
+
+def is_read_only_method(method_name):
+    """
+    Returns True if the given API method only reads data on the server.
+    """
+    return method_name.startswith(READ_ONLY_METHOD_PREFIXES)
+
+
+class THttpPersistentClient(TTransportBase, CReadableTransport):
+    """
+    HTTP transport which keeps its connection open between the calls, unlike
+    THttpClient which connects to the server for every call. The consecutive
+    calls of a command do not have to open new TCP and TLS connections. The
+    connections which were idle for the keep-alive timeout of the server are
+    not reused, and a call is only sent again on a new connection if it did
+    not reach the server or it does not modify anything (see read_only).
+
+    The responses are requested to be compressed, and they are read into a
+    memory buffer, so the accelerated binary protocol can decode them.
+    """
+
+    def __init__(self, url, content_type=THRIFT_BINARY_CONTENT_TYPE):
+        parsed = urlparse(url)
+        self.scheme = parsed.scheme
+        if self.scheme == 'https':
+            self.__connection_class = http_client.HTTPSConnection
+            self.port = parsed.port or http_client.HTTPS_PORT
+        else:
+            self.__connection_class = http_client.HTTPConnection
+            self.port = parsed.port or http_client.HTTP_PORT
+
+        self.host = parsed.hostname
+        self.path = parsed.path
+        if parsed.query:
+            self.path += '?' + parsed.query
+
+        self.code = None
+        self.message = None
+        self.headers = None
+
+        self.content_type = content_type
+
+        # Whether the current call can be sent again if its response is lost.
+        self.read_only = False
+
+        self.__connection = None
+        self.__last_used = 0
+        self.__idle_timeout = DEFAULT_IDLE_TIMEOUT
+        self.__rbuf = TMemoryBuffer(b'')
+        self.__wbuf = BytesIO()
+        self.__custom_headers = {}
+
+    def setCustomHeaders(self, headers):
+        self.__custom_headers = headers
+
+    def isOpen(self):
+        return self.__connection is not None
+
+    def open(self):
+        if not self.__connection:
+            self.__connection = self.__connection_class(self.host, self.port)
+
+    def close(self):
+        if self.__connection:
+            self.__connection.close()
+
+        self.__connection = None
+
+    def read(self, sz):
+        return self.__rbuf.read(sz)
+
+    def write(self, buf):
+        self.__wbuf.write(buf)
+
+    def flush(self):
+        data = self.__wbuf.getvalue()
+        self.__wbuf = BytesIO()
+
+        # The server closes the connections which are idle for a while, so
+        # such a connection is not reused.
+        if self.isOpen() and time.time() - self.__last_used >= \
+                self.__idle_timeout - IDLE_TIMEOUT_MARGIN:
+            self.close()
+
+        reused = self.isOpen()
+        try:
+            self.__send(data)
+        except (http_client.HTTPException, socket.error) as ex:
+            self.close()
+            if not reused:
+                raise
+
+            # The request did not reach the server, so it can be sent again
+            # on a new connection.
+            LOG.debug("Reconnecting to %s:%s: %s", self.host, self.port, ex)
+            self.__send(data)
+
+        try:
+            self.__receive()
+        except (http_client.HTTPException, socket.error) as ex:
+            self.close()
+            if not reused or not self.read_only:
+                raise
+
+            # The server may have processed the request already, so only the
+            # calls which do not modify anything are sent again.
+            LOG.debug("Reconnecting to %s:%s: %s", self.host, self.port, ex)
+            self.__send(data)
+            self.__receive()
+
+    def __send(self, data):
+        self.open()
+
+        headers = {'Content-Type': self.content_type,
+                   'Accept': self.content_type,
+                   'Accept-Encoding': 'gzip, deflate'}
+        headers.update(self.__custom_headers)
+        self.__connection.request('POST', self.path, data, headers)
+
+    def __receive(self):
+        response = self.__connection.getresponse()
+        self.code = response.status
+        self.message = response.reason
+        self.headers = response.msg
+
+        body = response.read()
+        encoding = response.getheader('Content-Encoding')
+        if encoding == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+
+        self.__rbuf = TMemoryBuffer(body)
+
+        keep_alive = KEEP_ALIVE_TIMEOUT_PATTERN.search(
+            response.getheader('Keep-Alive') or '')
+        self.__idle_timeout = int(keep_alive.group(1)) if keep_alive \
+            else DEFAULT_IDLE_TIMEOUT
+        self.__last_used = time.time()
+
+    # Implement the CReadableTransport interface.
+    @property
+    def cstringio_buf(self):
+        return self.__rbuf.cstringio_buf
+
+    def cstringio_refill(self, partialread, reqlen):
+        return self.__rbuf.cstringio_refill(partialread, reqlen)
@@ -15,10 +15,17 @@ from __future__ import absolute_import
 # token.
 SESSION_COOKIE_NAME = '__ccPrivilegedAccessToken'
 
+# Content types of the Thrift protocols accepted by the server. The browsers
+# use the JSON protocol, the command line clients use the binary protocol
+# which is smaller and faster to parse.
+THRIFT_JSON_CONTENT_TYPE = 'application/x-thrift'
+THRIFT_BINARY_CONTENT_TYPE = 'application/vnd.apache.thrift.binary'
+THRIFT_COMPACT_CONTENT_TYPE = 'application/vnd.apache.thrift.compact'
+
 # The newest supported minor version (value) for each supported major version
 # (key) in this particular build.
 SUPPORTED_VERSIONS = {
-    6: 21
+    6: 26
 }
 
 # Used by the client to automatically identify the latest major and minor
@@ -234,6 +234,7 @@ class ThriftAuthHandler(object):
                                    user_name=self.getLoggedInUser())
 
             session.commit()
+            permissions.PERMISSION_CACHE.invalidate()
             return True
 
     @timeit
@@ -257,6 +258,7 @@ class ThriftAuthHandler(object):
                                       user_name=self.getLoggedInUser())
 
             session.commit()
+            permissions.PERMISSION_CACHE.invalidate()
             return True
 
     @timeit
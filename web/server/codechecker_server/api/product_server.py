@@ -396,6 +396,7 @@ class ThriftProductHandler(object):
                 'productID': orm_prod.id
             })
             session.commit()
+            permissions.PERMISSION_CACHE.invalidate()
             LOG.debug("Product configuration added to database successfully.")
 
             # The orm_prod object above is not bound to the database as it
@@ -567,6 +568,8 @@ class ThriftProductHandler(object):
             product.description = description
 
             session.commit()
+            permissions.PERMISSION_CACHE.invalidate()
+            self.__server.notify_products_changed()
             LOG.info("Product configuration edited and saved successfully.")
 
             if product_needs_reconnect:
@@ -602,4 +605,6 @@ class ThriftProductHandler(object):
 
             session.delete(product)
             session.commit()
+            permissions.PERMISSION_CACHE.invalidate()
+            self.__server.notify_products_changed()
             return True
@@ -0,0 +1,222 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Export of the reports of a product as newline-delimited JSON.
+
+Every line of the export is a JSON object. Report lines have the "report"
+type. If the source files are exported too, a line of the "file" type is
+written once for every file before the first report which refers to it.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import codecs
+import json
+
+from codeCheckerDBAccess_v6.ttypes import DetectionStatus, ReportFilter, \
+    ReviewStatus as ReviewStatusEnum, RunFilter, Severity
+
+from codechecker_common.logger import get_logger
+
+from ..database.run_db_model import File, Report, ReviewStatus, Run
+
+from .report_server import get_report_details, iter_source_file_content, \
+    process_report_filter, process_run_filter
+from .thrift_enum_helper import detection_status_enum, review_status_enum
+
+LOG = get_logger('server')
+
+# Number of reports fetched from the database cursor at once. The details and
+# source files of the reports are queried in chunks of this size as well.
+EXPORT_CHUNK_SIZE = 1000
+
+# Report filter fields which can be given as query parameters. The values
+# of the enum fields are the names of the enum values.
+STRING_FILTER_FIELDS = ['filepath', 'checkerMsg', 'checkerName',
+                        'reportHash', 'componentNames']
+ENUM_FILTER_FIELDS = {'severity': Severity,
+                      'reviewStatus': ReviewStatusEnum,
+                      'detectionStatus': DetectionStatus}
+
+
+def is_true(query, name):
+    """
+    Returns True if the given query parameter is set to true.
+    """
+    return query.get(name, ['false'])[-1].lower() in ['true', '1', 'yes']
+
+
+def get_export_filter(session, query):
+    """
+    Returns the run ids and the report filter of the export from the given
+    parsed query string.
+
+    The runs are given by their names in the 'run' parameter, every run is
+    exported if it is not set. Report filter fields can be given in the
+    parameters with the same names, e.g.: ?run=my_run&severity=HIGH.
+    """
+    run_ids = None
+    if 'run' in query:
+        run_q = process_run_filter(session.query(Run.id),
+                                   RunFilter(names=query['run']))
+        run_ids = [run_id for run_id, in run_q]
+
+    report_filter = ReportFilter()
+    for field in STRING_FILTER_FIELDS:
+        if field in query:
+            setattr(report_filter, field, query[field])
+
+    for field, enum in ENUM_FILTER_FIELDS.items():
+        if field not in query:
+            continue
+
+        values = []
+        for name in query[field]:
+            value = enum._NAMES_TO_VALUES.get(name.upper())
+            if value is None:
+                raise ValueError("Invalid {0} value: '{1}'."
+                                 .format(field, name))
+            values.append(value)
+
+        setattr(report_filter, field, values)
+
+    return run_ids, report_filter
+
+
+def to_json_object(value):
+    """
+    Convert the given Thrift object to a JSON serializable one.
+    """
+    if hasattr(value, 'thrift_spec'):
+        return dict((k, to_json_object(v)) for k, v in value.__dict__.items()
+                    if v is not None)
+    if isinstance(value, list):
+        return [to_json_object(v) for v in value]
+    return value
+
+
+def to_json_line(value):
+    return (json.dumps(value) + '\n').encode('utf-8')
+
+
+def __get_file_lines(session, file_ids, blob_store):
+    """
+    Generate the lines of the given source files. The contents are streamed
+    into the lines chunk by chunk, so the source files in the blob store are
+    not loaded into the memory as a whole.
+    """
+    def escape(text):
+        return json.dumps(text)[1:-1].encode('utf-8')
+
+    for file_id, file_path, content_hash in \
+            session.query(File.id, File.filepath, File.content_hash) \
+            .filter(File.id.in_(file_ids)):
+        header = json.dumps({'type': 'file',
+                             'fileId': file_id,
+                             'filePath': file_path})
+        yield (header[:-1] + ', "content": "').encode('utf-8')
+
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        for chunk in iter_source_file_content(session, content_hash,
+                                              blob_store):
+            yield escape(decoder.decode(chunk))
+
+        yield escape(decoder.decode(b'', True)) + b'"}\n'
+
+
+def __get_chunk_lines(session, reports, with_details, with_sources,
+                      exported_file_ids, blob_store):
+    details = {}
+    if with_details:
+        details = get_report_details(session, [r.id for r in reports])
+
+    if with_sources:
+        file_ids = set(r.file_id for r in reports)
+        for report_details in details.values():
+            for item in report_details.pathEvents + \
+                    report_details.executionPath + \
+                    report_details.extendedData:
+                file_ids.add(item.fileId)
+
+        file_ids -= exported_file_ids
+        exported_file_ids.update(file_ids)
+
+        if file_ids:
+            for line in __get_file_lines(session, file_ids, blob_store):
+                yield line
+
+    for r in reports:
+        report = {
+            'type': 'report',
+            'reportId': r.id,
+            'runId': r.run_id,
+            'bugHash': r.bug_id,
+            'checkerId': r.checker_id,
+            'checkerMsg': r.checker_message,
+            'severity': Severity._VALUES_TO_NAMES.get(r.severity),
+            'reviewStatus': ReviewStatusEnum._VALUES_TO_NAMES[
+                review_status_enum(r.status or 'unreviewed')],
+            'detectionStatus': DetectionStatus._VALUES_TO_NAMES[
+                detection_status_enum(r.detection_status)],
+            'fileId': r.file_id,
+            'filePath': r.filepath,
+            'line': r.line,
+            'column': r.column,
+            'detectedAt': str(r.detected_at),
+            'fixedAt': str(r.fixed_at) if r.fixed_at else None,
+            'bugPathLength': r.path_length}
+
+        if with_details:
+            report['details'] = to_json_object(details[r.id])
+
+        yield to_json_line(report)
+
+
+def export_reports(session, run_ids, report_filter, with_details=False,
+                   with_sources=False, blob_store=None):
+    """
+    Generate the lines of the export of the filtered reports.
+
+    The reports are read through a server-side cursor and processed in
+    chunks, so the memory usage does not depend on the number of the
+    exported reports. Only the ids of the already exported source files are
+    kept for the whole export.
+    """
+    filter_expression = process_report_filter(session, report_filter)
+
+    q = session.query(Report.id, Report.run_id, Report.bug_id,
+                      Report.checker_id, Report.checker_message,
+                      Report.severity, Report.detection_status,
+                      Report.file_id, Report.line, Report.column,
+                      Report.detected_at, Report.fixed_at,
+                      Report.path_length, File.filepath,
+                      ReviewStatus.status) \
+        .outerjoin(File, Report.file_id == File.id) \
+        .outerjoin(ReviewStatus, ReviewStatus.bug_hash == Report.bug_id) \
+        .filter(filter_expression)
+
+    if run_ids is not None:
+        q = q.filter(Report.run_id.in_(run_ids))
+
+    q = q.order_by(Report.id).yield_per(EXPORT_CHUNK_SIZE)
+
+    exported_file_ids = set()
+    chunk = []
+    for report in q:
+        chunk.append(report)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            for line in __get_chunk_lines(session, chunk, with_details,
+                                          with_sources, exported_file_ids,
+                                          blob_store):
+                yield line
+            chunk = []
+
+    if chunk:
+        for line in __get_chunk_lines(session, chunk, with_details,
+                                      with_sources, exported_file_ids,
+                                      blob_store):
+            yield line
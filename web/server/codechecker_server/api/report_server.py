@@ -14,42 +14,44 @@ import base64
 import codecs
 from collections import defaultdict
 from datetime import datetime, timedelta
-import io
+import json
 import os
 import re
+import shutil
 import tempfile
+import time
+import uuid
 import zipfile
 import zlib
 
 import sqlalchemy
-from sqlalchemy.sql.expression import or_, and_, not_, func, \
+from sqlalchemy.sql.expression import or_, and_, func, \
     asc, desc, text, union_all, select, bindparam, literal_column, cast
+from sqlalchemy.sql.util import find_tables
 
 import shared
 from codeCheckerDBAccess_v6 import constants, ttypes
 from codeCheckerDBAccess_v6.ttypes import BugPathPos, CheckerCount, \
     CommentData, DiffType, Encoding, RunHistoryData, Order, ReportData, \
-    ReportDetails, ReviewData, RunData, RunFilter, RunReportCount, \
-    RunTagCount, SourceComponentData, SourceFileData, SortMode, SortType
+    ReportDataPage, ReportDetails, ReportFacet, ReportFacets, ReviewData, \
+    RunData, RunFilter, RunReportCount, RunTagCount, SourceComponentData, \
+    SourceFileData, SortMode, SortType
 
-from codechecker_common import plist_parser, skiplist_handler
 from codechecker_common.source_code_comment_handler import \
-    SourceCodeCommentHandler, SKIP_REVIEW_STATUSES
+    SKIP_REVIEW_STATUSES
 from codechecker_common import util
 from codechecker_common.logger import get_logger
-from codechecker_common.report import get_report_path_hash
 
 from codechecker_server.profiler import timeit
 
 from .. import permissions
-from ..database import db_cleanup
+from ..database import component_files, db_cleanup, report_summary
 from ..database.config_db_model import Product
 from ..database.database import conv
 from ..database.run_db_model import \
-    AnalyzerStatistic, Report, ReviewStatus, File, Run, RunHistory, \
-    RunLock, Comment, BugPathEvent, BugReportPoint, \
-    FileContent, SourceComponent, ExtendedReportData
-from ..tmp import TemporaryDirectory
+    AnalyzerStatistic, ComponentFile, Report, ReviewStatus, File, Run, \
+    RunHistory, RunLock, RunReportSummary, Comment, BugPathEvent, \
+    BugReportPoint, FileContent, SourceComponent, ExtendedReportData
 
 from .db import DBSession, escape_like
 from .thrift_enum_helper import detection_status_enum, \
@@ -60,6 +62,13 @@ from . import store_handler
 
 LOG = get_logger('server')
 
+# Maximum time (in seconds) to wait for a run lock which is held by the store
+# operation of another server process.
+RUN_LOCK_WAIT_TIMEOUT = 5 * 60
+
+# Reports in these detection statuses are not counted as unresolved.
+SKIP_DETECTION_STATUSES = ['resolved', 'off', 'unavailable']
+
 
 def verify_limit_range(limit):
     """Verify limit value for the queries.
@@ -118,35 +127,24 @@ def exc_to_thrift_reqfail(func):
     return wrapper
 
 
-def get_component_values(session, component_name):
+def get_string_filter(column, values):
     """
-    Get component values by component names and returns a tuple where the
-    first item contains a list path which should be skipped and the second
-    item contains a list of path which should be included.
-    E.g.:
-      +/a/b/x.cpp
-      +/a/b/y.cpp
-      -/a/b
-    On the above component value this function will return the following:
-      (['/a/b'], ['/a/b/x.cpp', '/a/b/y.cpp'])
+    Returns the filter of the given column which matches any of the given
+    values. The values without '*' wildcards are compared for equality, so
+    the filter can use the index of the column, the others are matched by
+    case insensitive LIKE patterns.
     """
-    components = session.query(SourceComponent) \
-        .filter(SourceComponent.name.like(component_name)) \
-        .all()
+    exact_values = [value for value in values if '*' not in value]
 
-    skip = []
-    include = []
+    OR = [column.ilike(conv(value)) for value in values
+          if '*' in value]
 
-    for component in components:
-        values = component.value.split('\n')
-        for value in values:
-            v = value[1:].strip()
-            if value[0] == '+':
-                include.append(v)
-            elif value[0] == '-':
-                skip.append(v)
+    if len(exact_values) == 1:
+        OR.append(column == exact_values[0])
+    elif exact_values:
+        OR.append(column.in_(exact_values))
 
-    return skip, include
+    return or_(*OR)
 
 
 def process_report_filter(session, report_filter):
@@ -170,9 +168,8 @@ def process_report_filter(session, report_filter):
         AND.append(or_(*OR))
 
     if report_filter.checkerName:
-        OR = [Report.checker_id.ilike(conv(cn))
-              for cn in report_filter.checkerName]
-        AND.append(or_(*OR))
+        AND.append(get_string_filter(Report.checker_id,
+                                     report_filter.checkerName))
 
     if report_filter.runName:
         OR = [Run.name.ilike(conv(rn))
@@ -180,9 +177,8 @@ def process_report_filter(session, report_filter):
         AND.append(or_(*OR))
 
     if report_filter.reportHash:
-        OR = [Report.bug_id.ilike(conv(rh))
-              for rh in report_filter.reportHash]
-        AND.append(or_(*OR))
+        AND.append(get_string_filter(Report.bug_id,
+                                     report_filter.reportHash))
 
     if report_filter.severity:
         AND.append(Report.severity.in_(report_filter.severity))
@@ -247,42 +243,11 @@ def process_report_filter(session, report_filter):
         AND.append(or_(*OR))
 
     if report_filter.componentNames:
-        OR = []
-
-        for component_name in report_filter.componentNames:
-            skip, include = get_component_values(session, component_name)
-
-            skip_q, include_q = None, None
+        component_q = select([ComponentFile.file_id]) \
+            .where(or_(*[ComponentFile.component_name.like(component_name)
+                         for component_name in report_filter.componentNames]))
 
-            if include:
-                and_q = [File.filepath.like(conv(fp)) for fp in include]
-                include_q = select([File.id]).where(or_(*and_q))
-
-            if skip:
-                and_q = [(File.filepath.like(conv(fp))) for fp in skip]
-                skip_q = select([File.id]).where(or_(*and_q))
-
-            file_ids = []
-            if skip and include:
-                skip_q = include_q.except_(skip_q).alias('component')
-                file_ids = session.query(skip_q) \
-                    .distinct() \
-                    .all()
-            elif include:
-                file_ids = session.query(include_q.alias('include')).all()
-            elif skip:
-                and_q = [not_(File.filepath.like(conv(fp))) for fp in skip]
-                skip_q = select([File.id]).where(and_(*and_q))
-                file_ids = session.query(skip_q.alias('skip')).all()
-
-            if file_ids:
-                OR.append(or_(File.id.in_([f_id[0] for f_id in file_ids])))
-            else:
-                # File id list can be empty for example when the user skips
-                # everything.
-                OR.append(False)
-
-        AND.append(or_(*OR))
+        AND.append(Report.file_id.in_(component_q))
 
     if report_filter.bugPathLength is not None:
         min_path_length = report_filter.bugPathLength.min
@@ -335,22 +300,21 @@ def process_run_filter(query, run_filter):
 def get_diff_hashes_for_query(base_run_ids, base_line_hashes, new_run_ids,
                               new_check_hashes, diff_type):
     """
-    Get the report hash list for the result comparison.
+    Get the report hash query for the result comparison. The difference of
+    the base line and the new report hash queries is computed by the
+    database as a set operation.
 
-    Returns the list of hashes (NEW, RESOLVED, UNRESOLVED) and
+    Returns the query of hashes (NEW, RESOLVED, UNRESOLVED) and
     the run ids which should be queried for the reports.
     """
     if diff_type == DiffType.NEW:
-        df = [] + list(new_check_hashes.difference(base_line_hashes))
-        return df, new_run_ids
+        return new_check_hashes.except_(base_line_hashes), new_run_ids
 
     elif diff_type == DiffType.RESOLVED:
-        df = [] + list(base_line_hashes.difference(new_check_hashes))
-        return df, base_run_ids
+        return base_line_hashes.except_(new_check_hashes), base_run_ids
 
     elif diff_type == DiffType.UNRESOLVED:
-        df = [] + list(base_line_hashes.intersection(new_check_hashes))
-        return df, new_run_ids
+        return base_line_hashes.intersect(new_check_hashes), new_run_ids
     else:
         msg = 'Unsupported diff type: ' + str(diff_type)
         LOG.error(msg)
@@ -414,6 +378,42 @@ def get_report_details(session, report_ids):
     return details
 
 
+def iter_source_file_content(session, content_hash, blob_store=None):
+    """
+    Yields the decompressed content of the source file with the given content
+    hash in chunks. The contents in the source blob store of the product are
+    read from the disk chunk by chunk, the contents in the database are
+    yielded at once.
+    """
+    content = session.query(FileContent.content) \
+        .filter(FileContent.content_hash == content_hash) \
+        .scalar()
+
+    if content is not None:
+        yield zlib.decompress(content)
+        return
+
+    if not blob_store:
+        raise shared.ttypes.RequestFailed(
+            shared.ttypes.ErrorCode.GENERAL,
+            "Content of the source file with hash '{0}' is stored in a "
+            "source blob store which is not configured on the "
+            "server.".format(content_hash))
+
+    for chunk in blob_store.iter_content(content_hash):
+        yield chunk
+
+
+def get_source_file_content(session, content_hash, blob_store=None):
+    """
+    Returns the decompressed content of the source file with the given
+    content hash either from the database or from the source blob store of
+    the product.
+    """
+    return b''.join(iter_source_file_content(session, content_hash,
+                                             blob_store))
+
+
 def bugpathevent_db_to_api(bpe):
     return ttypes.BugPathEvent(
         startLine=bpe.line_begin,
@@ -482,21 +482,40 @@ def create_count_expression(report_filter):
         return func.count(literal_column('*'))
 
 
+def join_report_tables(q, *columns):
+    """
+    Outer join the files and the review statuses of the reports to the given
+    query of the reports, but only if the selected columns or the filters of
+    the query or the given additional columns (e.g. the columns which are
+    used only for sorting) refer to them.
+
+    Both joins are many-to-one, so they never change the number of the rows.
+    """
+    tables = set(q.statement.froms)
+    for column in columns:
+        tables.update(find_tables(column, check_columns=True))
+
+    if File.__table__ in tables:
+        q = q.outerjoin(File, Report.file_id == File.id)
+
+    if ReviewStatus.__table__ in tables:
+        q = q.outerjoin(ReviewStatus,
+                        ReviewStatus.bug_hash == Report.bug_id)
+
+    return q
+
+
 def filter_report_filter(q, filter_expression, run_ids=None, cmp_data=None,
                          diff_hashes=None):
     if run_ids:
         q = q.filter(Report.run_id.in_(run_ids))
 
-    q = q.outerjoin(File,
-                    Report.file_id == File.id) \
-        .outerjoin(ReviewStatus,
-                   ReviewStatus.bug_hash == Report.bug_id) \
-        .filter(filter_expression)
+    q = q.filter(filter_expression)
 
     if cmp_data:
         q = q.filter(Report.bug_id.in_(diff_hashes))
 
-    return q
+    return join_report_tables(q)
 
 
 def get_sort_map(sort_types, is_unique=False):
@@ -538,6 +557,85 @@ def sort_results_query(query, sort_types, sort_type_map, order_type_map,
     return query
 
 
+def get_sort_keys(sort_types, sort_type_map, id_column, columns=None):
+    """
+    Returns the (column, order) pairs of the sort keys of the given sort
+    types. The last key is the given report id column, which makes the order
+    of the reports total.
+
+    If the columns of a subquery are given, the sort keys are looked up among
+    them by their label.
+    """
+    keys = []
+    for sort in sort_types:
+        for column, label in sort_type_map.get(sort.type):
+            if columns is not None:
+                if label not in columns:
+                    continue
+                column = columns[label]
+            keys.append((column, sort.ord))
+
+    keys.append((id_column, Order.ASC))
+    return keys
+
+
+def get_keyset_filter(keys, values, nulls_largest):
+    """
+    Returns the filter of the rows which come after the row with the given
+    sort key values in the order of the given (column, order) sort keys.
+
+    NULL values are sorted after any other value if nulls_largest is True
+    (PostgreSQL) and before them otherwise (SQLite).
+    """
+    OR = []
+    equals = []
+    for (column, order), value in zip(keys, values):
+        is_asc = order == Order.ASC
+        nulls_last = is_asc == nulls_largest
+
+        if value is None:
+            after = None if nulls_last else column.isnot(None)
+            equal = column.is_(None)
+        else:
+            after = column > value if is_asc else column < value
+            if nulls_last:
+                after = or_(after, column.is_(None))
+            equal = column == value
+
+        if after is not None:
+            OR.append(and_(*(equals + [after])))
+        equals.append(equal)
+
+    return or_(*OR)
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key values of the last report of a page to an opaque
+    cursor of the next page.
+    """
+    return base64.urlsafe_b64encode(
+        json.dumps(list(values)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, key_count):
+    """
+    Decode the sort key values from the given cursor of a page.
+    """
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(str(cursor)).decode('utf-8'))
+    except (TypeError, ValueError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != key_count:
+        raise shared.ttypes.RequestFailed(
+            shared.ttypes.ErrorCode.GENERAL,
+            "Invalid cursor of the run results page.")
+
+    return values
+
+
 def filter_unresolved_reports(q):
     """
     Filter reports which are unresolved.
@@ -545,20 +643,17 @@ def filter_unresolved_reports(q):
     Note: review status of these reports are not in the SKIP_REVIEW_STATUSES
     list and detection statuses are not in skip_detection_statuses.
     """
-    skip_review_status = SKIP_REVIEW_STATUSES
-    skip_detection_statuses = ['resolved', 'off', 'unavailable']
+    q = q.filter(Report.detection_status.notin_(SKIP_DETECTION_STATUSES)) \
+        .filter(or_(ReviewStatus.status.is_(None),
+                    ReviewStatus.status.notin_(SKIP_REVIEW_STATUSES)))
 
-    return q.filter(Report.detection_status.notin_(skip_detection_statuses)) \
-            .filter(or_(ReviewStatus.status.is_(None),
-                        ReviewStatus.status.notin_(skip_review_status))) \
-            .outerjoin(ReviewStatus,
-                       ReviewStatus.bug_hash == Report.bug_id)
+    return join_report_tables(q)
 
 
 def get_report_hashes(session, run_ids, tag_ids):
     """
-    Get report hash list for the reports which can be found in the given runs
-    and the given tags.
+    Get the query of the report hashes for the reports which can be found in
+    the given runs and the given tags.
     """
     q = session.query(Report.bug_id)
 
@@ -573,7 +668,281 @@ def get_report_hashes(session, run_ids, tag_ids):
             .filter(or_(Report.fixed_at.is_(None),
                         Report.fixed_at > RunHistory.time))
 
-    return set([t[0] for t in q])
+    return q
+
+
+def get_filtered_reports_query(session, filter_expression, run_ids=None,
+                               cmp_data=None, diff_hashes=None,
+                               with_review_status=True):
+    """
+    Returns a query of the report columns which are needed to compute the
+    report facets, filtered by the given report filter and comparison.
+
+    If the review statuses are not needed, the review_status column is
+    NULL, so the review statuses are joined only if the filter needs them.
+    """
+    review_status = ReviewStatus.status if with_review_status \
+        else sqlalchemy.null()
+
+    q = session.query(Report.bug_id,
+                      Report.run_id,
+                      Report.file_id,
+                      Report.checker_id,
+                      Report.checker_message,
+                      Report.severity,
+                      Report.detection_status,
+                      Report.detected_at,
+                      Report.fixed_at,
+                      review_status.label('review_status'))
+
+    return filter_report_filter(q, filter_expression, run_ids, cmp_data,
+                                diff_hashes)
+
+
+def create_temporary_report_table(session, reports_q):
+    """
+    Materializes the result of the given get_filtered_reports_query() into a
+    temporary table, so multiple facets can be counted without evaluating
+    the report filter again. The table has to be dropped by the caller. On
+    PostgreSQL the table is dropped at the end of the transaction too.
+    """
+    table = sqlalchemy.Table(
+        'tmp_reports_' + uuid.uuid4().hex[:16],
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column('bug_id', sqlalchemy.String),
+        sqlalchemy.Column('run_id', sqlalchemy.Integer),
+        sqlalchemy.Column('file_id', sqlalchemy.Integer),
+        sqlalchemy.Column('checker_id', sqlalchemy.String),
+        sqlalchemy.Column('checker_message', sqlalchemy.String),
+        sqlalchemy.Column('severity', sqlalchemy.Integer),
+        sqlalchemy.Column('detection_status', sqlalchemy.String),
+        sqlalchemy.Column('detected_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('fixed_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('review_status', sqlalchemy.String),
+        prefixes=['TEMPORARY'],
+        postgresql_on_commit='DROP')
+
+    connection = session.connection()
+    table.create(bind=connection)
+    connection.execute(table.insert().from_select(
+        [column.name for column in table.c], reports_q.statement))
+
+    return table
+
+
+def get_report_count(session, reports, is_unique):
+    """
+    Count the reports of the given filtered reports selectable.
+    """
+    count_expr = func.count(reports.c.bug_id.distinct()) if is_unique \
+        else func.count(literal_column('*'))
+
+    report_count = session.query(count_expr).select_from(reports).scalar()
+    return report_count if report_count else 0
+
+
+def get_severity_counts(session, reports, is_unique):
+    """
+    Count the reports of the given filtered reports selectable by severity.
+    """
+    if is_unique:
+        q = session.query(func.max(reports.c.severity).label('severity'),
+                          reports.c.bug_id) \
+            .group_by(reports.c.bug_id) \
+            .subquery()
+        severities = session.query(q.c.severity,
+                                   func.count(q.c.bug_id)) \
+            .group_by(q.c.severity)
+    else:
+        severities = session.query(reports.c.severity,
+                                   func.count(literal_column('*'))) \
+            .group_by(reports.c.severity)
+
+    return dict(severities)
+
+
+def get_checker_counts(session, reports, is_unique, limit, offset):
+    """
+    Count the reports of the given filtered reports selectable by checker.
+    """
+    if is_unique:
+        q = session.query(func.max(reports.c.checker_id).label('checker_id'),
+                          func.max(reports.c.severity).label('severity'),
+                          reports.c.bug_id) \
+            .group_by(reports.c.bug_id) \
+            .subquery()
+        checkers = session.query(q.c.checker_id,
+                                 func.max(q.c.severity),
+                                 func.count(q.c.bug_id)) \
+            .group_by(q.c.checker_id) \
+            .order_by(q.c.checker_id)
+    else:
+        checkers = session.query(reports.c.checker_id,
+                                 reports.c.severity,
+                                 func.count(literal_column('*'))) \
+            .group_by(reports.c.checker_id, reports.c.severity) \
+            .order_by(reports.c.checker_id)
+
+    if limit:
+        checkers = checkers.limit(limit).offset(offset)
+
+    return [CheckerCount(name=name, severity=severity, count=count)
+            for name, severity, count in checkers]
+
+
+def get_checker_msg_counts(session, reports, is_unique, limit, offset):
+    """
+    Count the reports of the given filtered reports selectable by checker
+    message.
+    """
+    if is_unique:
+        q = session.query(func.max(reports.c.checker_message).label(
+                              'checker_message'),
+                          reports.c.bug_id) \
+            .group_by(reports.c.bug_id) \
+            .subquery()
+        checker_messages = session.query(q.c.checker_message,
+                                         func.count(q.c.bug_id)) \
+            .group_by(q.c.checker_message) \
+            .order_by(q.c.checker_message)
+    else:
+        checker_messages = session.query(reports.c.checker_message,
+                                         func.count(literal_column('*'))) \
+            .group_by(reports.c.checker_message) \
+            .order_by(reports.c.checker_message)
+
+    if limit:
+        checker_messages = checker_messages.limit(limit).offset(offset)
+
+    return dict(checker_messages.all())
+
+
+def get_review_status_counts(session, reports, is_unique):
+    """
+    Count the reports of the given filtered reports selectable by review
+    status.
+    """
+    if is_unique:
+        q = session.query(reports.c.bug_id,
+                          func.max(reports.c.review_status).label('status')) \
+            .group_by(reports.c.bug_id) \
+            .subquery()
+        review_statuses = session.query(q.c.status,
+                                        func.count(q.c.bug_id)) \
+            .group_by(q.c.status)
+    else:
+        review_statuses = session.query(reports.c.review_status,
+                                        func.count(literal_column('*'))) \
+            .group_by(reports.c.review_status)
+
+    results = defaultdict(int)
+    for rev_status, count in review_statuses:
+        if rev_status is None:
+            # If no review status is set count it as unreviewed.
+            rev_status = ttypes.ReviewStatus.UNREVIEWED
+            results[rev_status] += count
+        else:
+            rev_status = review_status_enum(rev_status)
+            results[rev_status] += count
+
+    return results
+
+
+def get_detection_status_counts(session, reports):
+    """
+    Count the reports of the given filtered reports selectable by detection
+    status.
+    """
+    detection_stats = session.query(reports.c.detection_status,
+                                    func.count(literal_column('*'))) \
+        .group_by(reports.c.detection_status)
+
+    return {detection_status_enum(k): v for k, v in detection_stats}
+
+
+def get_file_counts(session, reports, is_unique, limit, offset):
+    """
+    Count the reports of the given filtered reports selectable by file path.
+    """
+    if is_unique:
+        reports = session.query(reports.c.bug_id,
+                                reports.c.file_id) \
+            .group_by(reports.c.bug_id, reports.c.file_id) \
+            .subquery()
+
+    # When using pg8000, 1 cannot be passed as parameter to the count
+    # function. This is the reason why we have to convert it to
+    # Integer (see: https://github.com/mfenniak/pg8000/issues/110)
+    count_int = cast(1, sqlalchemy.Integer)
+    report_count = session.query(reports.c.file_id,
+                                 func.count(count_int).label(
+                                     'report_count')) \
+        .group_by(reports.c.file_id)
+
+    if limit:
+        report_count = report_count.limit(limit).offset(offset)
+
+    report_count = report_count.subquery()
+    file_paths = session.query(File.filepath,
+                               report_count.c.report_count) \
+        .join(report_count,
+              report_count.c.file_id == File.id)
+
+    return dict(file_paths)
+
+
+def get_run_history_tag_counts(session, reports, is_unique, run_ids):
+    """
+    Count the reports of the given filtered reports selectable which were
+    present in the tagged run histories of the given runs.
+    """
+    count_expr = func.count(reports.c.bug_id if not is_unique
+                            else reports.c.bug_id.distinct())
+
+    count_q = session.query(RunHistory.id.label('run_history_id'),
+                            count_expr.label('report_count')) \
+        .outerjoin(reports,
+                   reports.c.run_id == RunHistory.run_id) \
+        .filter(RunHistory.version_tag.isnot(None)) \
+        .filter(and_(reports.c.detected_at <= RunHistory.time,
+                     or_(reports.c.fixed_at.is_(None),
+                         reports.c.fixed_at >= RunHistory.time))) \
+        .group_by(RunHistory.id) \
+        .subquery()
+
+    tag_q = session.query(RunHistory.run_id.label('run_id'),
+                          RunHistory.id.label('run_history_id')) \
+        .filter(RunHistory.version_tag.isnot(None))
+
+    if run_ids:
+        tag_q = tag_q.filter(RunHistory.run_id.in_(run_ids))
+
+    tag_q = tag_q.subquery()
+
+    q = session.query(tag_q.c.run_history_id,
+                      func.max(Run.name).label('run_name'),
+                      func.max(RunHistory.id),
+                      func.max(RunHistory.time),
+                      func.max(RunHistory.version_tag),
+                      func.max(count_q.c.report_count)) \
+        .outerjoin(RunHistory,
+                   RunHistory.id == tag_q.c.run_history_id) \
+        .outerjoin(Run, Run.id == tag_q.c.run_id) \
+        .outerjoin(count_q,
+                   count_q.c.run_history_id == RunHistory.id) \
+        .filter(RunHistory.version_tag.isnot(None)) \
+        .group_by(tag_q.c.run_history_id, RunHistory.time) \
+        .order_by(RunHistory.time.desc())
+
+    results = []
+    for _, run_name, tag_id, version_time, tag, count in q:
+        if tag:
+            results.append(RunTagCount(id=tag_id,
+                                       time=str(version_time),
+                                       name=tag,
+                                       runName=run_name,
+                                       count=count if count else 0))
+    return results
 
 
 def check_remove_runs_lock(session, run_ids):
@@ -615,10 +984,11 @@ class ThriftRequestHandler(object):
                  product,
                  auth_session,
                  config_database,
-                 checker_md_docs,
-                 checker_md_docs_map,
+                 checker_docs,
                  package_version,
-                 context):
+                 context,
+                 store_queue,
+                 parse_pool=None):
 
         if not product:
             raise ValueError("Cannot initialize request handler without "
@@ -628,11 +998,12 @@ class ThriftRequestHandler(object):
         self.__product = product
         self.__auth_session = auth_session
         self.__config_database = config_database
-        self.__checker_md_docs = checker_md_docs
-        self.__checker_doc_map = checker_md_docs_map
+        self.__checker_docs = checker_docs
         self.__package_version = package_version
         self.__Session = Session
         self.__context = context
+        self.__store_queue = store_queue
+        self.__parse_pool = parse_pool
         self.__permission_args = {
             'productID': product.id
         }
@@ -696,13 +1067,16 @@ class ThriftRequestHandler(object):
 
         with DBSession(self.__Session) as session:
 
-            # Count the reports subquery.
-            stmt = session.query(Report.run_id,
-                                 func.count(Report.bug_id)
-                                 .label('report_count'))
-
-            stmt = filter_unresolved_reports(stmt) \
-                .group_by(Report.run_id).subquery()
+            # Count the unresolved reports from the run report summaries.
+            stmt = session.query(RunReportSummary.run_id,
+                                 func.sum(RunReportSummary.report_count)
+                                 .label('report_count')) \
+                .filter(RunReportSummary.detection_status.notin_(
+                    SKIP_DETECTION_STATUSES)) \
+                .filter(RunReportSummary.review_status.notin_(
+                    SKIP_REVIEW_STATUSES)) \
+                .group_by(RunReportSummary.run_id) \
+                .subquery()
 
             tag_q = session.query(RunHistory.run_id,
                                   func.max(RunHistory.id).label(
@@ -745,19 +1119,23 @@ class ThriftRequestHandler(object):
             run_filter.ids = [r[0] for r in run_data]
 
             # Get report count for each detection statuses.
-            status_q = session.query(Report.run_id,
-                                     Report.detection_status,
-                                     func.count(Report.bug_id))
+            status_q = session.query(
+                RunReportSummary.run_id,
+                RunReportSummary.detection_status,
+                func.sum(RunReportSummary.report_count))
 
             if run_filter and run_filter.ids is not None:
-                status_q = status_q.filter(Report.run_id.in_(run_filter.ids))
+                status_q = status_q.filter(
+                    RunReportSummary.run_id.in_(run_filter.ids))
 
-            status_q = status_q.group_by(Report.run_id,
-                                         Report.detection_status)
+            status_q = status_q.group_by(RunReportSummary.run_id,
+                                         RunReportSummary.detection_status)
 
             status_sum = defaultdict(defaultdict)
             for run_id, status, count in status_q:
-                status_sum[run_id][detection_status_enum(status)] = count
+                if count:
+                    status_sum[run_id][detection_status_enum(status)] = \
+                        int(count)
 
             # Get analyzer statistics.
             analyzer_statistics = defaultdict(lambda: defaultdict())
@@ -948,7 +1326,6 @@ class ThriftRequestHandler(object):
                     return []
 
                 base_hashes = session.query(Report.bug_id.label('bug_id')) \
-                    .outerjoin(File, Report.file_id == File.id) \
                     .filter(Report.detection_status.notin_(skip_statuses_str))
 
                 if run_ids:
@@ -1001,12 +1378,13 @@ class ThriftRequestHandler(object):
             else:
                 return []
 
-    @exc_to_thrift_reqfail
-    @timeit
-    def getRunResults(self, run_ids, limit, offset, sort_types,
-                      report_filter, cmp_data, get_details):
-        self.__require_access()
-
+    def __get_run_results(self, run_ids, limit, offset, cursor, sort_types,
+                          report_filter, cmp_data, get_details):
+        """
+        Returns the page of the run results and the cursor of the next page.
+        The page starts after the given cursor if it is set, otherwise after
+        the given number of reports.
+        """
         limit = verify_limit_range(limit)
 
         with DBSession(self.__Session) as session:
@@ -1018,12 +1396,11 @@ class ThriftRequestHandler(object):
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
+            nulls_largest = session.get_bind().dialect.name == 'postgresql'
+
             is_unique = report_filter is not None and report_filter.isUnique
             if is_unique:
                 sort_types, sort_type_map, order_type_map = \
@@ -1047,18 +1424,27 @@ class ThriftRequestHandler(object):
                     .group_by(Report.bug_id) \
                     .subquery()
 
+                keys = get_sort_keys(sort_types, sort_type_map,
+                                     unique_reports.c.id, unique_reports.c)
+
                 # Sort the results
                 sorted_reports = \
-                    session.query(unique_reports.c.id)
+                    session.query(unique_reports.c.id,
+                                  *[column for column, _ in keys])
+
+                if cursor:
+                    sorted_reports = sorted_reports.filter(get_keyset_filter(
+                        keys, decode_cursor(cursor, len(keys)),
+                        nulls_largest))
 
                 sorted_reports = sort_results_query(sorted_reports,
                                                     sort_types,
                                                     sort_type_map,
                                                     order_type_map,
-                                                    True)
+                                                    True) \
+                    .order_by(asc(unique_reports.c.id))
 
-                sorted_reports = sorted_reports \
-                    .limit(limit).offset(offset).subquery()
+                page = sorted_reports.limit(limit).offset(offset).all()
 
                 q = session.query(Report.id, Report.bug_id,
                                   Report.checker_message, Report.checker_id,
@@ -1069,18 +1455,17 @@ class ThriftRequestHandler(object):
                     .outerjoin(File, Report.file_id == File.id) \
                     .outerjoin(ReviewStatus,
                                ReviewStatus.bug_hash == Report.bug_id) \
-                    .outerjoin(sorted_reports,
-                               sorted_reports.c.id == Report.id) \
-                    .filter(sorted_reports.c.id.isnot(None))
+                    .filter(Report.id.in_([r[0] for r in page]))
 
-                # We have to sort the results again because an ORDER BY in a
-                # subtable is broken by the JOIN.
+                # We have to sort the results again because the order of the
+                # page is not kept by the IN filter.
                 q = sort_results_query(q,
                                        sort_types,
                                        sort_type_map,
-                                       order_type_map)
+                                       order_type_map) \
+                    .order_by(asc(Report.id))
 
-                query_result = q.all()
+                query_result = q.all() if page else []
 
                 # Get report details if it is required.
                 report_details = {}
@@ -1104,7 +1489,14 @@ class ThriftRequestHandler(object):
                                    fixedAt=str(fixed_at),
                                    bugPathLength=bug_path_len,
                                    details=report_details.get(report_id)))
+
+                last_keys = page[-1][1:] if page else None
             else:
+                sort_types, sort_type_map, order_type_map = \
+                    get_sort_map(sort_types)
+
+                keys = get_sort_keys(sort_types, sort_type_map, Report.id)
+
                 q = session.query(Report.run_id, Report.id, Report.file_id,
                                   Report.line, Report.column,
                                   Report.detection_status, Report.bug_id,
@@ -1112,10 +1504,8 @@ class ThriftRequestHandler(object):
                                   Report.severity, Report.detected_at,
                                   Report.fixed_at, ReviewStatus,
                                   File.filepath,
-                                  Report.path_length) \
-                    .outerjoin(File, Report.file_id == File.id) \
-                    .outerjoin(ReviewStatus,
-                               ReviewStatus.bug_hash == Report.bug_id) \
+                                  Report.path_length,
+                                  *[column for column, _ in keys]) \
                     .filter(filter_expression)
 
                 if run_ids:
@@ -1124,11 +1514,16 @@ class ThriftRequestHandler(object):
                 if cmp_data:
                     q = q.filter(Report.bug_id.in_(diff_hashes))
 
-                sort_types, sort_type_map, order_type_map = \
-                    get_sort_map(sort_types)
+                if cursor:
+                    q = q.filter(get_keyset_filter(
+                        keys, decode_cursor(cursor, len(keys)),
+                        nulls_largest))
+
+                q = join_report_tables(q)
 
                 q = sort_results_query(q, sort_types, sort_type_map,
-                                       order_type_map)
+                                       order_type_map) \
+                    .order_by(asc(Report.id))
 
                 q = q.limit(limit).offset(offset)
 
@@ -1140,10 +1535,10 @@ class ThriftRequestHandler(object):
                     report_ids = [r[1] for r in query_result]
                     report_details = get_report_details(session, report_ids)
 
-                for run_id, report_id, file_id, line, column, d_status, \
-                    bug_id, checker_msg, checker, severity, detected_at,\
-                    fixed_at, r_status, path, bug_path_len \
-                        in query_result:
+                for row in query_result:
+                    run_id, report_id, file_id, line, column, d_status, \
+                        bug_id, checker_msg, checker, severity, detected_at, \
+                        fixed_at, r_status, path, bug_path_len = row[:15]
 
                     review_data = create_review_data(r_status)
                     results.append(
@@ -1165,7 +1560,36 @@ class ThriftRequestHandler(object):
                                    bugPathLength=bug_path_len,
                                    details=report_details.get(report_id)))
 
-            return results
+                last_keys = query_result[-1][15:] if query_result else None
+
+            next_cursor = None
+            if limit and len(results) == limit and last_keys:
+                next_cursor = encode_cursor(last_keys)
+
+            return results, next_cursor
+
+    @exc_to_thrift_reqfail
+    @timeit
+    def getRunResults(self, run_ids, limit, offset, sort_types,
+                      report_filter, cmp_data, get_details):
+        self.__require_access()
+
+        results, _ = self.__get_run_results(run_ids, limit, offset, None,
+                                            sort_types, report_filter,
+                                            cmp_data, get_details)
+        return results
+
+    @exc_to_thrift_reqfail
+    @timeit
+    def getRunResultsPage(self, run_ids, limit, cursor, sort_types,
+                          report_filter, cmp_data, get_details):
+        self.__require_access()
+
+        results, next_cursor = self.__get_run_results(run_ids, limit, 0,
+                                                      cursor, sort_types,
+                                                      report_filter,
+                                                      cmp_data, get_details)
+        return ReportDataPage(reports=results, nextCursor=next_cursor)
 
     @timeit
     def getRunReportCounts(self, run_ids, report_filter, limit, offset):
@@ -1188,12 +1612,9 @@ class ThriftRequestHandler(object):
             if run_ids:
                 q = q.filter(Report.run_id.in_(run_ids))
 
-            q = q.outerjoin(File, Report.file_id == File.id) \
-                .outerjoin(ReviewStatus,
-                           ReviewStatus.bug_hash == Report.bug_id) \
+            q = join_report_tables(q.filter(filter_expression)) \
                 .outerjoin(Run,
                            Report.run_id == Run.id) \
-                .filter(filter_expression) \
                 .order_by(Run.name) \
                 .group_by(Run.id)
 
@@ -1211,32 +1632,9 @@ class ThriftRequestHandler(object):
     @exc_to_thrift_reqfail
     @timeit
     def getRunResultCount(self, run_ids, report_filter, cmp_data):
-        self.__require_access()
-
-        with DBSession(self.__Session) as session:
-            diff_hashes = None
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return 0
-
-            filter_expression = process_report_filter(session, report_filter)
-            q = session.query(Report.bug_id)
-            q = filter_report_filter(q, filter_expression, run_ids, cmp_data,
-                                     diff_hashes)
-
-            if report_filter is not None and report_filter.isUnique:
-                q = q.group_by(Report.bug_id)
-
-            report_count = q.count()
-            if report_count is None:
-                report_count = 0
-
-            return report_count
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.REPORT_COUNT}) \
+            .reportCount
 
     @staticmethod
     @timeit
@@ -1265,6 +1663,26 @@ class ThriftRequestHandler(object):
         with DBSession(self.__Session) as session:
             return get_report_details(session, [reportId])[reportId]
 
+    @exc_to_thrift_reqfail
+    @timeit
+    def getReportDetailsBatch(self, report_ids):
+        self.__require_access()
+
+        max_batch_size = constants.MAX_REPORT_DETAILS_BATCH_SIZE
+        if len(report_ids) > max_batch_size:
+            raise shared.ttypes.RequestFailed(
+                shared.ttypes.ErrorCode.GENERAL,
+                "At most {0} report details can be requested at once."
+                .format(max_batch_size))
+
+        details = {}
+        with DBSession(self.__Session) as session:
+            for ids in util.chunks(set(report_ids),
+                                   constants.MAX_QUERY_SIZE):
+                details.update(get_report_details(session, ids))
+
+        return details
+
     def _setReviewStatus(self, report_id, status, message, session):
         """
         This function sets the review status of the given report. This is the
@@ -1280,6 +1698,7 @@ class ThriftRequestHandler(object):
                 review_status.bug_hash = report.bug_id
 
             user = self.__get_username()
+            old_status = review_status.status
 
             review_status.status = review_status_str(status)
             review_status.author = user
@@ -1289,6 +1708,10 @@ class ThriftRequestHandler(object):
             session.add(review_status)
             session.flush()
 
+            report_summary.change_review_status(session, report.bug_id,
+                                                old_status,
+                                                review_status.status)
+
             return True
         else:
             msg = "No report found in the database."
@@ -1479,36 +1902,24 @@ class ThriftRequestHandler(object):
          - checkerId
         """
 
-        missing_doc = "No documentation found for checker: " + checkerId + \
-                      "\n\nPlease refer to the documentation at the "
-
-        if "." in checkerId:
-            sa_link = "http://clang-analyzer.llvm.org/available_checks.html"
-            missing_doc += "[ClangSA](" + sa_link + ")"
-        elif "-" in checkerId:
-            tidy_link = "http://clang.llvm.org/extra/clang-tidy/checks/" + \
-                      checkerId + ".html"
-            missing_doc += "[ClangTidy](" + tidy_link + ")"
-        missing_doc += " homepage."
-
         try:
-            md_file = self.__checker_doc_map.get(checkerId)
-            if md_file:
-                md_file = os.path.join(self.__checker_md_docs, md_file)
-                try:
-                    with io.open(md_file, 'r') as md_content:
-                        missing_doc = md_content.read()
-                except (IOError, OSError):
-                    LOG.warning("Failed to read checker documentation: %s",
-                                md_file)
-
-            return missing_doc
+            return self.__checker_docs.get(checkerId).content
 
         except Exception as ex:
             msg = str(ex)
             raise shared.ttypes.RequestFailed(shared.ttypes.ErrorCode.IOERROR,
                                               msg)
 
+    def __get_source_file(self, session, content_hash):
+        """
+        Returns the decompressed source file of the given content hash from
+        the source cache of the product.
+        """
+        return self.__product.source_cache.get(
+            content_hash,
+            lambda: get_source_file_content(session, content_hash,
+                                            self.__product.blob_store))
+
     @exc_to_thrift_reqfail
     @timeit
     def getSourceFileData(self, fileId, fileContent, encoding):
@@ -1526,8 +1937,8 @@ class ThriftRequestHandler(object):
                 return SourceFileData()
 
             if fileContent:
-                cont = session.query(FileContent).get(sourcefile.content_hash)
-                source = zlib.decompress(cont.content)
+                source = self.__get_source_file(
+                    session, sourcefile.content_hash).content
 
                 if not encoding or encoding == Encoding.DEFAULT:
                     source = codecs.decode(source, 'utf-8', 'replace')
@@ -1550,10 +1961,10 @@ class ThriftRequestHandler(object):
             res = defaultdict(lambda: defaultdict(str))
             for lines_in_file in lines_in_files_requested:
                 sourcefile = session.query(File).get(lines_in_file.fileId)
-                cont = session.query(FileContent).get(sourcefile.content_hash)
-                lines = zlib.decompress(cont.content).split('\n')
+                source_file = self.__get_source_file(
+                    session, sourcefile.content_hash)
                 for line in lines_in_file.lines:
-                    content = '' if len(lines) < line else lines[line - 1]
+                    content = source_file.get_line(line)
                     if not encoding or encoding == Encoding.DEFAULT:
                         content = codecs.decode(content, 'utf-8', 'replace')
                     elif encoding == Encoding.BASE64:
@@ -1565,8 +1976,9 @@ class ThriftRequestHandler(object):
     def _cmp_helper(self, session, run_ids, report_filter, cmp_data):
         """
         Get the report hashes for all of the runs.
-        Return the hash list which should be queried
-        in the returned run id list.
+        Return the query of the hashes which should be queried
+        in the returned run id list. The comparison is evaluated
+        by the database as a part of the report queries.
         """
         if not run_ids:
             run_ids = ThriftRequestHandler.__get_run_ids_to_query(session,
@@ -1603,17 +2015,17 @@ class ThriftRequestHandler(object):
                                       diff_type)
         return report_hashes, run_ids
 
-    @exc_to_thrift_reqfail
-    @timeit
-    def getCheckerCounts(self, run_ids, report_filter, cmp_data, limit,
-                         offset):
+    def __get_report_facets(self, run_ids, report_filter, cmp_data, facets,
+                            limit=None, offset=None):
         """
-          If the run id list is empty the metrics will be counted
-          for all of the runs and in compare mode all of the runs
-          will be used as a baseline excluding the runs in compare data.
+        Count the requested report facets. The report filter and the
+        comparison are evaluated only once: if multiple facets are requested
+        the filtered reports are materialized into a temporary table which is
+        used to count each facet.
         """
         self.__require_access()
-        results = []
+
+        is_unique = report_filter is not None and report_filter.isUnique
         with DBSession(self.__Session) as session:
             diff_hashes = None
             if cmp_data:
@@ -1621,93 +2033,112 @@ class ThriftRequestHandler(object):
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
-
-            is_unique = report_filter is not None and report_filter.isUnique
-            if is_unique:
-                q = session.query(func.max(Report.checker_id).label(
-                                      'checker_id'),
-                                  func.max(Report.severity).label(
-                                      'severity'),
-                                  Report.bug_id)
+            reports_q = get_filtered_reports_query(
+                session, filter_expression, run_ids, cmp_data, diff_hashes,
+                ReportFacet.REVIEW_STATUS in facets)
+
+            tmp_table = None
+            if len(facets) > 1:
+                tmp_table = create_temporary_report_table(session, reports_q)
+                reports = tmp_table
             else:
-                q = session.query(Report.checker_id,
-                                  Report.severity,
-                                  func.count(Report.id))
+                reports = reports_q.subquery()
 
-            q = filter_report_filter(q, filter_expression, run_ids, cmp_data,
-                                     diff_hashes)
+            results = ReportFacets()
+            try:
+                if ReportFacet.REPORT_COUNT in facets:
+                    results.reportCount = get_report_count(
+                        session, reports, is_unique)
 
-            if is_unique:
-                q = q.group_by(Report.bug_id).subquery()
-                unique_checker_q = session.query(q.c.checker_id,
-                                                 func.max(q.c.severity),
-                                                 func.count(q.c.bug_id)) \
-                    .group_by(q.c.checker_id) \
-                    .order_by(q.c.checker_id)
-            else:
-                unique_checker_q = q.group_by(Report.checker_id,
-                                              Report.severity) \
-                    .order_by(Report.checker_id)
+                if ReportFacet.SEVERITY in facets:
+                    results.severityCounts = get_severity_counts(
+                        session, reports, is_unique)
 
-            if limit:
-                unique_checker_q = unique_checker_q.limit(limit).offset(offset)
+                if ReportFacet.CHECKER_NAME in facets:
+                    results.checkerCounts = get_checker_counts(
+                        session, reports, is_unique, limit, offset)
 
-            for name, severity, count in unique_checker_q:
-                checker_count = CheckerCount(name=name,
-                                             severity=severity,
-                                             count=count)
-                results.append(checker_count)
-        return results
+                if ReportFacet.CHECKER_MSG in facets:
+                    results.checkerMsgCounts = get_checker_msg_counts(
+                        session, reports, is_unique, limit, offset)
+
+                if ReportFacet.REVIEW_STATUS in facets:
+                    results.reviewStatusCounts = get_review_status_counts(
+                        session, reports, is_unique)
+
+                if ReportFacet.DETECTION_STATUS in facets:
+                    results.detectionStatusCounts = \
+                        get_detection_status_counts(session, reports)
+
+                if ReportFacet.FILE in facets:
+                    results.fileCounts = get_file_counts(
+                        session, reports, is_unique, limit, offset)
+
+                if ReportFacet.RUN_HISTORY_TAG in facets:
+                    if cmp_data and not session.query(
+                            diff_hashes.exists()).scalar():
+                        # There is no difference.
+                        results.runHistoryTagCounts = []
+                    else:
+                        results.runHistoryTagCounts = \
+                            get_run_history_tag_counts(session, reports,
+                                                       is_unique, run_ids)
+            except Exception:
+                # A failed query aborts the transaction on PostgreSQL, so the
+                # table can not be dropped there, but the rollback of the
+                # session removes it. SQLite keeps the table on the pooled
+                # connection, so it is dropped explicitly.
+                if tmp_table is not None and \
+                        session.get_bind().dialect.name == 'sqlite':
+                    tmp_table.drop(bind=session.connection())
+                raise
+
+            if tmp_table is not None:
+                tmp_table.drop(bind=session.connection())
+
+            return results
 
     @exc_to_thrift_reqfail
     @timeit
-    def getSeverityCounts(self, run_ids, report_filter, cmp_data):
+    def getReportFacets(self, run_ids, report_filter, cmp_data, facets,
+                        limit, offset):
         """
           If the run id list is empty the metrics will be counted
           for all of the runs and in compare mode all of the runs
           will be used as a baseline excluding the runs in compare data.
         """
-        self.__require_access()
-        results = {}
-        with DBSession(self.__Session) as session:
-            diff_hashes = None
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
-
-            filter_expression = process_report_filter(session, report_filter)
+        limit = verify_limit_range(limit) if limit else None
 
-            is_unique = report_filter is not None and report_filter.isUnique
-            if is_unique:
-                q = session.query(func.max(Report.severity).label('severity'),
-                                  Report.bug_id)
-            else:
-                q = session.query(Report.severity,
-                                  func.count(Report.id))
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        set(facets) if facets else set(),
+                                        limit, offset)
 
-            q = filter_report_filter(q, filter_expression, run_ids, cmp_data,
-                                     diff_hashes)
-
-            if is_unique:
-                q = q.group_by(Report.bug_id).subquery()
-                severities = session.query(q.c.severity,
-                                           func.count(q.c.bug_id)) \
-                    .group_by(q.c.severity)
-            else:
-                severities = q.group_by(Report.severity)
+    @exc_to_thrift_reqfail
+    @timeit
+    def getCheckerCounts(self, run_ids, report_filter, cmp_data, limit,
+                         offset):
+        """
+          If the run id list is empty the metrics will be counted
+          for all of the runs and in compare mode all of the runs
+          will be used as a baseline excluding the runs in compare data.
+        """
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.CHECKER_NAME},
+                                        limit, offset).checkerCounts
 
-            results = dict(severities)
-        return results
+    @exc_to_thrift_reqfail
+    @timeit
+    def getSeverityCounts(self, run_ids, report_filter, cmp_data):
+        """
+          If the run id list is empty the metrics will be counted
+          for all of the runs and in compare mode all of the runs
+          will be used as a baseline excluding the runs in compare data.
+        """
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.SEVERITY}) \
+            .severityCounts
 
     @exc_to_thrift_reqfail
     @timeit
@@ -1718,48 +2149,9 @@ class ThriftRequestHandler(object):
           for all of the runs and in compare mode all of the runs
           will be used as a baseline excluding the runs in compare data.
         """
-        self.__require_access()
-        results = {}
-        with DBSession(self.__Session) as session:
-            diff_hashes = None
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
-
-            filter_expression = process_report_filter(session, report_filter)
-
-            is_unique = report_filter is not None and report_filter.isUnique
-            if is_unique:
-                q = session.query(func.max(Report.checker_message).label(
-                                      'checker_message'),
-                                  Report.bug_id)
-            else:
-                q = session.query(Report.checker_message,
-                                  func.count(Report.id))
-
-            q = filter_report_filter(q, filter_expression, run_ids, cmp_data,
-                                     diff_hashes)
-
-            if is_unique:
-                q = q.group_by(Report.bug_id).subquery()
-                checker_messages = session.query(q.c.checker_message,
-                                                 func.count(q.c.bug_id)) \
-                    .group_by(q.c.checker_message) \
-                    .order_by(q.c.checker_message)
-            else:
-                checker_messages = q.group_by(Report.checker_message) \
-                                    .order_by(Report.checker_message)
-
-            if limit:
-                checker_messages = checker_messages.limit(limit).offset(offset)
-
-            results = dict(checker_messages.all())
-        return results
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.CHECKER_MSG},
+                                        limit, offset).checkerMsgCounts
 
     @exc_to_thrift_reqfail
     @timeit
@@ -1769,52 +2161,9 @@ class ThriftRequestHandler(object):
           for all of the runs and in compare mode all of the runs
           will be used as a baseline excluding the runs in compare data.
         """
-        self.__require_access()
-        results = defaultdict(int)
-        with DBSession(self.__Session) as session:
-            diff_hashes = None
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
-
-            filter_expression = process_report_filter(session, report_filter)
-
-            is_unique = report_filter is not None and report_filter.isUnique
-            if is_unique:
-                q = session.query(Report.bug_id,
-                                  func.max(ReviewStatus.status).label(
-                                      'status'))
-            else:
-                q = session.query(func.max(Report.bug_id),
-                                  ReviewStatus.status,
-                                  func.count(Report.id))
-
-            q = filter_report_filter(q, filter_expression, run_ids, cmp_data,
-                                     diff_hashes)
-
-            if is_unique:
-                q = q.group_by(Report.bug_id).subquery()
-                review_statuses = session.query(func.max(q.c.bug_id),
-                                                q.c.status,
-                                                func.count(q.c.bug_id)) \
-                    .group_by(q.c.status)
-            else:
-                review_statuses = q.group_by(ReviewStatus.status)
-
-            for _, rev_status, count in review_statuses:
-                if rev_status is None:
-                    # If no review status is set count it as unreviewed.
-                    rev_status = ttypes.ReviewStatus.UNREVIEWED
-                    results[rev_status] += count
-                else:
-                    rev_status = review_status_enum(rev_status)
-                    results[rev_status] += count
-        return results
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.REVIEW_STATUS}) \
+            .reviewStatusCounts
 
     @exc_to_thrift_reqfail
     @timeit
@@ -1824,57 +2173,9 @@ class ThriftRequestHandler(object):
           for all of the runs and in compare mode all of the runs
           will be used as a baseline excluding the runs in compare data.
         """
-        self.__require_access()
-        results = {}
-        with DBSession(self.__Session) as session:
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
-
-            filter_expression = process_report_filter(session, report_filter)
-
-            stmt = session.query(Report.bug_id,
-                                 Report.file_id) \
-                .outerjoin(ReviewStatus,
-                           ReviewStatus.bug_hash == Report.bug_id) \
-                .outerjoin(File,
-                           File.id == Report.file_id) \
-                .filter(filter_expression)
-
-            if run_ids:
-                stmt = stmt.filter(Report.run_id.in_(run_ids))
-
-            if report_filter is not None and report_filter.isUnique:
-                stmt = stmt.group_by(Report.bug_id, Report.file_id)
-
-            stmt = stmt.subquery()
-
-            # When using pg8000, 1 cannot be passed as parameter to the count
-            # function. This is the reason why we have to convert it to
-            # Integer (see: https://github.com/mfenniak/pg8000/issues/110)
-            count_int = cast(1, sqlalchemy.Integer)
-            report_count = session.query(stmt.c.file_id,
-                                         func.count(count_int).label(
-                                             'report_count')) \
-                .group_by(stmt.c.file_id)
-
-            if limit:
-                report_count = report_count.limit(limit).offset(offset)
-
-            report_count = report_count.subquery()
-            file_paths = session.query(File.filepath,
-                                       report_count.c.report_count) \
-                .join(report_count,
-                      report_count.c.file_id == File.id)
-
-            for fp, count in file_paths:
-                results[fp] = count
-        return results
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.FILE},
+                                        limit, offset).fileCounts
 
     @exc_to_thrift_reqfail
     @timeit
@@ -1884,83 +2185,9 @@ class ThriftRequestHandler(object):
           for all of the runs and in compare mode all of the runs
           will be used as a baseline excluding the runs in compare data.
         """
-        self.__require_access()
-        results = []
-        with DBSession(self.__Session) as session:
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
-
-            filter_expression = process_report_filter(session, report_filter)
-
-            tag_run_ids = session.query(RunHistory.run_id.distinct()) \
-                .filter(RunHistory.version_tag.isnot(None)) \
-                .subquery()
-
-            report_cnt_q = session.query(Report.run_id,
-                                         Report.bug_id,
-                                         Report.detected_at,
-                                         Report.fixed_at) \
-                .outerjoin(File, Report.file_id == File.id) \
-                .outerjoin(ReviewStatus,
-                           ReviewStatus.bug_hash == Report.bug_id) \
-                .filter(filter_expression) \
-                .filter(Report.run_id.in_(tag_run_ids)) \
-                .subquery()
-
-            is_unique = report_filter is not None and report_filter.isUnique
-            count_expr = func.count(report_cnt_q.c.bug_id if not is_unique
-                                    else report_cnt_q.c.bug_id.distinct())
-
-            count_q = session.query(RunHistory.id.label('run_history_id'),
-                                    count_expr.label('report_count')) \
-                .outerjoin(report_cnt_q,
-                           report_cnt_q.c.run_id == RunHistory.run_id) \
-                .filter(RunHistory.version_tag.isnot(None)) \
-                .filter(and_(report_cnt_q.c.detected_at <= RunHistory.time,
-                             or_(report_cnt_q.c.fixed_at.is_(None),
-                                 report_cnt_q.c.fixed_at >=
-                                 RunHistory.time))) \
-                .group_by(RunHistory.id) \
-                .subquery()
-
-            tag_q = session.query(RunHistory.run_id.label('run_id'),
-                                  RunHistory.id.label('run_history_id')) \
-                .filter(RunHistory.version_tag.isnot(None))
-
-            if run_ids:
-                tag_q = tag_q.filter(RunHistory.run_id.in_(run_ids))
-
-            tag_q = tag_q.subquery()
-
-            q = session.query(tag_q.c.run_history_id,
-                              func.max(Run.name).label('run_name'),
-                              func.max(RunHistory.id),
-                              func.max(RunHistory.time),
-                              func.max(RunHistory.version_tag),
-                              func.max(count_q.c.report_count)) \
-                .outerjoin(RunHistory,
-                           RunHistory.id == tag_q.c.run_history_id) \
-                .outerjoin(Run, Run.id == tag_q.c.run_id) \
-                .outerjoin(count_q,
-                           count_q.c.run_history_id == RunHistory.id) \
-                .filter(RunHistory.version_tag.isnot(None)) \
-                .group_by(tag_q.c.run_history_id, RunHistory.time) \
-                .order_by(RunHistory.time.desc())
-
-            for _, run_name, tag_id, version_time, tag, count in q:
-                if tag:
-                    results.append(RunTagCount(id=tag_id,
-                                               time=str(version_time),
-                                               name=tag,
-                                               runName=run_name,
-                                               count=count if count else 0))
-        return results
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.RUN_HISTORY_TAG}) \
+            .runHistoryTagCounts
 
     @exc_to_thrift_reqfail
     @timeit
@@ -1970,35 +2197,9 @@ class ThriftRequestHandler(object):
           for all of the runs and in compare mode all of the runs
           will be used as a baseline excluding the runs in compare data.
         """
-        self.__require_access()
-        results = {}
-        with DBSession(self.__Session) as session:
-            diff_hashes = None
-            if cmp_data:
-                diff_hashes, run_ids = self._cmp_helper(session,
-                                                        run_ids,
-                                                        report_filter,
-                                                        cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
-
-            filter_expression = process_report_filter(session, report_filter)
-
-            count_expr = func.count(literal_column('*'))
-
-            q = session.query(Report.detection_status,
-                              count_expr)
-
-            q = filter_report_filter(q, filter_expression, run_ids, cmp_data,
-                                     diff_hashes)
-
-            detection_stats = q.group_by(Report.detection_status).all()
-
-            results = dict(detection_stats)
-            results = {detection_status_enum(k): v for k, v in results.items()}
-
-        return results
+        return self.__get_report_facets(run_ids, report_filter, cmp_data,
+                                        {ReportFacet.DETECTION_STATUS}) \
+            .detectionStatusCounts
 
     # -----------------------------------------------------------------------
     @timeit
@@ -2053,33 +2254,27 @@ class ThriftRequestHandler(object):
                                                       run_ids,
                                                       report_filter,
                                                       cmp_data)
-                    if not diff_hashes:
-                        # There is no difference.
-                        return True
 
                 filter_expression = process_report_filter(session,
                                                           report_filter)
 
-                q = session.query(Report.id) \
-                    .outerjoin(File, Report.file_id == File.id) \
-                    .outerjoin(ReviewStatus,
-                               ReviewStatus.bug_hash == Report.bug_id) \
-                    .filter(filter_expression)
-
-                if run_ids:
-                    q = q.filter(Report.run_id.in_(run_ids))
-
-                if cmp_data:
-                    q = q.filter(Report.bug_id.in_(diff_hashes))
+                q = filter_report_filter(session.query(Report.id),
+                                         filter_expression,
+                                         run_ids,
+                                         cmp_data,
+                                         diff_hashes)
 
                 reports_to_delete = [r[0] for r in q]
                 if reports_to_delete:
                     self.__removeReports(session, reports_to_delete)
+                    report_summary.update_run_report_summaries(
+                        session, run_ids or None)
 
                 # Delete files and contents that are not present
                 # in any bug paths.
-                db_cleanup.remove_unused_files(session)
+                unused_blobs = db_cleanup.remove_unused_files(session)
                 session.commit()
+                self.__remove_blobs(session, unused_blobs)
                 session.close()
                 return True
             except Exception as ex:
@@ -2088,6 +2283,22 @@ class ThriftRequestHandler(object):
                 LOG.error(ex)
                 return False
 
+    def __remove_blobs(self, session, content_hashes):
+        """
+        Removes the source blobs of the removed file contents. The blobs are
+        only removed after the removal of their records is committed, and a
+        failure is not fatal, as the remaining blobs are removed by the
+        database cleanup of the server.
+        """
+        blob_store = self.__product.blob_store
+        if not blob_store or not content_hashes:
+            return
+
+        try:
+            db_cleanup.remove_blobs(session, blob_store, content_hashes)
+        except Exception as ex:
+            LOG.warning("Failed to remove unused source blobs: %s", ex)
+
     @exc_to_thrift_reqfail
     @timeit
     def removeRun(self, run_id):
@@ -2103,9 +2314,10 @@ class ThriftRequestHandler(object):
 
             # Delete files and contents that are not present
             # in any bug paths.
-            db_cleanup.remove_unused_files(session)
+            unused_blobs = db_cleanup.remove_unused_files(session)
 
             session.commit()
+            self.__remove_blobs(session, unused_blobs)
             session.close()
 
             LOG.info("Run '%s' was removed by '%s'.", run_id,
@@ -2144,6 +2356,9 @@ class ThriftRequestHandler(object):
                                             user)
 
             session.add(component)
+            session.flush()
+
+            component_files.update_component_files(session, name, value)
             session.commit()
 
             return True
@@ -2200,14 +2415,18 @@ class ThriftRequestHandler(object):
         if not file_hashes:
             return []
 
+        file_hashes = set(file_hashes)
+
         with DBSession(self.__Session) as session:
+            # Only the hashes which pass the filter of the known content
+            # hashes need to be looked up in the database.
+            candidates = self.__product.content_hash_filter.get_candidates(
+                session, file_hashes)
 
-            q = session.query(FileContent) \
-                .options(sqlalchemy.orm.load_only('content_hash')) \
-                .filter(FileContent.content_hash.in_(file_hashes))
+            existing = store_handler.get_existing_content_hashes(session,
+                                                                 candidates)
 
-            return list(set(file_hashes) -
-                        set(map(lambda fc: fc.content_hash, q)))
+            return list(file_hashes - existing)
 
     def __store_source_files(self, source_root, filename_to_hash,
                              trim_path_prefixes):
@@ -2215,50 +2434,49 @@ class ThriftRequestHandler(object):
         Storing file contents from plist.
         """
 
-        file_path_to_id = {}
-
+        files = []
         for file_name, file_hash in filename_to_hash.items():
             source_file_name = os.path.join(source_root,
                                             file_name.strip("/"))
             source_file_name = os.path.realpath(source_file_name)
-            LOG.debug("Storing source file: %s", source_file_name)
             trimmed_file_path = util.trim_path_prefixes(file_name,
                                                         trim_path_prefixes)
 
             if not os.path.isfile(source_file_name):
                 # The file was not in the ZIP file, because we already
-                # have the content. Let's check if we already have a file
-                # record in the database or we need to add one.
-
+                # have the content. Only a file record might be needed in
+                # the database.
                 LOG.debug(file_name + ' not found or already stored.')
-                with DBSession(self.__Session) as session:
-                    fid = store_handler.addFileRecord(session,
-                                                      trimmed_file_path,
-                                                      file_hash)
-                if not fid:
-                    LOG.error("File ID for %s is not found in the DB with "
-                              "content hash %s. Missing from ZIP?",
-                              source_file_name, file_hash)
-                file_path_to_id[file_name] = fid
-                LOG.debug("%d fileid found", fid)
-                continue
-
-            with DBSession(self.__Session) as session:
-                file_path_to_id[file_name] = \
-                    store_handler.addFileContent(session,
-                                                 trimmed_file_path,
-                                                 source_file_name,
-                                                 file_hash,
-                                                 None)
+                source_file_name = None
+
+            files.append((file_name, trimmed_file_path, file_hash,
+                          source_file_name))
+
+        with DBSession(self.__Session) as session:
+            file_ids = store_handler.add_file_records(
+                session, [f[1:] for f in files],
+                blob_store=self.__product.blob_store)
+
+        self.__product.content_hash_filter.add(
+            [content_hash for _, content_hash in file_ids])
+
+        file_path_to_id = {}
+        for file_name, trimmed_file_path, file_hash, _ in files:
+            fid = file_ids.get((trimmed_file_path, file_hash))
+            if not fid:
+                LOG.error("File ID for %s is not found in the DB with "
+                          "content hash %s. Missing from ZIP?",
+                          file_name, file_hash)
+            file_path_to_id[file_name] = fid
 
         return file_path_to_id
 
-    def __store_reports(self, session, report_dir, source_root, run_id,
-                        file_path_to_id, run_history_time, severity_map,
-                        wrong_src_code_comments, skip_handler,
-                        checkers):
+    def __store_reports(self, session, parsed_report_files, run_id,
+                        run_history_time, severity_map,
+                        wrong_src_code_comments, checkers):
         """
-        Parse up and store the plist report files.
+        Store the reports which were parsed up from the plist report files
+        by store_handler.parse_report_files().
         """
 
         all_reports = session.query(Report) \
@@ -2298,42 +2516,13 @@ class ThriftRequestHandler(object):
             return not checker_name.startswith('clang-diagnostic-') and \
                 enabled_checkers and checker_name not in enabled_checkers
 
-        sc_handler = SourceCodeCommentHandler()
-
-        # Processing PList files.
-        _, _, report_files = next(os.walk(report_dir), ([], [], []))
-        for f in report_files:
-            if not f.endswith('.plist'):
-                continue
-
-            LOG.debug("Parsing input file '%s'", f)
-
-            try:
-                files, reports = plist_parser.parse_plist_file(
-                    os.path.join(report_dir, f), source_root)
-            except Exception as ex:
-                LOG.error('Parsing the plist failed: %s', str(ex))
-                continue
-
-            file_ids = {}
-            for file_name in files:
-                file_ids[file_name] = file_path_to_id[file_name]
-
-            # Store report.
-            for report in reports:
+        for parsed_reports in parsed_report_files:
+            for report in parsed_reports:
                 checker_name = report.main['check_name']
 
-                source_file = files[report.main['location']['file']]
-                if skip_handler.should_skip(source_file):
-                    continue
-
-                bug_paths, bug_events, bug_extended_data = \
-                    store_handler.collect_paths_events(report, file_ids,
-                                                       files)
-                report_path_hash = get_report_path_hash(report, files)
-                if report_path_hash in already_added:
+                if report.path_hash in already_added:
                     LOG.debug('Not storing report. Already added')
-                    LOG.debug(report)
+                    LOG.debug(report.main)
                     continue
 
                 LOG.debug("Storing check results to the database.")
@@ -2360,32 +2549,20 @@ class ThriftRequestHandler(object):
                 report_id = store_handler.addReport(
                     session,
                     run_id,
-                    file_ids[source_file],
+                    report.file_id,
                     report.main,
-                    bug_paths,
-                    bug_events,
-                    bug_extended_data,
+                    report.bug_paths,
+                    report.bug_events,
+                    report.bug_extended_data,
                     detection_status,
                     detected_at,
                     severity_map)
 
                 new_bug_hashes.add(bug_id)
-                already_added.add(report_path_hash)
-
-                last_report_event = report.bug_path[-1]
-                file_name = files[last_report_event['location']['file']]
-                source_file_name = os.path.realpath(
-                    os.path.join(source_root, file_name.strip("/")))
-
-                if os.path.isfile(source_file_name):
-                    report_line = last_report_event['location']['line']
-                    source_file = os.path.basename(file_name)
-
-                    src_comment_data = sc_handler.filter_source_line_comments(
-                        source_file_name,
-                        report_line,
-                        checker_name)
+                already_added.add(report.path_hash)
 
+                src_comment_data = report.src_comment_data
+                if src_comment_data is not None:
                     if len(src_comment_data) == 1:
                         status = src_comment_data[0]['status']
                         rw_status = ttypes.ReviewStatus.FALSE_POSITIVE
@@ -2403,11 +2580,13 @@ class ThriftRequestHandler(object):
                             "Multiple source code comment can be found "
                             "for '%s' checker in '%s' at line %s. "
                             "This bug will not be suppressed!",
-                            checker_name, source_file, report_line)
+                            checker_name, report.source_file,
+                            report.report_line)
 
-                        wrong_src_code = "{0}|{1}|{2}".format(source_file,
-                                                              report_line,
-                                                              checker_name)
+                        wrong_src_code = "{0}|{1}|{2}".format(
+                            report.source_file,
+                            report.report_line,
+                            checker_name)
                         wrong_src_code_comments.append(wrong_src_code)
 
                 LOG.debug("Storing done for report %d", report_id)
@@ -2557,69 +2736,90 @@ class ThriftRequestHandler(object):
                                                    max_run_count,
                                                    remove_run_count))
 
-    @exc_to_thrift_reqfail
-    @timeit
-    def massStoreRun(self, name, tag, version, b64zip, force,
-                     trim_path_prefixes):
-        self.__require_store()
-
-        user = self.__auth_session.user if self.__auth_session else None
-
-        # Check constraints of the run.
-        self.__check_run_limit(name)
+    def __wait_for_run_lock(self, name, username):
+        """
+        Acquire the run lock of the given run name. If the run is locked by
+        a store operation of another server process the lock is polled until
+        it becomes free or RUN_LOCK_WAIT_TIMEOUT is reached.
+        """
+        deadline = time.time() + RUN_LOCK_WAIT_TIMEOUT
+        while True:
+            try:
+                with DBSession(self.__Session) as session:
+                    ThriftRequestHandler.__store_run_lock(session, name,
+                                                          username)
+                return
+            except shared.ttypes.RequestFailed:
+                if time.time() >= deadline:
+                    raise
 
-        with DBSession(self.__Session) as session:
-            ThriftRequestHandler.__store_run_lock(session, name, user)
+            time.sleep(1)
 
-        wrong_src_code_comments = []
+    @exc_to_thrift_reqfail
+    def __mass_store(self, zip_dir, name, tag, version, force,
+                     trim_path_prefixes, user):
+        """
+        Store the run which was extracted into zip_dir. This is executed by
+        a store worker of the store queue, and zip_dir is removed at the end.
+        """
         try:
-            with TemporaryDirectory() as zip_dir:
-                unzip(b64zip, zip_dir)
-
-                LOG.debug("Using unzipped folder '%s'", zip_dir)
-
-                source_root = os.path.join(zip_dir, 'root')
-                report_dir = os.path.join(zip_dir, 'reports')
-                metadata_file = os.path.join(report_dir, 'metadata.json')
-                skip_file = os.path.join(report_dir, 'skip_file')
-                content_hash_file = os.path.join(zip_dir,
-                                                 'content_hashes.json')
-
-                skip_handler = skiplist_handler.SkipListHandler()
-                if os.path.exists(skip_file):
-                    LOG.debug("Pocessing skip file %s", skip_file)
-                    try:
-                        with open(skip_file) as sf:
-                            skip_handler = \
-                                skiplist_handler.SkipListHandler(sf.read())
-                    except (IOError, OSError) as err:
-                        LOG.error("Failed to open skip file")
-                        LOG.error(err)
-
-                filename_to_hash = util.load_json_or_empty(content_hash_file,
-                                                           {})
-
-                file_path_to_id = self.__store_source_files(source_root,
-                                                            filename_to_hash,
-                                                            trim_path_prefixes)
+            LOG.debug("Using unzipped folder '%s'", zip_dir)
 
-                run_history_time = datetime.now()
+            source_root = os.path.join(zip_dir, 'root')
+            report_dir = os.path.join(zip_dir, 'reports')
+            metadata_file = os.path.join(report_dir, 'metadata.json')
+            skip_file = os.path.join(report_dir, 'skip_file')
+            content_hash_file = os.path.join(zip_dir, 'content_hashes.json')
 
-                check_commands, check_durations, cc_version, statistics, \
-                    checkers = store_handler.metadata_info(metadata_file)
+            skip_file_content = ""
+            if os.path.exists(skip_file):
+                LOG.debug("Pocessing skip file %s", skip_file)
+                try:
+                    with open(skip_file) as sf:
+                        skip_file_content = sf.read()
+                except (IOError, OSError) as err:
+                    LOG.error("Failed to open skip file")
+                    LOG.error(err)
 
-                command = ''
-                if len(check_commands) == 1:
-                    command = ' '.join(check_commands[0])
-                elif len(check_commands) > 1:
-                    command = "multiple analyze calls: " + \
-                              '; '.join([' '.join(com)
-                                         for com in check_commands])
+            filename_to_hash = util.load_json_or_empty(content_hash_file, {})
 
-                durations = 0
-                if check_durations:
-                    # Round the duration to seconds.
-                    durations = int(sum(check_durations))
+            file_path_to_id = self.__store_source_files(source_root,
+                                                        filename_to_hash,
+                                                        trim_path_prefixes)
+
+            # Parsing and pre-processing the reports is CPU heavy work which
+            # does not need the database, so it is done in the report parser
+            # processes of the server before the run is locked.
+            parsed_report_files = store_handler.parse_report_files(
+                report_dir,
+                source_root,
+                file_path_to_id,
+                skip_file_content,
+                self.__parse_pool)
+
+            check_commands, check_durations, cc_version, statistics, \
+                checkers = store_handler.metadata_info(metadata_file)
+
+            command = ''
+            if len(check_commands) == 1:
+                command = ' '.join(check_commands[0])
+            elif len(check_commands) > 1:
+                command = "multiple analyze calls: " + \
+                          '; '.join([' '.join(com)
+                                     for com in check_commands])
+
+            durations = 0
+            if check_durations:
+                # Round the duration to seconds.
+                durations = int(sum(check_durations))
+
+            # The run is locked only for the transaction which writes the
+            # run's data into the database.
+            self.__wait_for_run_lock(name, user)
+
+            wrong_src_code_comments = []
+            try:
+                run_history_time = datetime.now()
 
                 # This session's transaction buffer stores the actual run data
                 # into the database.
@@ -2652,14 +2852,11 @@ class ThriftRequestHandler(object):
                                                          statistics)
 
                     self.__store_reports(session,
-                                         report_dir,
-                                         source_root,
+                                         parsed_report_files,
                                          run_id,
-                                         file_path_to_id,
                                          run_history_time,
                                          self.__context.severity_map,
                                          wrong_src_code_comments,
-                                         skip_handler,
                                          checkers)
 
                     store_handler.setRunDuration(session,
@@ -2668,25 +2865,108 @@ class ThriftRequestHandler(object):
 
                     store_handler.finishCheckerRun(session, run_id)
 
+                    report_summary.update_run_report_summaries(session,
+                                                               [run_id])
+
                     session.commit()
 
                 return run_id
+            finally:
+                # In any case if the "try" block's execution began, a run lock
+                # must exist, which can now be removed, as storage either
+                # completed successfully, or failed in a detectable manner.
+                # (If the failure is undetectable, the coded grace period
+                # expiry of the lock will allow further store operations to
+                # the given run name.)
+                with DBSession(self.__Session) as session:
+                    ThriftRequestHandler.__free_run_lock(session, name)
+
+                if wrong_src_code_comments:
+                    raise shared.ttypes.RequestFailed(
+                        shared.ttypes.ErrorCode.SOURCE_FILE,
+                        "Multiple source code comment can be found with the "
+                        "same checker name for same bug!",
+                        wrong_src_code_comments)
         finally:
-            # In any case if the "try" block's execution began, a run lock must
-            # exist, which can now be removed, as storage either completed
-            # successfully, or failed in a detectable manner.
-            # (If the failure is undetectable, the coded grace period expiry
-            # of the lock will allow further store operations to the given
-            # run name.)
-            with DBSession(self.__Session) as session:
-                ThriftRequestHandler.__free_run_lock(session, name)
-
-            if wrong_src_code_comments:
-                raise shared.ttypes.RequestFailed(
-                    shared.ttypes.ErrorCode.SOURCE_FILE,
-                    "Multiple source code comment can be found with the same "
-                    "checker name for same bug!",
-                    wrong_src_code_comments)
+            shutil.rmtree(zip_dir, ignore_errors=True)
+
+    def __submit_store(self, name, tag, version, b64zip, force,
+                       trim_path_prefixes):
+        """
+        Stage the received ZIP file on the disk and submit the store of the
+        run into the store queue of the server.
+        """
+        self.__require_store()
+
+        user = self.__auth_session.user if self.__auth_session else None
+
+        # Check constraints of the run.
+        self.__check_run_limit(name)
+
+        zip_dir = tempfile.mkdtemp(prefix='store-')
+        try:
+            unzip(b64zip, zip_dir)
+        except Exception:
+            shutil.rmtree(zip_dir, ignore_errors=True)
+            raise
+
+        return self.__store_queue.submit(
+            self.__product.id,
+            name,
+            lambda: self.__mass_store(zip_dir, name, tag, version, force,
+                                      trim_path_prefixes, user))
+
+    @exc_to_thrift_reqfail
+    @timeit
+    def massStoreRun(self, name, tag, version, b64zip, force,
+                     trim_path_prefixes):
+        task = self.__submit_store(name, tag, version, b64zip, force,
+                                   trim_path_prefixes)
+        task.wait()
+
+        if task.error:
+            raise task.error
+
+        return task.run_id
+
+    @exc_to_thrift_reqfail
+    @timeit
+    def massStoreRunAsynchronous(self, name, tag, version, b64zip, force,
+                                 trim_path_prefixes):
+        task = self.__submit_store(name, tag, version, b64zip, force,
+                                   trim_path_prefixes)
+
+        LOG.info("Store into run '%s' has been submitted with token '%s'.",
+                 name, task.token)
+        return task.token
+
+    @exc_to_thrift_reqfail
+    @timeit
+    def getStoreTaskInfo(self, token):
+        self.__require_store()
+
+        task = self.__store_queue.get(self.__product.id, token)
+        if not task:
+            raise shared.ttypes.RequestFailed(
+                shared.ttypes.ErrorCode.GENERAL,
+                "No store operation found with token '{0}'. The outcome of "
+                "finished store operations is kept only for a limited "
+                "time.".format(token))
+
+        info = ttypes.StoreTaskInfo(
+            token=task.token,
+            runName=task.run_name,
+            status=task.status,
+            runId=task.run_id,
+            enqueuedAt=int(task.enqueued_at),
+            finishedAt=int(task.finished_at) if task.finished_at else None)
+
+        if task.error:
+            info.errorCode = task.error.errorCode
+            info.errorMessage = task.error.message
+            info.errorInfo = task.error.extraInfo
+
+        return info
 
     @exc_to_thrift_reqfail
     @timeit
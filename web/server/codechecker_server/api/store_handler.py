@@ -11,28 +11,46 @@ from __future__ import division
 from __future__ import absolute_import
 
 import base64
+from collections import namedtuple
 import codecs
 from datetime import datetime
 from hashlib import sha256
+import math
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import os
+import signal
 import zlib
 
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 
 import shared
 from codeCheckerDBAccess_v6 import ttypes
 
+from codechecker_common import plist_parser, skiplist_handler
 from codechecker_common.logger import get_logger
-from codechecker_common.util import load_json_or_empty
+from codechecker_common.report import get_report_path_hash
+from codechecker_common.source_code_comment_handler import \
+    SourceCodeCommentHandler
+from codechecker_common.util import chunks, load_json_or_empty
 
+from ..database import component_files
 from ..database.run_db_model import AnalyzerStatistic, \
-    BugPathEvent, BugReportPoint, File, Run, RunHistory, Report, FileContent, \
-    ExtendedReportData
+    BugPathEvent, BugReportPoint, ComponentFile, File, Run, RunHistory, \
+    Report, FileContent, ExtendedReportData
 
 from .thrift_enum_helper import report_extended_data_type_str
 
 LOG = get_logger('system')
 
+# Pre-processed report of a plist file which contains everything needed to
+# store the report into the database.
+ParsedReport = namedtuple('ParsedReport',
+                          ['main', 'file_id', 'bug_paths', 'bug_events',
+                           'bug_extended_data', 'path_hash', 'source_file',
+                           'report_line', 'src_comment_data'])
+
 
 def metadata_info(metadata_file):
     check_commands = []
@@ -591,3 +609,336 @@ def addFileRecord(session, filepath, content_hash):
                     File.filepath == filepath).one_or_none()
 
     return file_record.id if file_record else None
+
+
+# Maximum number of bind parameters in one IN clause when files are queried.
+# SQLite can not handle more than 999 variables in one statement.
+FILE_QUERY_CHUNK_SIZE = 500
+
+
+def insert_ignore_conflicts(session, table, values):
+    """
+    Insert the given rows into the table. Rows which violate a unique
+    constraint, because another transaction has already added the same
+    records in the meantime, are silently skipped.
+    """
+    if not values:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        stmt = postgresql.insert(table).on_conflict_do_nothing()
+    elif dialect == 'sqlite':
+        stmt = table.insert().prefix_with('OR IGNORE')
+    else:
+        stmt = table.insert()
+
+    for values_chunk in chunks(values, FILE_QUERY_CHUNK_SIZE):
+        session.execute(stmt, values_chunk)
+
+
+def get_existing_content_hashes(session, content_hashes):
+    """
+    Returns the subset of the given content hashes which are already stored
+    in the database.
+    """
+    content_hashes = set(content_hashes)
+    if not content_hashes:
+        return set()
+
+    if session.get_bind().dialect.name == 'postgresql':
+        # The hashes are sent as a single array parameter, which keeps the
+        # query plan small regardless of the number of hashes.
+        hashes = sqlalchemy.bindparam(
+            'content_hashes', list(content_hashes),
+            type_=postgresql.ARRAY(sqlalchemy.String))
+        q = session.query(FileContent.content_hash) \
+            .filter(FileContent.content_hash == sqlalchemy.any_(hashes))
+        return set(content_hash for content_hash, in q)
+
+    existing = set()
+    for hashes in chunks(content_hashes, FILE_QUERY_CHUNK_SIZE):
+        q = session.query(FileContent.content_hash) \
+            .filter(FileContent.content_hash.in_(hashes))
+        existing.update(content_hash for content_hash, in q)
+
+    return existing
+
+
+def get_file_ids(session, file_paths):
+    """
+    Returns a dict which maps (filepath, content_hash) pairs to file IDs for
+    the file records of the given file paths.
+    """
+    file_ids = {}
+    for paths in chunks(set(file_paths), FILE_QUERY_CHUNK_SIZE):
+        q = session.query(File.id, File.filepath, File.content_hash) \
+            .filter(File.filepath.in_(paths))
+        for file_id, file_path, content_hash in q:
+            file_ids[(file_path, content_hash)] = file_id
+
+    return file_ids
+
+
+def compress_file_content(args):
+    """
+    Read and compress the content of the given source file.
+    """
+    source_file_name, encoding = args
+    return zlib.compress(get_file_content(source_file_name, encoding),
+                         zlib.Z_BEST_COMPRESSION)
+
+
+def add_file_records(session, files, encoding=None, processes=None,
+                     blob_store=None):
+    """
+    Add the file records and the missing file contents of the given files to
+    the database in batches.
+
+    files -- A list of (filepath, content_hash, source_file_name) tuples.
+             source_file_name is the path of the file which holds the content
+             of the source file, or None if the content is expected to be
+             already stored in the database.
+
+    Returns a dict which maps (filepath, content_hash) pairs to file IDs.
+    Files which have no content in the database and whose content was not
+    given are missing from the returned dict.
+
+    Concurrent store operations may add the same contents and files in the
+    meantime, these conflicting rows are skipped at insert.
+
+    If a blob_store is given, the compressed contents are written into it and
+    only their hash and size are stored in the database.
+
+    This function must not be called between addCheckerRun() and
+    finishCheckerRun() functions when SQLite database is used! See
+    addFileContent() for details.
+    """
+    existing_hashes = get_existing_content_hashes(
+        session, [content_hash for _, content_hash, _ in files])
+
+    contents_to_add = {}
+    for _, content_hash, source_file_name in files:
+        if content_hash not in existing_hashes and source_file_name:
+            contents_to_add[content_hash] = source_file_name
+
+    if contents_to_add:
+        LOG.debug("Compressing %d new source files.", len(contents_to_add))
+
+        # zlib releases the GIL while compressing, so threads are enough to
+        # compress the file contents in parallel.
+        content_hashes = list(contents_to_add.keys())
+        pool = ThreadPool(processes)
+        try:
+            compressed_contents = pool.map(
+                compress_file_content,
+                [(contents_to_add[content_hash], encoding)
+                 for content_hash in content_hashes])
+        finally:
+            pool.close()
+            pool.join()
+
+        if blob_store:
+            content_rows = [
+                {'content_hash': content_hash,
+                 'content': None,
+                 'blob_size': blob_store.put(content_hash, content)}
+                for content_hash, content in zip(content_hashes,
+                                                 compressed_contents)]
+        else:
+            content_rows = [
+                {'content_hash': content_hash,
+                 'content': content,
+                 'blob_size': None}
+                for content_hash, content in zip(content_hashes,
+                                                 compressed_contents)]
+
+        insert_ignore_conflicts(session, FileContent.__table__, content_rows)
+        session.commit()
+
+        existing_hashes.update(content_hashes)
+
+    file_paths = [file_path for file_path, _, _ in files]
+    file_ids = get_file_ids(session, file_paths)
+
+    files_to_add = {}
+    for file_path, content_hash, _ in files:
+        if (file_path, content_hash) in file_ids:
+            continue
+
+        if content_hash not in existing_hashes:
+            LOG.error("File content of '%s' is not found in the database "
+                      "with content hash %s.", file_path, content_hash)
+            continue
+
+        files_to_add[(file_path, content_hash)] = {
+            'filepath': file_path,
+            'filename': os.path.basename(file_path),
+            'content_hash': content_hash}
+
+    if files_to_add:
+        LOG.debug("Adding %d new file records.", len(files_to_add))
+        insert_ignore_conflicts(session, File.__table__,
+                                list(files_to_add.values()))
+        session.commit()
+
+        new_file_ids = get_file_ids(
+            session, [file_path for file_path, _ in files_to_add])
+        file_ids.update(new_file_ids)
+
+        # Map the new files to the source components they belong to.
+        for ids in chunks(list(new_file_ids.values()), FILE_QUERY_CHUNK_SIZE):
+            insert_ignore_conflicts(
+                session, ComponentFile.__table__,
+                component_files.get_component_file_rows(session, ids))
+        session.commit()
+
+    return file_ids
+
+
+def parse_report_file(plist_file, source_root, file_path_to_id,
+                      skip_handler):
+    """
+    Parse the given plist file and pre-process the reports in it, so that
+    only the database writes remain to be done by the caller.
+
+    Returns the list of ParsedReport objects in the order of the reports in
+    the plist file. Reports in skipped source files are not returned.
+    src_comment_data of a ParsedReport is None if the source file of the last
+    bug path event was not sent by the client.
+    """
+    try:
+        files, reports = plist_parser.parse_plist_file(plist_file,
+                                                       source_root)
+    except Exception as ex:
+        LOG.error('Parsing the plist failed: %s', str(ex))
+        return []
+
+    file_ids = {}
+    for file_name in files:
+        file_ids[file_name] = file_path_to_id[file_name]
+
+    sc_handler = SourceCodeCommentHandler()
+
+    parsed_reports = []
+    for report in reports:
+        source_file = files[report.main['location']['file']]
+        if skip_handler.should_skip(source_file):
+            continue
+
+        bug_paths, bug_events, bug_extended_data = \
+            collect_paths_events(report, file_ids, files)
+        report_path_hash = get_report_path_hash(report, files)
+
+        last_report_event = report.bug_path[-1]
+        file_name = files[last_report_event['location']['file']]
+        source_file_name = os.path.realpath(
+            os.path.join(source_root, file_name.strip("/")))
+        report_line = last_report_event['location']['line']
+
+        src_comment_data = None
+        if os.path.isfile(source_file_name):
+            src_comment_data = sc_handler.filter_source_line_comments(
+                source_file_name,
+                report_line,
+                report.main['check_name'])
+
+        parsed_reports.append(ParsedReport(report.main,
+                                           file_ids[source_file],
+                                           bug_paths,
+                                           bug_events,
+                                           bug_extended_data,
+                                           report_path_hash,
+                                           os.path.basename(file_name),
+                                           report_line,
+                                           src_comment_data))
+
+    return parsed_reports
+
+
+# A report parser worker gets at most this many batches of plist files of a
+# store, so the file mapping of the store is not sent with every file.
+PARSE_BATCHES_PER_PROCESS = 4
+
+
+def init_parse_worker():
+    """
+    Initialize a report parser worker process. The signals of the server are
+    handled by the server process, which terminates the workers.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+
+def parse_report_files_worker(args):
+    """
+    Parse a batch of plist files in a report parser worker process.
+    """
+    plist_files, source_root, file_path_to_id, skip_file_content = args
+    skip_handler = skiplist_handler.SkipListHandler(skip_file_content)
+    return [parse_report_file(plist_file, source_root, file_path_to_id,
+                              skip_handler)
+            for plist_file in plist_files]
+
+
+class ReportParserPool(object):
+    """
+    Long-lived pool of report parser worker processes, which is shared by the
+    store operations of a server process.
+
+    The pool must be created before the threads of the server process are
+    started, as forking a process with running threads may deadlock the
+    child processes.
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self.__pool = multiprocessing.Pool(processes,
+                                           initializer=init_parse_worker)
+
+    def map(self, func, items):
+        """
+        Equivalent of map, but the calling thread can still be interrupted.
+        """
+        return self.__pool.map_async(func, items).get(float('inf'))
+
+    def terminate(self):
+        """
+        Stops the worker processes.
+        """
+        self.__pool.terminate()
+        self.__pool.join()
+
+
+def parse_report_files(report_dir, source_root, file_path_to_id,
+                       skip_file_content, pool=None):
+    """
+    Parse every plist file in the report directory, in the given
+    ReportParserPool if any.
+
+    Returns a list which contains the list of ParsedReport objects for each
+    plist file. The order of the files is deterministic, so reports are
+    stored in the same order regardless of the number of processes.
+    """
+    _, _, report_files = next(os.walk(report_dir), ([], [], []))
+    plist_files = [os.path.join(report_dir, f) for f in sorted(report_files)
+                   if f.endswith('.plist')]
+
+    if pool is None or len(plist_files) <= 1:
+        return parse_report_files_worker((plist_files, source_root,
+                                          file_path_to_id,
+                                          skip_file_content))
+
+    batch_size = int(math.ceil(
+        len(plist_files) / (pool.processes * PARSE_BATCHES_PER_PROCESS)))
+    batches = [(plist_files[i:i + batch_size], source_root, file_path_to_id,
+                skip_file_content)
+               for i in range(0, len(plist_files), batch_size)]
+
+    LOG.debug("Parsing %d plist files in %d batches.",
+              len(plist_files), len(batches))
+
+    return [parsed_file
+            for parsed_files in pool.map(parse_report_files_worker, batches)
+            for parsed_file in parsed_files]
@@ -26,7 +26,9 @@ In the configuration `null` means it is not configured.
       "groupBase" : null,
       "groupScope" : "subtree",
       "groupPattern" : null,
-      "groupNameAttr" : null
+      "groupNameAttr" : null,
+      "memberOfAttr" : null,
+      "cacheTimeout" : 300
     }
   ]
 },
@@ -83,6 +85,17 @@ The attribute of the group object which contains the name of the group.
 `groupScope`
 Scope of the search performed. (Valid values are: base, one, subtree)
 
+`memberOfAttr`
+Optional attribute of the user account which contains the DNs of the groups
+of the user, e.g. `memberOf`. If it is set, the groups are read from the
+account found by the user search, without a separate group search. The name
+of a group is the value of the first RDN of its DN.
+
+`cacheTimeout`
+Number of seconds for which the DN and the groups of the users are cached.
+The password is checked by the LDAP server at every login. 0 disables the
+cache.
+
 
 """
 from __future__ import print_function
@@ -90,14 +103,28 @@ from __future__ import division
 from __future__ import absolute_import
 
 from contextlib import contextmanager
+import numbers
+import threading
 
 import ldap
-from ldap.dn import escape_dn_chars
+from ldap.dn import escape_dn_chars, str2dn
 
 from codechecker_common.logger import get_logger
 
+from ..cache import LRUCache
+
 LOG = get_logger('server')
 
+# Default number of seconds for which the DN and the groups of the users are
+# cached.
+DEFAULT_CACHE_TIMEOUT = 300
+
+# Maximum number of cached users.
+USER_CACHE_SIZE = 10000
+
+# Maximum number of idle service connections kept open to an LDAP server.
+MAX_IDLE_CONNECTIONS = 4
+
 
 def log_ldap_error(ldap_error):
     """
@@ -260,6 +287,176 @@ class LDAPConnection(object):
             self.connection.unbind()
 
 
+class ServiceConnectionPool(object):
+    """
+    Pool of the LDAP connections bound with the service user of an LDAP
+    server. The searches of the logins reuse the connections instead of
+    connecting and binding to the LDAP server every time.
+    """
+
+    def __init__(self, ldap_config, max_idle=MAX_IDLE_CONNECTIONS):
+        self.__ldap_config = ldap_config
+        self.__max_idle = max_idle
+        self.__lock = threading.Lock()
+        self.__idle = []
+
+    def __acquire(self):
+        """
+        Returns an idle connection or a new one, and whether the connection
+        was reused. The connection is None if the bind failed.
+        """
+        with self.__lock:
+            if self.__idle:
+                return self.__idle.pop(), True
+
+        LOG.debug("Creating SERVICE connection...")
+        connection = LDAPConnection(self.__ldap_config,
+                                    self.__ldap_config.get('username'),
+                                    self.__ldap_config.get('password'))
+        return connection.connection, False
+
+    def __release(self, connection):
+        with self.__lock:
+            if len(self.__idle) < self.__max_idle:
+                self.__idle.append(connection)
+                return
+
+        _unbind(connection)
+
+    def search_s(self, base, scope, query, attrlist=None):
+        """
+        Run the search on a pooled connection. A reused connection which was
+        closed by the LDAP server is replaced by a new connection.
+        """
+        while True:
+            connection, reused = self.__acquire()
+            if connection is None:
+                raise ldap.LDAPError({'desc': "Service user bind failed."})
+
+            try:
+                result = connection.search_s(base, scope, query, attrlist)
+            except (ldap.SERVER_DOWN, ldap.TIMEOUT):
+                _unbind(connection)
+                if reused:
+                    LOG.debug("Reconnecting to the LDAP server...")
+                    continue
+                raise
+            except ldap.LDAPError:
+                self.__release(connection)
+                raise
+
+            self.__release(connection)
+            return result
+
+    def close(self):
+        """
+        Close the idle connections.
+        """
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+
+        for connection in idle:
+            _unbind(connection)
+
+
+class UserCache(object):
+    """
+    Cache of the DN and the group names of the users of the LDAP servers.
+    The entries expire after the cache timeout of their LDAP server, so the
+    changes of the directory are noticed after the timeout at the latest.
+    """
+
+    def __init__(self, max_size=USER_CACHE_SIZE):
+        self.max_size = max_size
+
+        self.__lock = threading.Lock()
+        self.__users = LRUCache(max_entries=max_size)
+        self.__pools = {}
+
+    def get(self, key):
+        """
+        Returns the cached dict of the user with the 'dn' and the 'groups'
+        of the user, or None. The groups are None if they are not looked up
+        yet.
+        """
+        return self.__users.get(key)
+
+    def put(self, key, timeout, user_dn, groups=None):
+        """
+        Cache the DN and the groups of the user for timeout seconds.
+        """
+        self.__users.put(key, {'dn': user_dn, 'groups': groups}, timeout)
+
+    def get_pool(self, ldap_config):
+        """
+        Returns the pool of the service connections of the given LDAP server
+        configuration.
+        """
+        key = tuple(sorted((k, repr(v)) for k, v in ldap_config.items()))
+        with self.__lock:
+            pool = self.__pools.get(key)
+            if pool is None:
+                pool = ServiceConnectionPool(ldap_config)
+                self.__pools[key] = pool
+
+            return pool
+
+    @property
+    def hits(self):
+        return self.__users.hits
+
+    @property
+    def misses(self):
+        return self.__users.misses
+
+    def clear(self):
+        """
+        Remove every cached user, and close the idle service connections.
+        """
+        self.__users.clear()
+        with self.__lock:
+            pools, self.__pools = self.__pools, {}
+
+        for pool in pools.values():
+            pool.close()
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+        """
+        stats = self.__users.stats()
+        return {'hits': stats['hits'],
+                'misses': stats['misses'],
+                'users': stats['entries']}
+
+
+USER_CACHE = UserCache()
+
+
+def _unbind(connection):
+    try:
+        connection.unbind()
+    except ldap.LDAPError:
+        pass
+
+
+def get_cache_timeout(ldap_config):
+    """
+    Return the number of seconds for which the users of the given LDAP
+    server are cached. The default timeout is used if the configured value
+    is not an integer.
+    """
+    cache_timeout = ldap_config.get('cacheTimeout', DEFAULT_CACHE_TIMEOUT)
+
+    if not isinstance(cache_timeout, numbers.Integral) or \
+            isinstance(cache_timeout, bool):
+        LOG.warning("LDAP cacheTimeout must be an integer! Default value "
+                    "will be used: %s", DEFAULT_CACHE_TIMEOUT)
+        cache_timeout = DEFAULT_CACHE_TIMEOUT
+
+    return cache_timeout
+
+
 def get_ldap_query_scope(scope_form_config):
     """
     Return an ldap scope base on the configured value.
@@ -274,151 +471,220 @@ def get_ldap_query_scope(scope_form_config):
         return ldap.SCOPE_SUBTREE
 
 
-def auth_user(ldap_config, username=None, credentials=None):
+def get_user_dn_and_groups(con,
+                           account_base_dn,
+                           account_pattern,
+                           scope,
+                           member_of_attr,
+                           group_base=None):
     """
-    Authenticate a user.
+    Search for the user dn based on the account pattern, and read the names
+    of the groups of the user from the given attribute of the account, which
+    contains the DNs of the groups. Only the groups under the group base are
+    returned if it is given.
+    Return the full user dn and the group names or None and None if search
+    failed.
     """
-    if not username or not credentials:
-        LOG.warning('No username or credential is provided for'
-                    ' authentication.')
-        return False
 
-    account_base = ldap_config.get('accountBase')
-    if account_base is None:
-        LOG.warning('Account base needs to be configured to query users')
-        return False
+    # Attribute name must be ascii encoded
+    member_of_attr = member_of_attr.encode('ascii', 'ignore')
 
-    account_pattern = ldap_config.get('accountPattern')
-    if account_pattern is None:
-        LOG.warning('No account pattern is defined to search for users.')
-        LOG.warning('Please configure one.')
-        return False
+    with ldap_error_handler():
+        user_data = con.search_s(account_base_dn, scope, account_pattern,
+                                 [member_of_attr])
 
-    username = escape_dn_chars(username)
-    account_pattern = account_pattern.replace('$USN$', username)
+        if user_data:
+            user_dn, attrs = user_data[0]
+            LOG.debug("Found user: %s", user_dn)
 
-    account_scope = ldap_config.get('accountScope', '')
-    account_scope = get_ldap_query_scope(account_scope)
+            groups = []
+            for group_dn in attrs.get(member_of_attr, []):
+                if group_base and \
+                        not group_dn.lower().endswith(group_base.lower()):
+                    continue
 
-    service_user = ldap_config.get('username')
-    service_cred = ldap_config.get('password')
+                # The name of the group is the value of its first RDN.
+                groups.append(str2dn(group_dn)[0][0][1])
 
-    # Service user is not configured try to authenticate
-    # with the given username and credentials.
-    if not service_user:
-        service_user = username
-        service_cred = credentials
+            return user_dn, groups
 
-    LOG.debug("Creating SERVICE connection...")
-    with LDAPConnection(ldap_config, service_user, service_cred) as connection:
-        if connection is None:
-            LOG.error('Please check your LDAP server '
-                      'authentication credentials.')
-            LOG.error('Configured username: %s', service_user)
-            return False
+    LOG.debug("Searching for user failed with pattern: %s", account_pattern)
+    LOG.debug("Account base DN: %s", account_base_dn)
+    return None, None
 
-        user_dn = get_user_dn(connection,
-                              account_base,
-                              account_pattern,
-                              account_scope)
 
-        if user_dn is None:
-            LOG.warning("DN lookup failed for user name: '%s'!", username)
-            if service_user is None:
-                LOG.warning('Anonymous bind might not be enabled.')
-            return False
+def search_groups(con, ldap_config, user_dn):
+    """
+    Search for the names of the groups of the user based on the group
+    pattern.
+    Return None if search failed.
+    """
+    group_pattern = ldap_config.get('groupPattern', '')
+    if group_pattern == '':
+        # There is no group membership pattern to check.
+        return []
+    group_pattern = group_pattern.replace('$USERDN$', user_dn)
+
+    LOG.debug('Checking for group membership.')
+
+    group_scope = ldap_config.get('groupScope', '')
+    group_scope = get_ldap_query_scope(group_scope)
+
+    group_base = ldap_config.get('groupBase')
+    if group_base is None:
+        LOG.error('Group base needs to be configured to'
+                  'query ldap groups.')
+        return []
+
+    group_name_attr = ldap_config.get('groupNameAttr')
+    if group_name_attr is None:
+        LOG.error('groupNameAttr needs to be configured to'
+                  'query ldap groups.'
+                  'Its value must be the name'
+                  'attribute of the group.')
+        return []
+
+    # Attribute name must be ascii encoded
+    group_name_attr = group_name_attr.encode('ascii', 'ignore')
+    attr_list = [group_name_attr]
+
+    LOG.debug("Performing LDAP search for group: %s Group Name Attr: %s",
+              group_pattern, group_name_attr)
 
-    # Bind with the user's DN to check the password given by the user.
-    # If bind is successful the user has given the right password.
-    LOG.debug("Creating USER connection...")
-    with LDAPConnection(ldap_config, user_dn, credentials) as connection:
-        if not connection:
-            LOG.info("User: %s cannot be authenticated.", username)
+    with ldap_error_handler():
+        group_result = con.search_s(group_base,
+                                    group_scope,
+                                    group_pattern,
+                                    attr_list)
 
-        return connection is not None
+        groups = []
+        if group_result:
+            for g in group_result:
+                groups.append(g[1][group_name_attr][0])
 
+        LOG.debug("groups:")
+        LOG.debug(groups)
+        return groups
 
-def get_groups(ldap_config, username, credentials):
+    return None
+
+
+@contextmanager
+def search_connection(ldap_config, username, credentials):
     """
-    Get the LDAP groups for a given user.
+    Connection to search for the users and the groups. The connections of
+    the configured service user are pooled. If the service user is not
+    configured, a new connection is bound with the given username and
+    credentials.
     """
+    if ldap_config.get('username'):
+        yield USER_CACHE.get_pool(ldap_config)
+        return
 
+    with LDAPConnection(ldap_config, username, credentials) as connection:
+        yield connection
+
+
+def get_user(ldap_config, username, credentials, with_groups=False):
+    """
+    Return a dict of the 'dn' and the 'groups' of the user from the user
+    cache, or look them up on the LDAP server. The groups are looked up
+    only if with_groups is True, or if they are read from the account of the
+    user.
+    Return None if the user is not found.
+    """
     account_base = ldap_config.get('accountBase')
     if account_base is None:
-        LOG.error('Account base needs to be configured to query users')
-        return False
+        LOG.warning('Account base needs to be configured to query users')
+        return None
 
     account_pattern = ldap_config.get('accountPattern')
     if account_pattern is None:
-        LOG.error('No account pattern is defined to search for users.')
-        LOG.error('Please configure one.')
-        return False
+        LOG.warning('No account pattern is defined to search for users.')
+        LOG.warning('Please configure one.')
+        return None
 
-    account_pattern = account_pattern.replace('$USN$', username)
+    account_pattern = account_pattern.replace('$USN$',
+                                              escape_dn_chars(username))
 
     account_scope = ldap_config.get('accountScope', '')
     account_scope = get_ldap_query_scope(account_scope)
 
-    service_user = ldap_config.get('username')
-    service_cred = ldap_config.get('password')
-    if not service_user:
-        service_user = username
-        service_cred = credentials
+    member_of_attr = ldap_config.get('memberOfAttr')
 
-    LOG.debug("creating LDAP connection. service user %s", service_user)
-    with LDAPConnection(ldap_config, service_user, service_cred) as connection:
+    key = (ldap_config.get('connection_url'), account_base, account_scope,
+           account_pattern, member_of_attr) + \
+        tuple(ldap_config.get(option) for option in
+              ['groupBase', 'groupScope', 'groupPattern', 'groupNameAttr'])
+    user = USER_CACHE.get(key)
+    if user and (user['groups'] is not None or not with_groups):
+        return user
+
+    with search_connection(ldap_config, username, credentials) as connection:
         if connection is None:
             LOG.error('Please check your LDAP server '
                       'authentication credentials.')
-            return False
+            return None
 
-        user_dn = get_user_dn(connection,
-                              account_base,
-                              account_pattern,
-                              account_scope)
+        user_dn = user['dn'] if user else None
+        groups = None
+        if user_dn is None:
+            if member_of_attr:
+                # The user and the groups are found by one search.
+                user_dn, groups = get_user_dn_and_groups(
+                    connection, account_base, account_pattern, account_scope,
+                    member_of_attr, ldap_config.get('groupBase'))
+            else:
+                user_dn = get_user_dn(connection,
+                                      account_base,
+                                      account_pattern,
+                                      account_scope)
 
-        group_pattern = ldap_config.get('groupPattern', '')
-        if user_dn and group_pattern == '':
-            # User found and there is no group membership pattern to check.
-            return []
-        group_pattern = group_pattern.replace('$USERDN$', user_dn)
+            if user_dn is None:
+                LOG.warning("DN lookup failed for user name: '%s'!",
+                            username)
+                return None
 
-        LOG.debug('Checking for group membership.')
+        if with_groups and groups is None:
+            groups = search_groups(connection, ldap_config, user_dn)
 
-        group_scope = ldap_config.get('groupScope', '')
-        group_scope = get_ldap_query_scope(group_scope)
+    # The groups are not cached if the group search failed.
+    USER_CACHE.put(key, get_cache_timeout(ldap_config), user_dn, groups)
 
-        group_base = ldap_config.get('groupBase')
-        if group_base is None:
-            LOG.error('Group base needs to be configured to'
-                      'query ldap groups.')
-            return []
+    return {'dn': user_dn, 'groups': groups}
 
-        group_name_attr = ldap_config.get('groupNameAttr')
-        if group_name_attr is None:
-            LOG.error('groupNameAttr needs to be configured to'
-                      'query ldap groups.'
-                      'Its value must be the name'
-                      'attribute of the group.')
-            return []
 
-        # Attribute name must be ascii encoded
-        group_name_attr = group_name_attr.encode('ascii', 'ignore')
-        attr_list = [group_name_attr]
+def auth_user(ldap_config, username=None, credentials=None):
+    """
+    Authenticate a user.
+    """
+    if not username or not credentials:
+        LOG.warning('No username or credential is provided for'
+                    ' authentication.')
+        return False
 
-        LOG.debug("Performing LDAP search for group: %s Group Name Attr: %s",
-                  group_pattern, group_name_attr)
+    user = get_user(ldap_config, username, credentials)
+    if user is None:
+        if not ldap_config.get('username'):
+            LOG.warning('Anonymous bind might not be enabled.')
+        return False
 
-        groups = []
-        with ldap_error_handler():
-            group_result = connection.search_s(group_base,
-                                               group_scope,
-                                               group_pattern,
-                                               attr_list)
-            if group_result:
-                for g in group_result:
-                    groups.append(g[1][group_name_attr][0])
+    # Bind with the user's DN to check the password given by the user.
+    # If bind is successful the user has given the right password.
+    LOG.debug("Creating USER connection...")
+    with LDAPConnection(ldap_config, user['dn'], credentials) as connection:
+        if not connection:
+            LOG.info("User: %s cannot be authenticated.", username)
 
-        LOG.debug("groups:")
-        LOG.debug(groups)
-        return groups
+        return connection is not None
+
+
+def get_groups(ldap_config, username, credentials):
+    """
+    Get the LDAP groups for a given user.
+    """
+    user = get_user(ldap_config, username, credentials, True)
+    if user is None:
+        return []
+
+    return user['groups'] or []
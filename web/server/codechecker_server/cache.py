@@ -0,0 +1,144 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Bounded in-memory cache, the base of the caches of the server.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class LRUCache(object):
+    """
+    Thread-safe least recently used cache.
+
+    The number of the cached values is kept under max_entries, and the total
+    size of the cached values is kept under max_size, where the size of a
+    value is returned by get_size. Values larger than max_size are not
+    cached. The limits which are None are not enforced.
+
+    The cached values expire after ttl seconds if it is not None. A time to
+    live which is not positive disables the caching. None can not be cached,
+    as get() returns None for the values which are not cached.
+    """
+
+    def __init__(self, max_entries=None, max_size=None, get_size=None,
+                 ttl=None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self.__get_size = get_size
+        self.__lock = threading.Lock()
+
+        # Key -> (value, size, expiry time or None), in the order of their
+        # use, the least recently used first.
+        self.__entries = OrderedDict()
+        self.__size = 0
+
+        # Incremented by every clear(), so the values which were loaded
+        # before it can be rejected by put().
+        self.__generation = 0
+
+    def get(self, key, is_valid=None):
+        """
+        Returns the cached value of the given key, or None if it is not
+        cached. If is_valid is given, it is called with the cached value, and
+        the value is dropped if it returns False.
+        """
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is not None:
+                value, size, expires_at = entry
+                if (expires_at is None or expires_at > time.time()) and \
+                        (is_valid is None or is_valid(value)):
+                    # Move the value to the most recently used end.
+                    self.__entries[key] = entry
+                    self.hits += 1
+                    return value
+
+                self.__size -= size
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value, ttl=None, generation=None):
+        """
+        Caches the value of the given key, replacing its previous value. The
+        given time to live overrides the default one of the cache. If the
+        generation is given, the value is not cached if the cache has been
+        cleared since that generation.
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        if ttl is not None and ttl <= 0:
+            return
+
+        size = self.__get_size(value) if self.__get_size else 0
+        if self.max_size is not None and size > self.max_size:
+            return
+
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return
+
+            old_entry = self.__entries.pop(key, None)
+            if old_entry is not None:
+                self.__size -= old_entry[1]
+
+            expires_at = time.time() + ttl if ttl is not None else None
+            self.__entries[key] = (value, size, expires_at)
+            self.__size += size
+
+            while (self.max_entries is not None and
+                   len(self.__entries) > self.max_entries) or \
+                    (self.max_size is not None and
+                     self.__size > self.max_size):
+                _, (_, evicted_size, _) = self.__entries.popitem(last=False)
+                self.__size -= evicted_size
+
+    def clear(self):
+        """
+        Removes every cached value.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+            self.__generation += 1
+
+    @property
+    def generation(self):
+        """
+        Number of the clear() calls, see put().
+        """
+        return self.__generation
+
+    @property
+    def size(self):
+        """
+        Total size of the cached values.
+        """
+        return self.__size
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+        """
+        with self.__lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'entries': len(self.__entries),
+                    'size': self.__size}
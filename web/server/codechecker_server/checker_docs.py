@@ -0,0 +1,177 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+In-memory cache of the checker documentations.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import hashlib
+import io
+import os
+import threading
+import zlib
+
+from codechecker_common import util
+from codechecker_common.logger import get_logger
+
+from .cache import LRUCache
+from .static_cache import COMPRESSION_MIN_SIZE
+
+LOG = get_logger('server')
+
+# Default number of the cached checker documentations.
+CHECKER_DOC_CACHE_SIZE = 1024
+
+
+def get_missing_doc(checker_id):
+    """
+    Returns the documentation of the checkers which have no documentation
+    file, pointing to the homepage of the analyzer of the checker.
+    """
+    missing_doc = "No documentation found for checker: " + checker_id + \
+                  "\n\nPlease refer to the documentation at the "
+
+    if "." in checker_id:
+        sa_link = "http://clang-analyzer.llvm.org/available_checks.html"
+        missing_doc += "[ClangSA](" + sa_link + ")"
+    elif "-" in checker_id:
+        tidy_link = "http://clang.llvm.org/extra/clang-tidy/checks/" + \
+                  checker_id + ".html"
+        missing_doc += "[ClangTidy](" + tidy_link + ")"
+    missing_doc += " homepage."
+
+    return missing_doc
+
+
+def _to_bytes(text):
+    return text if isinstance(text, bytes) else text.encode('utf-8')
+
+
+class CheckerDoc(object):
+    """
+    Markdown documentation of a checker, compressed with gzip too if it is
+    worth it.
+    """
+
+    def __init__(self, checker_id, content, version):
+        self.checker_id = checker_id
+        self.content = content
+
+        self.data = _to_bytes(content)
+        self.gzip_data = None
+        if len(self.data) >= COMPRESSION_MIN_SIZE:
+            compressor = zlib.compressobj(9, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            self.gzip_data = compressor.compress(self.data) + \
+                compressor.flush()
+
+        # The documentation can only change with the version of the package,
+        # or when the documentation files are edited and reloaded, so the
+        # ETag is derived from both.
+        digest = hashlib.sha1()
+        for part in [version or '', checker_id]:
+            digest.update(_to_bytes(part))
+            digest.update(b'\0')
+        digest.update(self.data)
+
+        self.etag = '"{0}"'.format(digest.hexdigest())
+        self.gzip_etag = '"{0}-gzip"'.format(digest.hexdigest())
+
+
+class CheckerDocs(object):
+    """
+    Least recently used cache of the checker documentations by the checker
+    name, shared by every product of the server. The map of the checkers to
+    their documentation files and the documentation files are loaded lazily
+    on their first use, and they are loaded again after reload().
+    """
+
+    def __init__(self, docs_dir, map_file, version,
+                 max_docs=CHECKER_DOC_CACHE_SIZE):
+        self.docs_dir = docs_dir
+        self.map_file = map_file
+        self.version = version
+        self.max_docs = max_docs
+
+        self.__lock = threading.Lock()
+        self.__doc_map = None
+        self.__docs = LRUCache(max_entries=max_docs)
+
+    def __get_doc_file(self, checker_id):
+        """
+        Returns the documentation file of the given checker, or None if the
+        checker has no documentation.
+        """
+        with self.__lock:
+            doc_map = self.__doc_map
+
+        if doc_map is None:
+            doc_map = util.load_json_or_empty(self.map_file, {})
+            with self.__lock:
+                if self.__doc_map is None:
+                    self.__doc_map = doc_map
+
+        doc_file = doc_map.get(checker_id)
+        return os.path.join(self.docs_dir, doc_file) if doc_file else None
+
+    def get(self, checker_id):
+        """
+        Returns the CheckerDoc of the given checker.
+        """
+        # The documentations which were loaded before a reload are not
+        # cached after it.
+        generation = self.__docs.generation
+        doc = self.__docs.get(checker_id)
+        if doc is not None:
+            return doc
+
+        content = None
+        doc_file = self.__get_doc_file(checker_id)
+        if doc_file:
+            try:
+                with io.open(doc_file, 'r', encoding='utf-8') as md_content:
+                    content = md_content.read()
+            except (IOError, OSError):
+                LOG.warning("Failed to read checker documentation: %s",
+                            doc_file)
+
+        doc = CheckerDoc(checker_id, content or get_missing_doc(checker_id),
+                         self.version)
+
+        self.__docs.put(checker_id, doc, generation=generation)
+        return doc
+
+    def reload(self):
+        """
+        Drops the cached documentations, so the documentation map and files
+        are loaded again on their next use.
+        """
+        with self.__lock:
+            self.__doc_map = None
+
+        self.__docs.clear()
+
+        LOG.debug("Checker documentation cache was cleared.")
+
+    @property
+    def hits(self):
+        return self.__docs.hits
+
+    @property
+    def misses(self):
+        return self.__docs.misses
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+        """
+        stats = self.__docs.stats()
+        return {'hits': stats['hits'],
+                'misses': stats['misses'],
+                'documents': stats['entries'],
+                'max_documents': self.max_docs}
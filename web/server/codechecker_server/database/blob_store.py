@@ -0,0 +1,154 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Content-addressed storage of compressed source file contents on the local
+disk, outside of the relational database.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import errno
+import os
+import tempfile
+import time
+import zlib
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
+
+class BlobStore(object):
+    """
+    Stores zlib compressed file contents in a sharded directory structure
+    where every file is named after the content hash of the source file:
+    <root>/<hash[0:2]>/<hash[2:4]>/<hash>.
+
+    The contents are immutable, so writing the same content hash multiple
+    times (e.g. by concurrent store operations) is harmless.
+    """
+
+    # Size of the blocks in which blobs are read from the disk.
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, root):
+        self.__root = root
+
+    @property
+    def root(self):
+        """
+        Returns the root directory of the store.
+        """
+        return self.__root
+
+    def path(self, content_hash):
+        """
+        Returns the path of the blob which belongs to the given content hash.
+        """
+        return os.path.join(self.__root, content_hash[0:2],
+                            content_hash[2:4], content_hash)
+
+    def exists(self, content_hash):
+        """
+        Returns True if the blob of the given content hash is stored.
+        """
+        return os.path.isfile(self.path(content_hash))
+
+    def put(self, content_hash, compressed_content):
+        """
+        Store the given compressed content under the given content hash and
+        returns its size.
+
+        The blob is written to a temporary file first which is renamed to
+        its final place, so readers never see a partially written blob.
+        """
+        blob_path = self.path(content_hash)
+        blob_dir = os.path.dirname(blob_path)
+
+        try:
+            os.makedirs(blob_dir)
+        except OSError as oerr:
+            if oerr.errno != errno.EEXIST:
+                raise
+
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + content_hash,
+                                        dir=blob_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(compressed_content)
+            os.rename(tmp_path, blob_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        return len(compressed_content)
+
+    def iter_content(self, content_hash):
+        """
+        Yields the decompressed content of the given content hash in chunks,
+        without loading the whole compressed blob into the memory.
+        """
+        decompressor = zlib.decompressobj()
+        with open(self.path(content_hash), 'rb') as blob:
+            while True:
+                chunk = blob.read(BlobStore.READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield decompressor.decompress(chunk)
+
+        yield decompressor.flush()
+
+    def remove(self, content_hash, older_than=None):
+        """
+        Remove the blob of the given content hash if it exists. Returns True
+        if the blob was removed.
+
+        older_than -- If given, the blob is only removed if it has not been
+                      modified in the last older_than seconds.
+        """
+        blob_path = self.path(content_hash)
+        try:
+            if older_than and \
+                    os.path.getmtime(blob_path) > time.time() - older_than:
+                return False
+
+            os.remove(blob_path)
+        except OSError as oerr:
+            if oerr.errno != errno.ENOENT:
+                raise
+            return False
+
+        return True
+
+    def iter_hashes(self, older_than=None):
+        """
+        Yields the content hashes of the stored blobs.
+
+        older_than -- If given, only the blobs which have not been modified
+                      in the last older_than seconds are listed.
+        """
+        if not os.path.isdir(self.__root):
+            return
+
+        deadline = time.time() - older_than if older_than else None
+        for dir_path, _, file_names in os.walk(self.__root):
+            for file_name in file_names:
+                if file_name.startswith('.'):
+                    # Temporary file of a blob which is being written.
+                    continue
+
+                if deadline is not None:
+                    try:
+                        mtime = os.path.getmtime(
+                            os.path.join(dir_path, file_name))
+                    except OSError:
+                        continue
+
+                    if mtime > deadline:
+                        continue
+
+                yield file_name
@@ -0,0 +1,109 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Maintenance of the mapping between the source components and their files.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from sqlalchemy import literal, select
+from sqlalchemy.sql.expression import and_, not_, or_
+
+from codechecker_common.logger import get_logger
+
+from .database import conv
+from .run_db_model import ComponentFile, File, SourceComponent
+
+LOG = get_logger('server')
+
+
+def get_component_values(value):
+    """
+    Get the paths of a component value and returns a tuple where the first
+    item contains a list path which should be skipped and the second item
+    contains a list of path which should be included.
+    E.g.:
+      +/a/b/x.cpp
+      +/a/b/y.cpp
+      -/a/b
+    On the above component value this function will return the following:
+      (['/a/b'], ['/a/b/x.cpp', '/a/b/y.cpp'])
+    """
+    skip = []
+    include = []
+
+    for path in value.split('\n'):
+        v = path[1:].strip()
+        if path[0] == '+':
+            include.append(v)
+        elif path[0] == '-':
+            skip.append(v)
+
+    return skip, include
+
+
+def get_component_file_filter(value):
+    """
+    Returns the filter expression of the files which belong to the component
+    with the given value, or None if the component does not have any files.
+    """
+    skip, include = get_component_values(value)
+    if not skip and not include:
+        return None
+
+    AND = []
+    if include:
+        AND.append(or_(*[File.filepath.like(conv(fp)) for fp in include]))
+
+    if skip:
+        AND.append(and_(*[not_(File.filepath.like(conv(fp)))
+                          for fp in skip]))
+
+    return and_(*AND)
+
+
+def update_component_files(session, component_name, value):
+    """
+    Map the files of the database to the given component based on its new
+    value. The mapping is changed in the transaction of the given session.
+    """
+    session.query(ComponentFile) \
+        .filter(ComponentFile.component_name == component_name) \
+        .delete(synchronize_session=False)
+
+    file_filter = get_component_file_filter(value)
+    if file_filter is None:
+        return
+
+    session.execute(ComponentFile.__table__.insert().from_select(
+        ['component_name', 'file_id'],
+        select([literal(component_name), File.id]).where(file_filter)))
+
+
+def get_component_file_rows(session, file_ids):
+    """
+    Returns the component_files rows of the given files for every component
+    they belong to.
+    """
+    if not file_ids:
+        return []
+
+    rows = []
+    for name, value in session.query(SourceComponent.name,
+                                     SourceComponent.value):
+        file_filter = get_component_file_filter(value)
+        if file_filter is None:
+            continue
+
+        q = session.query(File.id) \
+            .filter(File.id.in_(file_ids)) \
+            .filter(file_filter)
+
+        rows.extend({'component_name': name, 'file_id': file_id}
+                    for file_id, in q)
+
+    return rows
@@ -0,0 +1,123 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+In-memory Bloom filter of the source file content hashes which are stored in
+a product database.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import hashlib
+import math
+import struct
+import threading
+
+from sqlalchemy import func
+
+from codechecker_common.logger import get_logger
+
+from .run_db_model import FileContent
+
+LOG = get_logger('server')
+
+
+class BloomFilter(object):
+    """
+    Space-efficient probabilistic set. Membership tests never give false
+    negatives, but they give false positives with the given error rate while
+    the number of added items does not exceed the capacity.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.count = 0
+
+        size = -self.capacity * math.log(error_rate) / math.log(2) ** 2
+        self.__size = max(int(math.ceil(size)), 8)
+        self.__hash_count = max(
+            int(round(self.__size / self.capacity * math.log(2))), 1)
+        self.__bits = bytearray((self.__size + 7) // 8)
+
+    def __positions(self, value):
+        # Double hashing: the bit positions are derived from two independent
+        # halves of a single digest.
+        digest = hashlib.md5(value.encode('utf-8')).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.__size
+                for i in range(self.__hash_count)]
+
+    def add(self, value):
+        is_new = False
+        for pos in self.__positions(value):
+            mask = 1 << (pos & 7)
+            if not self.__bits[pos >> 3] & mask:
+                self.__bits[pos >> 3] |= mask
+                is_new = True
+
+        if is_new:
+            self.count += 1
+
+    def __contains__(self, value):
+        return all(self.__bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self.__positions(value))
+
+
+class ContentHashFilter(object):
+    """
+    Bloom filter of the content hashes of a product database which can tell
+    without a database query that a content hash is not stored.
+
+    The filter is built lazily from the database and the content hashes stored
+    by this server are added to it afterwards. Contents stored by other server
+    processes in the meantime are not known by the filter, which only results
+    in the client sending these contents again.
+    """
+
+    # Minimum number of content hashes the filter is sized for.
+    MIN_CAPACITY = 100000
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__filter = None
+
+    @staticmethod
+    def __build(session):
+        count = session.query(func.count(FileContent.content_hash)).scalar()
+
+        bloom_filter = BloomFilter(max(2 * count,
+                                       ContentHashFilter.MIN_CAPACITY))
+        for content_hash, in session.query(FileContent.content_hash) \
+                .yield_per(10000):
+            bloom_filter.add(content_hash)
+
+        LOG.debug("Content hash filter built with %d content hashes.", count)
+        return bloom_filter
+
+    def get_candidates(self, session, content_hashes):
+        """
+        Returns the content hashes from the given ones which might be stored
+        in the database. The rest of the content hashes are surely missing.
+        """
+        with self.__lock:
+            if self.__filter is None or \
+                    self.__filter.count > self.__filter.capacity:
+                self.__filter = ContentHashFilter.__build(session)
+
+            return [content_hash for content_hash in content_hashes
+                    if content_hash in self.__filter]
+
+    def add(self, content_hashes):
+        """
+        Records the given content hashes which have been stored into the
+        database.
+        """
+        with self.__lock:
+            if self.__filter is None:
+                return
+
+            for content_hash in content_hashes:
+                self.__filter.add(content_hash)
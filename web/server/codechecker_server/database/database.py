@@ -13,6 +13,7 @@ from __future__ import absolute_import
 from abc import ABCMeta, abstractmethod
 import os
 import subprocess
+import time
 
 from alembic import command, config
 from alembic import script
@@ -23,7 +24,7 @@ import sqlalchemy
 from sqlalchemy import event
 from sqlalchemy.engine.url import URL, make_url
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from shared.ttypes import DBStatus
 
@@ -31,9 +32,20 @@ from codechecker_common.logger import get_logger
 
 from codechecker_web.shared import host_check, pgpass
 
+from .. import metrics
 
 LOG = get_logger('system')
 
+# Default settings of the database connection pools. The pools are disabled
+# by default: every session opens a new database connection.
+DEFAULT_POOL_CONFIG = {
+    'enabled': False,
+    'pool_size': 5,
+    'max_overflow': 10,
+    'timeout': 30,
+    'recycle': 3600,
+    'pre_ping': True}
+
 
 def call_command(cmd, env=None, cwd=None):
     """ Call an external cmd and return with (output, return_code)."""
@@ -353,25 +365,57 @@ class SQLServer(object):
         """
         This method registers hooks, if needed, related to the engine created
         by create_engine.
+
+        The execution time of the queries is recorded in the metrics of the
+        request which runs them.
         """
-        pass
 
-    def create_engine(self):
+        def _before_cursor_execute(conn, cursor, statement, parameters,
+                                   context, executemany):
+            if context is not None:
+                context.query_start_time = time.time()
+
+        def _after_cursor_execute(conn, cursor, statement, parameters,
+                                  context, executemany):
+            start_time = getattr(context, 'query_start_time', None)
+            if start_time is not None:
+                metrics.record_query(statement, time.time() - start_time)
+
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def create_engine(self, pool_config=None):
         """
         Creates a new SQLAlchemy engine.
+
+        If the given connection pool configuration is enabled, the database
+        connections are kept open in a QueuePool and are reused by the
+        sessions. Otherwise every session opens a new connection.
         """
+        pool_config = dict(DEFAULT_POOL_CONFIG, **(pool_config or {}))
+
+        engine_args = {'encoding': 'utf8'}
+        if pool_config['enabled']:
+            engine_args.update(poolclass=QueuePool,
+                               pool_size=pool_config['pool_size'],
+                               max_overflow=pool_config['max_overflow'],
+                               pool_timeout=pool_config['timeout'],
+                               pool_recycle=pool_config['recycle'],
+                               pool_pre_ping=pool_config['pre_ping'])
+        else:
+            engine_args['poolclass'] = NullPool
 
         if make_url(self.get_connection_string()).drivername == \
                 'sqlite+pysqlite':
             # FIXME: workaround for locking errors
-            engine = sqlalchemy.create_engine(self.get_connection_string(),
-                                              encoding='utf8',
-                                              connect_args={'timeout': 600},
-                                              poolclass=NullPool)
-        else:
-            engine = sqlalchemy.create_engine(self.get_connection_string(),
-                                              encoding='utf8',
-                                              poolclass=NullPool)
+            engine_args['connect_args'] = {'timeout': 600}
+
+            if pool_config['enabled']:
+                # The pooled connections are used by multiple threads.
+                engine_args['connect_args']['check_same_thread'] = False
+
+        engine = sqlalchemy.create_engine(self.get_connection_string(),
+                                          **engine_args)
 
         self._register_engine_hooks(engine)
         return engine
@@ -581,10 +625,19 @@ class SQLiteDatabase(SQLServer):
         """
         SQLite databases need FOREIGN KEYs to be enabled, which is handled
         through this connection hook.
+
+        The pooled connections use write-ahead logging, so the readers of
+        the kept open connections do not block the writer and vice versa.
         """
+        super(SQLiteDatabase, self)._register_engine_hooks(engine)
+
+        is_pooled = not isinstance(engine.pool, NullPool)
+
         def _set_sqlite_pragma(dbapi_connection, connection_record):
             cursor = dbapi_connection.cursor()
             cursor.execute("PRAGMA foreign_keys=ON")
+            if is_pooled:
+                cursor.execute("PRAGMA journal_mode=WAL")
             cursor.close()
 
         event.listen(engine, 'connect', _set_sqlite_pragma)
@@ -604,6 +657,21 @@ class SQLiteDatabase(SQLServer):
         return self.dbpath
 
 
+def get_pool_stats(engine):
+    """
+    Returns the statistics of the connection pool of the given engine.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {'pool': pool.__class__.__name__}
+
+    return {'pool': pool.__class__.__name__,
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow()}
+
+
 def conv(filter_value):
     """
     Convert * to % got from clients for the database queries.
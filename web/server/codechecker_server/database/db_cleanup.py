@@ -19,9 +19,11 @@ from sqlalchemy.sql.expression import bindparam, union_all, select, cast
 from codeCheckerDBAccess_v6.ttypes import Severity
 
 from codechecker_common.logger import get_logger
+from codechecker_common.util import chunks
 
+from . import component_files, report_summary
 from .run_db_model import BugPathEvent, BugReportPoint, File, \
-    FileContent, Report, RunLock
+    FileContent, Report, RunLock, SourceComponent
 
 LOG = get_logger('server')
 RUN_LOCK_TIMEOUT_IN_DATABASE = 30 * 60  # 30 minutes.
@@ -41,6 +43,14 @@ def remove_expired_run_locks(session):
 
 
 def remove_unused_files(session):
+    """
+    Removes the files which do not belong to any report, and the file
+    contents which do not belong to any file.
+
+    Returns the content hashes of the removed file contents which were kept
+    in the source blob store. Their blobs should be removed by remove_blobs()
+    after the session is committed.
+    """
     LOG.debug("Garbage collection of dangling files started...")
 
     bpe_files = session.query(BugPathEvent.file_id) \
@@ -59,12 +69,83 @@ def remove_unused_files(session):
         .group_by(File.content_hash) \
         .subquery()
 
+    unused_blobs = [content_hash for content_hash, in
+                    session.query(FileContent.content_hash)
+                    .filter(FileContent.content_hash.notin_(files),
+                            FileContent.blob_size.isnot(None))]
+
     session.query(FileContent) \
         .filter(FileContent.content_hash.notin_(files)) \
         .delete(synchronize_session=False)
 
     LOG.debug("Garbage collection of dangling files finished.")
 
+    return unused_blobs
+
+
+def remove_blobs(session, blob_store, content_hashes):
+    """
+    Removes the blobs of the given content hashes which do not belong to any
+    file content record, and returns the number of the removed blobs.
+
+    The file content record is the only reference of a blob, so the blobs
+    are removed when their records are removed by remove_unused_files(). The
+    blobs are written before the file content records of a store are
+    committed, so the blobs newer than the run lock timeout are kept, as a
+    concurrent store may be adding the same contents again.
+    """
+    removed = 0
+    for chunk in chunks(content_hashes, 500):
+        used_hashes = set(content_hash for content_hash, in
+                          session.query(FileContent.content_hash)
+                          .filter(FileContent.content_hash.in_(chunk)))
+
+        for content_hash in chunk:
+            if content_hash not in used_hashes and \
+                    blob_store.remove(content_hash,
+                                      RUN_LOCK_TIMEOUT_IN_DATABASE):
+                removed += 1
+
+    return removed
+
+
+def remove_unused_blobs(session, blob_store):
+    """
+    Removes every source blob which does not belong to any file content
+    record by walking the whole blob store.
+
+    The blobs are removed together with their records by remove_blobs(), so
+    this only finds the blobs of the store operations which have failed
+    before committing their records, and the blobs which were too new to be
+    removed with their records.
+    """
+    LOG.debug("Garbage collection of dangling source blobs started...")
+
+    removed = remove_blobs(
+        session, blob_store,
+        blob_store.iter_hashes(RUN_LOCK_TIMEOUT_IN_DATABASE))
+
+    LOG.debug("Garbage collection of dangling source blobs finished, "
+              "%d blobs removed.", removed)
+
+
+def rebuild_run_report_summaries(session):
+    LOG.debug("Rebuilding the run report summaries started...")
+
+    report_summary.update_run_report_summaries(session)
+
+    LOG.debug("Rebuilding the run report summaries finished.")
+
+
+def rebuild_component_files(session):
+    LOG.debug("Rebuilding the files of the source components started...")
+
+    for name, value in session.query(SourceComponent.name,
+                                     SourceComponent.value):
+        component_files.update_component_files(session, name, value)
+
+    LOG.debug("Rebuilding the files of the source components finished.")
+
 
 def upgrade_severity_levels(session, severity_map):
     """
@@ -0,0 +1,118 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Maintenance of the per run report summaries.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from sqlalchemy import func, select, String
+from sqlalchemy.sql.expression import cast
+
+from codechecker_common.logger import get_logger
+
+from .run_db_model import Report, ReviewStatus, Run, RunReportSummary
+
+LOG = get_logger('server')
+
+UNREVIEWED = 'unreviewed'
+
+
+def __lock_runs(session, run_ids=None):
+    """
+    Lock the rows of the given runs, or of every run, until the end of the
+    transaction of the given session, so the summaries of a run are changed
+    by one transaction at a time. The rows are locked in the order of their
+    ids, so the transactions which lock multiple runs do not deadlock each
+    other.
+    """
+    lock_q = session.query(Run.id)
+    if run_ids is not None:
+        lock_q = lock_q.filter(Run.id.in_(run_ids))
+    lock_q.order_by(Run.id).with_for_update().all()
+
+
+def update_run_report_summaries(session, run_ids=None):
+    """
+    Recount the report summaries of the given runs, or of every run if no
+    run ids are given. The summaries are changed in the transaction of the
+    given session, and the runs are locked until its end.
+    """
+    __lock_runs(session, run_ids)
+
+    delete_q = session.query(RunReportSummary)
+    if run_ids is not None:
+        delete_q = delete_q.filter(RunReportSummary.run_id.in_(run_ids))
+    delete_q.delete(synchronize_session=False)
+
+    detection_status = cast(Report.detection_status, String)
+    review_status = func.coalesce(cast(ReviewStatus.status, String),
+                                  UNREVIEWED)
+
+    count_q = select([Report.run_id,
+                      detection_status,
+                      review_status,
+                      func.count(Report.id)]) \
+        .select_from(Report.__table__.outerjoin(
+            ReviewStatus.__table__,
+            ReviewStatus.bug_hash == Report.bug_id)) \
+        .group_by(Report.run_id, detection_status, review_status)
+
+    if run_ids is not None:
+        count_q = count_q.where(Report.run_id.in_(run_ids))
+
+    session.execute(RunReportSummary.__table__.insert().from_select(
+        ['run_id', 'detection_status', 'review_status', 'report_count'],
+        count_q))
+
+
+def __add_report_count(session, run_id, detection_status, review_status,
+                       count):
+    updated = session.query(RunReportSummary) \
+        .filter(RunReportSummary.run_id == run_id,
+                RunReportSummary.detection_status == detection_status,
+                RunReportSummary.review_status == review_status) \
+        .update({
+            RunReportSummary.report_count:
+                RunReportSummary.report_count + count
+        }, synchronize_session=False)
+
+    if not updated:
+        session.add(RunReportSummary(run_id, detection_status, review_status,
+                                     count))
+        session.flush()
+
+
+def change_review_status(session, bug_hash, old_status, new_status):
+    """
+    Move the reports of the given bug hash from the old review status to the
+    new one in the summaries of every run where the bug can be found.
+    A missing review status is considered to be unreviewed. The runs are
+    locked until the end of the transaction of the given session.
+    """
+    old_status = old_status or UNREVIEWED
+    new_status = new_status or UNREVIEWED
+    if old_status == new_status:
+        return
+
+    # The reports are counted after the runs are locked, so the counts are
+    # not changed by a concurrent store of the runs.
+    __lock_runs(session, session.query(Report.run_id)
+                .filter(Report.bug_id == bug_hash))
+
+    counts = session.query(Report.run_id,
+                           Report.detection_status,
+                           func.count(Report.id)) \
+        .filter(Report.bug_id == bug_hash) \
+        .group_by(Report.run_id, Report.detection_status) \
+        .all()
+
+    for run_id, detection_status, count in counts:
+        __add_report_count(session, run_id, detection_status, old_status,
+                           -count)
+        __add_report_count(session, run_id, detection_status, new_status,
+                           count)
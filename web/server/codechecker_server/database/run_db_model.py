@@ -17,7 +17,7 @@ from math import ceil
 import os
 
 from sqlalchemy import MetaData, Column, Integer, UniqueConstraint, String, \
-    DateTime, Boolean, ForeignKey, Binary, Enum, Text
+    DateTime, Boolean, ForeignKey, Binary, Enum, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.expression import true
@@ -45,6 +45,22 @@ class DBVersion(Base):
         self.minor = minor
 
 
+class DBIdentifier(Base):
+    """
+    Random identifier of the product database which is generated at its
+    first use. It does not change when the database is moved or renamed.
+    """
+    __tablename__ = 'db_identifier'
+
+    # The table has only one row with the ID 1.
+    id = Column(Integer, primary_key=True)
+    identifier = Column(String, nullable=False)
+
+    def __init__(self, identifier):
+        self.id = 1
+        self.identifier = identifier
+
+
 class Run(Base):
     __tablename__ = 'runs'
 
@@ -166,10 +182,17 @@ class FileContent(Base):
     __tablename__ = 'file_contents'
 
     content_hash = Column(String, primary_key=True)
+
+    # The compressed content of the file. If the product uses a source blob
+    # store this is NULL and the content is stored on the disk instead.
     content = Column(Binary)
 
-    def __init__(self, content_hash, content):
+    # Size of the compressed content in the blob store.
+    blob_size = Column(Integer, nullable=True)
+
+    def __init__(self, content_hash, content, blob_size=None):
         self.content_hash, self.content = content_hash, content
+        self.blob_size = blob_size
 
 
 class File(Base):
@@ -296,6 +319,13 @@ class ExtendedReportData(Base):
 class Report(Base):
     __tablename__ = 'reports'
 
+    # The reports of the runs are mostly queried by their detection status
+    # and by their hashes.
+    __table_args__ = (
+        Index('ix_reports_run_id_detection_status_bug_id',
+              'run_id', 'detection_status', 'bug_id'),
+    )
+
     id = Column(Integer, autoincrement=True, primary_key=True)
     file_id = Column(Integer, ForeignKey('files.id', deferrable=True,
                                          initially="DEFERRED",
@@ -383,6 +413,34 @@ class ReviewStatus(Base):
     date = Column(DateTime, nullable=False)
 
 
+class RunReportSummary(Base):
+    """
+    Number of the reports of a run by detection status and review status.
+    It is kept up to date when storing runs, changing review statuses and
+    removing reports, so the list of runs does not need to aggregate the
+    whole reports table.
+    """
+    __tablename__ = 'run_report_summaries'
+
+    run_id = Column(Integer,
+                    ForeignKey('runs.id', deferrable=True,
+                               initially="DEFERRED", ondelete='CASCADE'),
+                    primary_key=True)
+    detection_status = Column(String, primary_key=True)
+
+    # Reports without a review status are counted as 'unreviewed'.
+    review_status = Column(String, primary_key=True)
+
+    report_count = Column(Integer, nullable=False)
+
+    def __init__(self, run_id, detection_status, review_status,
+                 report_count):
+        self.run_id = run_id
+        self.detection_status = detection_status
+        self.review_status = review_status
+        self.report_count = report_count
+
+
 class SourceComponent(Base):
     __tablename__ = 'source_components'
 
@@ -403,6 +461,31 @@ class SourceComponent(Base):
         self.username = user_name
 
 
+class ComponentFile(Base):
+    """
+    Files which belong to a source component. It is kept up to date when the
+    component is changed and when new files are stored, so filtering by
+    source components does not need to match the paths of all files.
+    """
+    __tablename__ = 'component_files'
+
+    component_name = Column(String,
+                            ForeignKey('source_components.name',
+                                       deferrable=True,
+                                       initially="DEFERRED",
+                                       ondelete='CASCADE'),
+                            primary_key=True)
+    file_id = Column(Integer,
+                     ForeignKey('files.id', deferrable=True,
+                                initially="DEFERRED", ondelete='CASCADE'),
+                     primary_key=True,
+                     index=True)
+
+    def __init__(self, component_name, file_id):
+        self.component_name = component_name
+        self.file_id = file_id
+
+
 IDENTIFIER = {
     'identifier': "RunDatabase",
     'orm_meta': CC_META,
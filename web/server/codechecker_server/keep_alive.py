@@ -0,0 +1,159 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Watcher of the idle persistent HTTP connections.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import errno
+import fcntl
+import os
+import select
+import threading
+import time
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
+# select() can not watch file descriptors over FD_SETSIZE (usually 1024).
+MAX_IDLE_CONNECTIONS = 512
+
+
+class IdleConnections(object):
+    """
+    Keeps the persistent connections between two requests without occupying
+    a worker thread. The connections are handed back by the on_readable
+    callback when the next request arrives, and they are closed by the
+    on_close callback when the idle timeout elapses.
+    """
+
+    def __init__(self, timeout, on_readable, on_close,
+                 max_connections=MAX_IDLE_CONNECTIONS):
+        self.__timeout = timeout
+        self.__on_readable = on_readable
+        self.__on_close = on_close
+        self.__max_connections = max_connections
+
+        self.__lock = threading.Lock()
+
+        # Maps the idle sockets to (client address, deadline) pairs.
+        self.__connections = {}
+        self.__running = True
+
+        # Writing to this pipe wakes up the watcher thread to watch the new
+        # connections too.
+        self.__wakeup_read, self.__wakeup_write = os.pipe()
+        for fd in (self.__wakeup_read, self.__wakeup_write):
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        self.__thread = threading.Thread(target=self.__watch,
+                                         name='IdleConnections')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__connections)
+
+    def has_capacity(self):
+        """
+        Returns True if one more connection can be kept open.
+        """
+        return len(self) < self.__max_connections
+
+    def add(self, request, client_address):
+        """
+        Watch the given connection until the next request arrives on it.
+        Returns False if the connection can not be kept open.
+        """
+        with self.__lock:
+            if not self.__running or \
+                    len(self.__connections) >= self.__max_connections:
+                return False
+
+            self.__connections[request] = \
+                (client_address, time.time() + self.__timeout)
+
+        self.__wakeup()
+        return True
+
+    def close(self):
+        """
+        Stop the watcher thread and close the idle connections.
+        """
+        with self.__lock:
+            self.__running = False
+            connections = list(self.__connections)
+            self.__connections.clear()
+
+        self.__wakeup()
+        self.__thread.join()
+
+        for request in connections:
+            self.__on_close(request)
+
+        os.close(self.__wakeup_read)
+        os.close(self.__wakeup_write)
+
+    def __wakeup(self):
+        try:
+            os.write(self.__wakeup_write, b'x')
+        except OSError as ex:
+            if ex.errno != errno.EAGAIN:
+                raise
+
+    def __watch(self):
+        while True:
+            with self.__lock:
+                if not self.__running:
+                    return
+
+                requests = list(self.__connections)
+                deadline = min([d for _, d in self.__connections.values()]
+                               or [None])
+
+            wait = max(deadline - time.time(), 0) \
+                if deadline is not None else None
+
+            try:
+                readable, _, _ = select.select(
+                    requests + [self.__wakeup_read], [], [], wait)
+            except (select.error, ValueError) as ex:
+                # The broken connections are handed back, so the request
+                # handlers notice the errors and close them.
+                LOG.debug("Watching the idle connections failed: %s", ex)
+                readable = requests
+
+            if self.__wakeup_read in readable:
+                try:
+                    os.read(self.__wakeup_read, 4096)
+                except OSError as ex:
+                    if ex.errno != errno.EAGAIN:
+                        raise
+
+            now = time.time()
+            ready, expired = [], []
+            with self.__lock:
+                for request, (client_address, deadline) in \
+                        list(self.__connections.items()):
+                    if request in readable:
+                        ready.append((request, client_address))
+                    elif deadline <= now:
+                        expired.append(request)
+                    else:
+                        continue
+
+                    del self.__connections[request]
+
+            for request, client_address in ready:
+                self.__on_readable(request, client_address)
+
+            for request in expired:
+                self.__on_close(request)
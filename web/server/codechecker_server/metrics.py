@@ -0,0 +1,422 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Metrics of the API requests of the server, exposed in the Prometheus text
+format.
+
+The metrics of a multi-process server are saved by every server process into
+a shared metrics directory, and they are merged by the process which exports
+them.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import errno
+import heapq
+import itertools
+import json
+import numbers
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
+# Content type of the Prometheus text exposition format.
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds of the histogram buckets.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                    10.0, 30.0, 60.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+                16777216)
+
+# The slow request log contains at most this many of the slowest SQL
+# statements of a request.
+SLOW_REQUEST_STATEMENTS = 20
+
+# The metrics of a server process are saved into the metrics directory at
+# most this many seconds after a request.
+METRICS_SAVE_INTERVAL = 5
+
+# The histograms of a request: metric name, help text and bucket bounds.
+REQUEST_HISTOGRAMS = [
+    ('codechecker_request_duration_seconds',
+     "Wall time of the API requests.", DURATION_BUCKETS),
+    ('codechecker_request_db_duration_seconds',
+     "Time spent in database queries by the API requests.", DURATION_BUCKETS),
+    ('codechecker_request_queries',
+     "Number of database queries of the API requests.", QUERY_COUNT_BUCKETS),
+    ('codechecker_response_bytes',
+     "Size of the responses of the API requests.", SIZE_BUCKETS)]
+
+REQUEST_LABELS = ('endpoint', 'method', 'product')
+
+# The statistics which are exported as counters, the others are gauges.
+COUNTER_STATS = ('hits', 'misses')
+
+# The statistics which are settings of the server processes, so they are
+# not summed over the processes.
+SETTING_STATS = ('max_documents', 'max_size', 'ttl')
+
+_current = threading.local()
+
+
+def current_request():
+    """
+    Returns the RequestMetrics of the request handled by the current thread,
+    or None.
+    """
+    return getattr(_current, 'request', None)
+
+
+def record_query(statement, duration):
+    """
+    Records a database query in the metrics of the request handled by the
+    current thread, if any.
+    """
+    request = current_request()
+    if request is not None:
+        request.record_query(statement, duration)
+
+
+class Histogram(object):
+    """
+    Histogram of the observed values with cumulative buckets.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+        self.count += 1
+        self.sum += value
+
+
+class RequestMetrics(object):
+    """
+    Metrics of a request being handled.
+    """
+
+    def __init__(self, endpoint, method, product, keep_statements):
+        self.endpoint = endpoint
+        self.method = method
+        self.product = product
+        self.start = time.time()
+        self.db_time = 0.0
+        self.queries = 0
+
+        # Heap of the slowest statements if the statements are needed by the
+        # slow request log.
+        self.__keep_statements = keep_statements
+        self.__statements = []
+        self.__sequence = itertools.count()
+
+    def record_query(self, statement, duration):
+        self.db_time += duration
+        self.queries += 1
+
+        if self.__keep_statements:
+            heapq.heappush(self.__statements,
+                           (duration, next(self.__sequence), statement))
+            if len(self.__statements) > SLOW_REQUEST_STATEMENTS:
+                heapq.heappop(self.__statements)
+
+    @property
+    def statements(self):
+        """
+        Returns the slowest statements as (duration, statement) tuples in
+        descending order of their duration.
+        """
+        return [(duration, statement) for duration, _, statement
+                in sorted(self.__statements, reverse=True)]
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"') \
+            .replace('\n', '\\n')
+
+    return '{' + ','.join('{0}="{1}"'.format(name, escape(value))
+                          for name, value in labels) + '}'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as oerr:
+        return oerr.errno == errno.EPERM
+    return True
+
+
+class Metrics(object):
+    """
+    Histograms of the wall time, the database time, the number of database
+    queries and the response size of the API requests by the API endpoint,
+    the Thrift method and the product.
+
+    If a metrics directory is given, the metrics of the process are saved
+    into it periodically, and the exported metrics are the sums of the
+    metrics of every process which has saved its metrics there. The files of
+    the exited processes are kept, so the histograms and the counters do not
+    decrease when a server process is restarted, but the gauges are summed
+    only over the running processes. get_stats is called without arguments to
+    get the statistics which are saved with the metrics (see export()).
+    """
+
+    def __init__(self, metrics_dir=None, get_stats=None):
+        self.__lock = threading.Lock()
+
+        # Label values -> histograms in the order of REQUEST_HISTOGRAMS.
+        self.__histograms = {}
+
+        self.__metrics_dir = metrics_dir
+        self.__get_stats = get_stats
+        self.__save_timer = None
+
+        if metrics_dir:
+            # The metrics of the previous run of the server are dropped.
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+            try:
+                os.makedirs(metrics_dir)
+            except OSError as oerr:
+                if oerr.errno != errno.EEXIST:
+                    raise
+
+    def start_request(self, endpoint, method='', product='',
+                      keep_statements=False):
+        """
+        Starts measuring the request handled by the current thread. The
+        database queries of the thread are recorded in the returned
+        RequestMetrics until finish_request() is called.
+        """
+        request = RequestMetrics(endpoint, method, product or '',
+                                 keep_statements)
+        _current.request = request
+        return request
+
+    def finish_request(self, request, response_bytes,
+                       slow_request_threshold=0):
+        """
+        Records the metrics of the finished request. If the request took at
+        least slow_request_threshold seconds, it is logged with its slowest
+        SQL statements.
+        """
+        if current_request() is request:
+            _current.request = None
+
+        duration = time.time() - request.start
+        values = [duration, request.db_time, request.queries, response_bytes]
+        labels = (request.endpoint, request.method, request.product)
+
+        with self.__lock:
+            histograms = self.__histograms.get(labels)
+            if histograms is None:
+                histograms = [Histogram(buckets) for _, _, buckets
+                              in REQUEST_HISTOGRAMS]
+                self.__histograms[labels] = histograms
+
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+
+            if self.__metrics_dir and self.__save_timer is None:
+                self.__save_timer = threading.Timer(METRICS_SAVE_INTERVAL,
+                                                    self.save)
+                self.__save_timer.daemon = True
+                self.__save_timer.start()
+
+        if slow_request_threshold and duration >= slow_request_threshold:
+            LOG.warning("Slow request: %s.%s of product '%s' took %.3f s "
+                        "(database: %.3f s in %d queries, response: %d "
+                        "bytes).", request.endpoint, request.method,
+                        request.product, duration, request.db_time,
+                        request.queries, response_bytes)
+            for query_duration, statement in request.statements:
+                LOG.warning("  [%.3f s] %s", query_duration, statement)
+
+    def export(self, stats=None):
+        """
+        Returns the metrics in the Prometheus text format.
+
+        The given stats is a list of (metric prefix, labels, statistics dict)
+        tuples, like the statistics of the caches. Its numeric values are
+        exported as counters if they are in COUNTER_STATS, otherwise as
+        gauges.
+        """
+        if self.__metrics_dir:
+            self.save(stats)
+            histograms, stats = self.__load()
+        else:
+            histograms = self.__snapshot()
+
+        lines = []
+
+        for i, (name, help_text, buckets) in enumerate(REQUEST_HISTOGRAMS):
+            lines.append('# HELP {0} {1}'.format(name, help_text))
+            lines.append('# TYPE {0} histogram'.format(name))
+
+            for label_values, values in histograms:
+                counts, count, total = values[i]
+                labels = list(zip(REQUEST_LABELS, label_values))
+
+                for bound, bucket_count in zip(buckets, counts):
+                    lines.append('{0}_bucket{1} {2}'.format(
+                        name, _format_labels(labels + [('le', bound)]),
+                        bucket_count))
+                lines.append('{0}_bucket{1} {2}'.format(
+                    name, _format_labels(labels + [('le', '+Inf')]), count))
+                lines.append('{0}_sum{1} {2}'.format(
+                    name, _format_labels(labels), _format_number(total)))
+                lines.append('{0}_count{1} {2}'.format(
+                    name, _format_labels(labels), count))
+
+        # Group the samples of the statistics by the metric names.
+        samples = {}
+        for prefix, labels, values in stats or []:
+            for key, value in sorted(values.items()):
+                if not _is_number(value):
+                    continue
+
+                if key in COUNTER_STATS:
+                    name = '{0}_{1}_total'.format(prefix, key)
+                    metric_type = 'counter'
+                else:
+                    name = '{0}_{1}'.format(prefix, key)
+                    metric_type = 'gauge'
+
+                samples.setdefault((name, metric_type), []) \
+                    .append((sorted(labels.items()), value))
+
+        for (name, metric_type), values in sorted(samples.items()):
+            lines.append('# TYPE {0} {1}'.format(name, metric_type))
+            for labels, value in values:
+                lines.append('{0}{1} {2}'.format(
+                    name, _format_labels(labels), _format_number(value)))
+
+        return '\n'.join(lines) + '\n'
+
+    def save(self, stats=None):
+        """
+        Saves the metrics of this process into the metrics directory with the
+        given statistics, or with the statistics returned by get_stats.
+        """
+        with self.__lock:
+            timer, self.__save_timer = self.__save_timer, None
+
+        histograms = self.__snapshot()
+
+        if timer:
+            timer.cancel()
+
+        if stats is None and self.__get_stats:
+            stats = self.__get_stats()
+
+        state = {
+            'histograms': [[list(labels), values]
+                           for labels, values in histograms],
+            'stats': [[prefix, labels,
+                       dict((key, value) for key, value in values.items()
+                            if _is_number(value))]
+                      for prefix, labels, values in stats or []]}
+
+        # The state is written to a temporary file first which is renamed to
+        # its final place, so the other processes never read a partially
+        # written state.
+        fd, tmp_path = tempfile.mkstemp(prefix='.', dir=self.__metrics_dir)
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(state, tmp_file)
+            os.rename(tmp_path, os.path.join(self.__metrics_dir,
+                                             '{0}.json'.format(os.getpid())))
+        except Exception as ex:
+            os.remove(tmp_path)
+            LOG.warning("Failed to save the metrics: %s", ex)
+
+    def __snapshot(self):
+        """
+        Returns the histograms of this process as a sorted list of (label
+        values, [(bucket counts, count, sum)]) tuples.
+        """
+        with self.__lock:
+            return sorted((labels, [(list(h.counts), h.count, h.sum)
+                                    for h in hists])
+                          for labels, hists in self.__histograms.items())
+
+    def __load(self):
+        """
+        Returns the sums of the histograms and the statistics which are saved
+        in the metrics directory. The gauges of the exited processes are
+        skipped, and the settings are taken from a running process instead
+        of being summed.
+        """
+        histograms = {}
+        stats = {}
+
+        for file_name in os.listdir(self.__metrics_dir):
+            pid = file_name[:-len('.json')]
+            if not file_name.endswith('.json') or not pid.isdigit():
+                continue
+
+            is_alive = _is_alive(int(pid))
+
+            try:
+                with open(os.path.join(self.__metrics_dir, file_name)) as f:
+                    state = json.load(f)
+            except (IOError, OSError, ValueError) as ex:
+                LOG.warning("Failed to load the metrics from %s: %s",
+                            file_name, ex)
+                continue
+
+            for labels, values in state['histograms']:
+                total = histograms.setdefault(
+                    tuple(labels), [([0] * len(counts), 0, 0)
+                                    for counts, _, _ in values])
+                for i, (counts, count, value_sum) in enumerate(values):
+                    total_counts, total_count, total_sum = total[i]
+                    total[i] = ([a + b for a, b in zip(total_counts, counts)],
+                                total_count + count,
+                                total_sum + value_sum)
+
+            for prefix, labels, values in state['stats']:
+                total = stats.setdefault(
+                    (prefix, tuple(sorted(labels.items()))), {})
+                for key, value in values.items():
+                    if key in COUNTER_STATS:
+                        total[key] = total.get(key, 0) + value
+                    elif not is_alive:
+                        continue
+                    elif key in SETTING_STATS:
+                        total[key] = value
+                    else:
+                        total[key] = total.get(key, 0) + value
+
+        return sorted(histograms.items()), \
+            [(prefix, dict(labels), values)
+             for (prefix, labels), values in sorted(stats.items())]
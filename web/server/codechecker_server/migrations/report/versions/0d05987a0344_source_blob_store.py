@@ -0,0 +1,25 @@
+"""Source blob store
+
+Revision ID: 0d05987a0344
+Revises: 3e91d0612422
+Create Date: 2026-10-19 10:12:31.412054
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0d05987a0344'
+down_revision = '3e91d0612422'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('file_contents',
+                  sa.Column('blob_size', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('file_contents', 'blob_size')
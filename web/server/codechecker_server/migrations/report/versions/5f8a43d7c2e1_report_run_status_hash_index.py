@@ -0,0 +1,30 @@
+"""report run, detection status and hash index
+
+Revision ID: 5f8a43d7c2e1
+Revises: e0a0b1b8f93c
+Create Date: 2026-10-19 18:02:41.118265
+
+
+Add a composite index on the run id, the detection status and the hash of
+the reports, which are used by most of the report queries.
+"""
+
+# revision identifiers, used by Alembic.
+revision = '5f8a43d7c2e1'
+down_revision = 'e0a0b1b8f93c'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_reports_run_id_detection_status_bug_id',
+                    'reports',
+                    ['run_id', 'detection_status', 'bug_id'],
+                    unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_reports_run_id_detection_status_bug_id',
+                  table_name='reports')
@@ -0,0 +1,56 @@
+"""Run report summaries
+
+Revision ID: 9d956a0fae8d
+Revises: 0d05987a0344
+Create Date: 2026-10-19 14:02:47.190318
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '9d956a0fae8d'
+down_revision = '0d05987a0344'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('run_report_summaries',
+                    sa.Column('run_id', sa.Integer(), nullable=False),
+                    sa.Column('detection_status', sa.String(),
+                              nullable=False),
+                    sa.Column('review_status', sa.String(), nullable=False),
+                    sa.Column('report_count', sa.Integer(), nullable=False),
+                    sa.ForeignKeyConstraint(['run_id'],
+                                            [u'runs.id'],
+                                            name=op.f('fk_run_report_summaries_run_id_runs'),
+                                            ondelete=u'CASCADE',
+                                            initially=u'DEFERRED',
+                                            deferrable=True),
+                    sa.PrimaryKeyConstraint('run_id', 'detection_status',
+                                            'review_status',
+                                            name=op.f('pk_run_report_summaries'))
+                    )
+
+    op.execute("""
+        INSERT INTO run_report_summaries
+            (run_id, detection_status, review_status, report_count)
+        SELECT reports.run_id,
+               CAST(reports.detection_status AS VARCHAR),
+               COALESCE(CAST(review_statuses.status AS VARCHAR),
+                        'unreviewed'),
+               COUNT(reports.id)
+        FROM reports
+        LEFT OUTER JOIN review_statuses
+            ON review_statuses.bug_hash = reports.bug_id
+        GROUP BY reports.run_id,
+                 CAST(reports.detection_status AS VARCHAR),
+                 COALESCE(CAST(review_statuses.status AS VARCHAR),
+                          'unreviewed')
+    """)
+
+
+def downgrade():
+    op.drop_table('run_report_summaries')
@@ -0,0 +1,29 @@
+"""Database identifier
+
+Revision ID: b1c5e3f0a7d2
+Revises: 5f8a43d7c2e1
+Create Date: 2026-10-19 18:42:16.305187
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b1c5e3f0a7d2'
+down_revision = '5f8a43d7c2e1'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        'db_identifier',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('identifier', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_db_identifier'))
+    )
+
+
+def downgrade():
+    op.drop_table('db_identifier')
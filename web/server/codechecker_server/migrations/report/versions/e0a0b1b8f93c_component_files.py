@@ -0,0 +1,82 @@
+"""Component files
+
+Revision ID: e0a0b1b8f93c
+Revises: 9d956a0fae8d
+Create Date: 2026-10-19 15:21:08.522731
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'e0a0b1b8f93c'
+down_revision = '9d956a0fae8d'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    component_files = op.create_table(
+        'component_files',
+        sa.Column('component_name', sa.String(), nullable=False),
+        sa.Column('file_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['component_name'],
+                                [u'source_components.name'],
+                                name=op.f('fk_component_files_component_name_source_components'),
+                                ondelete=u'CASCADE',
+                                initially=u'DEFERRED',
+                                deferrable=True),
+        sa.ForeignKeyConstraint(['file_id'],
+                                [u'files.id'],
+                                name=op.f('fk_component_files_file_id_files'),
+                                ondelete=u'CASCADE',
+                                initially=u'DEFERRED',
+                                deferrable=True),
+        sa.PrimaryKeyConstraint('component_name', 'file_id',
+                                name=op.f('pk_component_files'))
+    )
+    op.create_index(op.f('ix_component_files_file_id'),
+                    'component_files',
+                    ['file_id'],
+                    unique=False)
+
+    source_components = sa.table('source_components',
+                                 sa.column('name', sa.String),
+                                 sa.column('value', sa.Binary))
+    files = sa.table('files',
+                     sa.column('id', sa.Integer),
+                     sa.column('filepath', sa.String))
+
+    conn = op.get_bind()
+    for name, value in conn.execute(
+            sa.select([source_components.c.name,
+                       source_components.c.value])).fetchall():
+        skip, include = [], []
+        for path in value.split('\n'):
+            if path[0] == '+':
+                include.append(path[1:].strip().replace('*', '%'))
+            elif path[0] == '-':
+                skip.append(path[1:].strip().replace('*', '%'))
+
+        if not skip and not include:
+            continue
+
+        file_filter = []
+        if include:
+            file_filter.append(sa.or_(*[files.c.filepath.like(fp)
+                                        for fp in include]))
+        if skip:
+            file_filter.append(sa.and_(*[sa.not_(files.c.filepath.like(fp))
+                                         for fp in skip]))
+
+        conn.execute(component_files.insert().from_select(
+            ['component_name', 'file_id'],
+            sa.select([sa.literal(name), files.c.id])
+            .where(sa.and_(*file_filter))))
+
+
+def downgrade():
+    op.drop_index(op.f('ix_component_files_file_id'),
+                  table_name='component_files')
+    op.drop_table('component_files')
@@ -21,9 +21,17 @@ from shared.ttypes import Permission as PermissionEnum
 
 from codechecker_common.logger import get_logger
 
+from .cache import LRUCache
+
 LOG = get_logger('server')
 config_db_model = None  # Module will be loaded later...
 
+# Number of seconds for which the permission decisions are cached.
+PERMISSION_CACHE_TTL = 30
+
+# Maximum number of cached decisions.
+PERMISSION_CACHE_SIZE = 10000
+
 
 class Permission(object):
     """
@@ -466,6 +474,76 @@ class ProductPermission(Permission):
 
         return ProductPermission.Handler(self, config_db_session, productID)
 
+
+class PermissionCache(object):
+    """
+    Cache of the permission decisions of require_permission(). The granted
+    and the denied permissions are cached for the authenticated users and
+    their groups in the scope of the permission (e.g. in a product) for the
+    given number of seconds.
+
+    The cache has to be invalidated when the permissions or the products are
+    changed. Other server processes notice the change when the cached
+    decisions expire.
+    """
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__decisions = LRUCache(max_entries=max_size, ttl=ttl)
+
+    def get(self, key, permission):
+        """
+        Returns the cached decision of the given permission for the given
+        key, or None if it is not cached.
+        """
+        return self.__decisions.get((key, permission.name))
+
+    def put(self, key, permission, decision, generation=None):
+        """
+        Cache the decision of the given permission for the given key. If the
+        generation of the cache is given, the decision is not cached if the
+        cache has been invalidated since that generation, because the
+        decision may have been made from the permissions before their change.
+        """
+        self.__decisions.put((key, permission.name), decision,
+                             generation=generation)
+
+    def invalidate(self):
+        """
+        Remove every cached decision.
+        """
+        self.__decisions.clear()
+
+    @property
+    def generation(self):
+        """
+        Number of the invalidations of the cache, see put().
+        """
+        return self.__decisions.generation
+
+    @property
+    def hits(self):
+        return self.__decisions.hits
+
+    @property
+    def misses(self):
+        return self.__decisions.misses
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+        """
+        stats = self.__decisions.stats()
+        return {'hits': stats['hits'],
+                'misses': stats['misses'],
+                'keys': stats['entries'],
+                'ttl': self.ttl}
+
+
+PERMISSION_CACHE = PermissionCache(PERMISSION_CACHE_TTL,
+                                   PERMISSION_CACHE_SIZE)
+
 # ---------------------------------------------------------------------------
 
 
@@ -579,10 +657,35 @@ def require_permission(permission, extra_params, user):
     """
     Returns whether or not the given user has the given permission.
 
+    The decisions for authenticated users are cached in PERMISSION_CACHE.
+
     :param extra_params: The scope-specific argument dict, which already
       contains a valid database session.
     """
+    if not user:
+        return _require_permission(permission, extra_params, user)
+
+    scope = tuple(extra_params.get(arg) for arg in permission.CALL_ARGS
+                  if arg != 'config_db_session')
+    key = (user.user, tuple(sorted(user.groups or [])), user.is_root,
+           permission.__class__.__name__, scope)
+
+    # The generation is read before the permissions, so the decision is not
+    # cached if the permissions are changed while it is made.
+    generation = PERMISSION_CACHE.generation
+    decision = PERMISSION_CACHE.get(key, permission)
+    if decision is None:
+        decision = _require_permission(permission, extra_params, user)
+        PERMISSION_CACHE.put(key, permission, decision, generation)
 
+    return decision
+
+
+def _require_permission(permission, extra_params, user):
+    """
+    Returns whether or not the given user has the given permission by
+    walking the inheritance chain of the permission in the database.
+    """
     handler = handler_from_scope_params(permission,
                                         extra_params)
     if handler.has_permission(user):
@@ -0,0 +1,133 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Master of the forked server processes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import errno
+import os
+import signal
+import time
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
+
+class WorkerProcesses(object):
+    """
+    Serves the requests in forked worker processes. The worker processes
+    inherit the listening socket and the state of the server from the master
+    process, and they run the same request handlers as a single process
+    server, so the CPU-bound request handling is not serialized by one
+    interpreter lock.
+
+    The master process restarts the worker processes which exit, forwards
+    the reloads of the configuration to them, and stops them when it is
+    stopped.
+    """
+
+    # A worker process which exits sooner than this many seconds after its
+    # start is restarted after this delay, so a worker failing at startup
+    # does not make the master fork continuously.
+    RESTART_DELAY = 1
+
+    def __init__(self, processes, serve, reload_config):
+        """
+        serve is called without arguments in the worker processes and it
+        should handle the requests until the worker is stopped.
+        reload_config is called in the master process when the configuration
+        is reloaded, before the reload is forwarded to the workers.
+        """
+        self.__processes = processes
+        self.__serve = serve
+        self.__reload_config = reload_config
+
+        # PID -> start time of the running worker processes.
+        self.__workers = {}
+        self.__running = False
+
+    def run(self):
+        """
+        Starts the worker processes and supervises them until the master
+        process is stopped by SIGINT or SIGTERM.
+        """
+        self.__running = True
+        signal.signal(signal.SIGINT, self.__stop)
+        signal.signal(signal.SIGTERM, self.__stop)
+        signal.signal(signal.SIGHUP, self.__reload)
+
+        for _ in range(self.__processes):
+            self.__start_worker()
+
+        while self.__workers:
+            try:
+                pid, status = os.wait()
+            except OSError as ex:
+                if ex.errno == errno.EINTR:
+                    continue
+                if ex.errno == errno.ECHILD:
+                    break
+                raise
+
+            started = self.__workers.pop(pid, None)
+            if started is None or not self.__running:
+                continue
+
+            LOG.warning("Server process %d exited with status %d. "
+                        "Restarting...", pid, status)
+            if time.time() - started < self.RESTART_DELAY:
+                time.sleep(self.RESTART_DELAY)
+
+            if self.__running:
+                self.__start_worker()
+
+        LOG.info("Every server process has stopped.")
+
+    def __start_worker(self):
+        pid = os.fork()
+        if pid:
+            LOG.debug("Started server process %d.", pid)
+            self.__workers[pid] = time.time()
+            return
+
+        # The worker must not stop or reload its siblings.
+        self.__workers = {}
+        for signum in [signal.SIGINT, signal.SIGTERM, signal.SIGHUP]:
+            signal.signal(signum, signal.SIG_DFL)
+
+        # The workers do not return to the caller of run(), and they do not
+        # run the exit handlers of the master process.
+        exit_code = 0
+        try:
+            self.__serve()
+        except SystemExit as ex:
+            exit_code = ex.code if isinstance(ex.code, int) else 1
+        except Exception:
+            LOG.exception("Server process %d failed.", os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def __signal_workers(self, signum):
+        for pid in list(self.__workers):
+            try:
+                os.kill(pid, signum)
+            except OSError as ex:
+                if ex.errno != errno.ESRCH:
+                    raise
+
+    def __stop(self, signum, frame):
+        LOG.info("Stopping the server processes...")
+        self.__running = False
+        self.__signal_workers(signal.SIGTERM)
+
+    def __reload(self, signum, frame):
+        self.__reload_config()
+        self.__signal_workers(signal.SIGHUP)
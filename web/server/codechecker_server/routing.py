@@ -12,9 +12,9 @@ from __future__ import absolute_import
 
 import re
 try:
-    from urlparse import urlparse
+    from urlparse import parse_qs, urlparse
 except ImportError:
-    from urllib.parse import urlparse
+    from urllib.parse import parse_qs, urlparse
 
 from codechecker_web.shared.version import SUPPORTED_VERSIONS
 
@@ -30,11 +30,15 @@ NON_PRODUCT_ENDPOINTS = ['index.html',
                          'userguide',
                          'docs']
 
+# The metrics of the server are served to the superusers at this path.
+METRICS_ENDPOINT = 'metrics'
+
 # A list of top-level path elements in requests (such as Thrift endpoints)
 # which should not be considered as a product route.
 NON_PRODUCT_ENDPOINTS += ['Authentication',
                           'Products',
-                          'CodeCheckerService']
+                          'CodeCheckerService',
+                          METRICS_ENDPOINT]
 
 
 # A list of top-level path elements under the webserver root which should
@@ -43,6 +47,16 @@ PROTECTED_ENTRY_POINTS = ['',  # Empty string in a request is 'index.html'.
                           'index.html',
                           'products.html']
 
+# A list of top-level path elements under the webserver root which are
+# static files served to anyone without authentication.
+PUBLIC_STATIC_ENTRY_POINTS = ['login.html',
+                              'fonts',
+                              'images',
+                              'scripts',
+                              'style',
+                              'userguide',
+                              'docs']
+
 
 def is_valid_product_endpoint(uripart):
     """
@@ -135,9 +149,64 @@ def split_client_POST_request(path):
         return None, version_tag, remainder
 
 
+def split_export_request(path):
+    """
+    Returns the API version of the report export request if the given
+    remainder of a product GET request points to the export endpoint,
+    otherwise None.
+    """
+
+    # An export request looks like:
+    # http://localhost:8001/[product-name]/<API version>/Export?<filters>
+
+    match = re.match(r'^v(\d+\.\d+)/Export$', urlparse(path).path)
+    return match.group(1) if match else None
+
+
+def split_checker_doc_request(path):
+    """
+    Returns the API version and the checker name of the checker
+    documentation request as a tuple of 2 if the given GET request's PATH
+    points to the checker documentation endpoint, directly or through a
+    product route, otherwise None.
+    """
+
+    # A checker documentation request looks like:
+    # http://localhost:8001/[product-name]/<API version>/CheckerDoc?checker=..
+    parsed_path = urlparse(path)
+    match = re.match(r'^(/[A-Za-z0-9_\-]+)?/v(\d+\.\d+)/CheckerDoc$',
+                     parsed_path.path)
+    if not match:
+        return None
+
+    checker = parse_qs(parsed_path.query).get('checker', [''])[0]
+    return match.group(2), checker
+
+
 def is_protected_GET_entrypoint(path):
     """
     Returns if the given GET request's PATH enters the server through an
     entry point which is considered protected by authentication requirements.
     """
     return path in PROTECTED_ENTRY_POINTS
+
+
+def get_public_static_path(path):
+    """
+    Returns the path of the requested file under the webserver root if the
+    given GET request's PATH requests a public static file, directly or
+    through a product route, otherwise None.
+    """
+
+    # A static file request looks like:
+    # http://localhost:8001/[product-name]/scripts/(...)
+    parts = urlparse(path).path.lstrip('/').split('/')
+
+    if len(parts) > 1 and parts[1] in PUBLIC_STATIC_ENTRY_POINTS and \
+            is_valid_product_endpoint(parts[0]):
+        parts = parts[1:]
+
+    if parts[0] in PUBLIC_STATIC_ENTRY_POINTS:
+        return '/' + '/'.join(parts)
+
+    return None
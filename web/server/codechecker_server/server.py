@@ -24,7 +24,10 @@ import socket
 import ssl
 import sys
 import stat
+import threading
 import urllib
+import uuid
+import zlib
 
 try:
     from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
@@ -33,8 +36,14 @@ except ImportError:
     from http.server import HTTPServer, BaseHTTPRequestHandler, \
         SimpleHTTPRequestHandler
 
+try:
+    from urlparse import parse_qs, urlparse
+except ImportError:
+    from urllib.parse import parse_qs, urlparse
+
+import sqlalchemy
 from sqlalchemy.orm import sessionmaker
-from thrift.protocol import TJSONProtocol
+from thrift.protocol import TBinaryProtocol, TCompactProtocol, TJSONProtocol
 from thrift.transport import TTransport
 from thrift.Thrift import TApplicationException
 from thrift.Thrift import TMessageType
@@ -47,7 +56,9 @@ from ProductManagement_v6 import codeCheckerProductService as ProductAPI_v6
 
 from codechecker_common.logger import get_logger
 
-from codechecker_web.shared.version import get_version_str
+from codechecker_web.shared.version import get_version_str, \
+    THRIFT_BINARY_CONTENT_TYPE, THRIFT_COMPACT_CONTENT_TYPE, \
+    THRIFT_JSON_CONTENT_TYPE
 
 from . import instance_manager
 from . import permissions
@@ -56,18 +67,41 @@ from . import session_manager
 
 from .tmp import get_tmp_dir_hash
 
+from .api import report_export
+from .api import store_handler
 from .api.authentication import ThriftAuthHandler as AuthHandler_v6
 from .api.config_handler import ThriftConfigHandler as ConfigHandler_v6
 from .api.db import DBSession
 from .api.product_server import ThriftProductHandler as ProductHandler_v6
 from .api.report_server import ThriftRequestHandler as ReportHandler_v6
+from .checker_docs import CheckerDocs
+from .keep_alive import IdleConnections
+from .metrics import METRICS_CONTENT_TYPE, Metrics
+from .prefork import WorkerProcesses
+from .source_cache import SourceCache
+from .static_cache import StaticFileCache
+from .store_queue import StoreQueue
 from .database import database
 from .database import db_cleanup
+from .database.blob_store import BlobStore
+from .database.content_hash_filter import ContentHashFilter
 from .database.config_db_model import Product as ORMProduct
-from .database.run_db_model import IDENTIFIER as RUN_META, Run, RunLock
+from .database.run_db_model import IDENTIFIER as RUN_META, DBIdentifier, \
+    Run, RunLock
 
 LOG = get_logger('server')
 
+# Thrift protocols of the request content types. The requests of other
+# content types, like the ones of the browsers, use the JSON protocol.
+THRIFT_PROTOCOLS = {
+    THRIFT_BINARY_CONTENT_TYPE:
+        TBinaryProtocol.TBinaryProtocolAcceleratedFactory(),
+    THRIFT_COMPACT_CONTENT_TYPE: TCompactProtocol.TCompactProtocolFactory()
+}
+
+# The Thrift responses smaller than this are not worth compressing.
+COMPRESSION_MIN_SIZE = 1024
+
 
 class RequestHandler(SimpleHTTPRequestHandler):
     """
@@ -76,7 +110,21 @@ class RequestHandler(SimpleHTTPRequestHandler):
     """
     auth_session = None
 
+    # The connections are kept open after the responses which tell their
+    # length. See end_headers().
+    protocol_version = 'HTTP/1.1'
+
+    # The headers are written to the socket one by one, which would be
+    # delayed by Nagle's algorithm on the persistent connections.
+    disable_nagle_algorithm = True
+
     def __init__(self, request, client_address, server):
+        self.keep_alive = False
+        self.__response_code = None
+        self.__response_headers = set()
+        self.__response_length = 0
+        self.__request_metrics = None
+        self.__thrift_content_type = THRIFT_JSON_CONTENT_TYPE
         BaseHTTPRequestHandler.__init__(self,
                                         request,
                                         client_address,
@@ -86,10 +134,47 @@ class RequestHandler(SimpleHTTPRequestHandler):
         """ Silencing http server. """
         return
 
+    def handle(self):
+        """
+        Handle the requests of a connection. The connection is handed back to
+        the server to wait for the next request without occupying a worker
+        thread, unless the next request is already buffered.
+        """
+        self.close_connection = 1
+        self.handle_one_request()
+        while not self.close_connection and self.__has_buffered_request():
+            self.handle_one_request()
+
+        self.keep_alive = not self.close_connection
+
+    def __has_buffered_request(self):
+        """
+        Returns True if the client sent data which is already read from the
+        socket by the input stream or by the SSL layer.
+        """
+        read_buffer = getattr(self.rfile, '_rbuf', None)
+        if read_buffer is not None and read_buffer.tell():
+            return True
+
+        pending = getattr(self.connection, 'pending', None)
+        return bool(pending and pending())
+
+    def send_response(self, code, message=None):
+        self.__response_code = code
+        self.__response_headers = set()
+        self.__response_length = 0
+        SimpleHTTPRequestHandler.send_response(self, code, message)
+
+    def send_header(self, keyword, value):
+        self.__response_headers.add(keyword.lower())
+        if keyword.lower() == 'content-length':
+            self.__response_length = int(value)
+        SimpleHTTPRequestHandler.send_header(self, keyword, value)
+
     def send_thrift_exception(self, error_msg, iprot, oprot, otrans):
         """
         Send an exception response to the client in a proper format which can
-        be parsed by the Thrift clients expecting JSON responses.
+        be parsed by the Thrift clients using the protocol of the request.
         """
         ex = TApplicationException(TApplicationException.INTERNAL_ERROR,
                                    error_msg)
@@ -98,9 +183,53 @@ class RequestHandler(SimpleHTTPRequestHandler):
         ex.write(oprot)
         oprot.writeMessageEnd()
         oprot.trans.flush()
-        result = otrans.getvalue()
+        self.__send_thrift_response(otrans.getvalue())
+
+    def __get_content_encoding(self, encodings=('gzip', 'deflate')):
+        """
+        Returns the first of the given compressions of the response which is
+        accepted by the client, or None.
+        """
+        accepted = {}
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            params = coding.split(';')
+            quality = 1.0
+            for param in params[1:]:
+                name, _, value = param.partition('=')
+                if name.strip() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+
+            accepted[params[0].strip().lower()] = quality
+
+        for encoding in encodings:
+            if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+                return encoding
+
+        return None
+
+    def __send_thrift_response(self, result):
+        """
+        Send the serialized Thrift response, compressed if the client accepts
+        compressed responses.
+        """
+        encoding = self.__get_content_encoding() \
+            if len(result) >= COMPRESSION_MIN_SIZE else None
+
+        if encoding == 'gzip':
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            result = compressor.compress(result) + compressor.flush()
+        elif encoding == 'deflate':
+            result = zlib.compress(result, 6)
+
         self.send_response(200)
-        self.send_header("content-type", "application/x-thrift")
+        self.send_header("content-type", self.__thrift_content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
         self.send_header("Content-Length", len(result))
         self.end_headers()
         self.wfile.write(result)
@@ -173,13 +302,230 @@ class RequestHandler(SimpleHTTPRequestHandler):
             if user_name:
                 self.send_header("X-User", user_name)
 
+        # Without the length of the response the client can only tell its
+        # end by the closed connection.
+        has_length = 'content-length' in self.__response_headers or \
+            self.__response_code in (204, 304)
+        if 'connection' not in self.__response_headers:
+            if not has_length or not self.server.can_keep_alive():
+                self.send_header("Connection", "close")
+            else:
+                # The clients reconnect instead of reusing the connection
+                # when it is idle for longer than this timeout.
+                self.send_header("Keep-Alive", "timeout={0}".format(
+                    int(self.server.manager.keepalive_timeout)))
+
         SimpleHTTPRequestHandler.end_headers(self)
 
+    def __is_not_modified(self, *etags):
+        """
+        Returns True if the client has the representation of one of the given
+        ETags already.
+        """
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+
+        for etag in if_none_match.split(','):
+            etag = etag.strip()
+            if etag.startswith('W/'):
+                etag = etag[2:]
+
+            if etag == '*' or etag in etags:
+                return True
+
+        return False
+
+    def __send_static_file(self, path):
+        """
+        Send a public static file from the static file cache of the server.
+        Returns False if the file can not be served from the cache.
+        """
+        static_file = self.server.static_files.get(self.translate_path(path))
+        if not static_file:
+            return False
+
+        self.__send_cached_content(
+            static_file.content_type, static_file.cache_control,
+            static_file.content, static_file.etag,
+            static_file.gzip_content, static_file.gzip_etag,
+            static_file.mtime)
+
+        return True
+
+    def __send_checker_doc(self, api_ver, checker_id):
+        """
+        Send the markdown documentation of the given checker from the checker
+        documentation cache of the server.
+        """
+        if not routing.is_supported_version(api_ver):
+            self.send_error(
+                400,
+                "The API version you are using is not supported by this "
+                "server (server API version: {0})!".format(get_version_str()))
+            return
+
+        if not checker_id:
+            self.send_error(400, "The checker is not specified.")
+            return
+
+        doc = self.server.checker_docs.get(checker_id)
+
+        # The documentation is changed by the upgrade of the server or by
+        # a reload, so the clients have to revalidate it by its ETag.
+        self.__send_cached_content(
+            "text/markdown; charset=utf-8", "no-cache",
+            doc.data, doc.etag, doc.gzip_data, doc.gzip_etag)
+
+    def __send_cached_content(self, content_type, cache_control,
+                              content, etag, gzip_content, gzip_etag,
+                              mtime=None):
+        """
+        Send a cached response in the representation accepted by the client,
+        or without its content if the client has it already.
+        """
+        not_modified = self.__is_not_modified(etag, gzip_etag)
+
+        use_gzip = gzip_content is not None and \
+            self.__get_content_encoding(['gzip']) is not None
+        if use_gzip:
+            content, etag = gzip_content, gzip_etag
+
+        if not_modified:
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", len(content))
+            if mtime is not None:
+                self.send_header("Last-Modified", self.date_time_string(mtime))
+
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+        if not not_modified:
+            self.wfile.write(content)
+
+    def __send_metrics(self):
+        """
+        Send the metrics of the server in the Prometheus text format to the
+        superusers.
+        """
+        if self.server.manager.is_enabled and not self.auth_session:
+            self.send_error(401, "Unauthorized!")
+            return
+
+        with DBSession(self.server.config_session) as session:
+            is_superuser = permissions.require_permission(
+                permissions.SUPERUSER,
+                {'config_db_session': session},
+                self.auth_session)
+
+        if not is_superuser:
+            self.send_error(403, "No permission to access the metrics.")
+            return
+
+        content = self.server.get_metrics().encode('utf-8')
+
+        use_gzip = len(content) >= COMPRESSION_MIN_SIZE and \
+            self.__get_content_encoding(['gzip']) is not None
+        if use_gzip:
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            content = compressor.compress(content) + compressor.flush()
+
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", len(content))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def __export_reports(self, product, api_ver):
+        """
+        Stream the filtered reports of the given product as gzip compressed,
+        newline-delimited JSON.
+        """
+        if not routing.is_supported_version(api_ver):
+            self.send_error(
+                400,
+                "The API version you are using is not supported by this "
+                "server (server API version: {0})!".format(get_version_str()))
+            return
+
+        if self.server.manager.is_enabled and not self.auth_session:
+            self.send_error(401, "Unauthorized!")
+            return
+
+        if not self.__has_access_permission(product):
+            self.send_error(403, "No permission to access the product.")
+            return
+
+        if product.db_status != DBStatus.OK:
+            self.send_error(503, "The database of the product is not "
+                                 "available.")
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+
+        with DBSession(product.session_factory) as session:
+            try:
+                run_ids, report_filter = \
+                    report_export.get_export_filter(session, query)
+            except ValueError as ex:
+                self.send_error(400, str(ex))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            try:
+                for line in report_export.export_reports(
+                        session, run_ids, report_filter,
+                        report_export.is_true(query, 'details'),
+                        report_export.is_true(query, 'sources'),
+                        product.blob_store):
+                    data = compressor.compress(line)
+                    if data:
+                        self.wfile.write(data)
+
+                self.wfile.write(compressor.flush())
+            except Exception as ex:
+                # The response status is already sent, so the client can
+                # only notice the failure from the truncated gzip stream.
+                LOG.error("Exporting the reports of product '%s' failed.",
+                          product.endpoint)
+                LOG.error(ex)
+
     def do_GET(self):
         """
         Handles the browser access (GET requests).
         """
 
+        # The public static files are served without checking the session,
+        # and without any database access.
+        static_path = routing.get_public_static_path(self.path)
+        if static_path and self.__send_static_file(static_path):
+            return
+
+        # The checker documentations are public too, like the documentation
+        # files under the webserver root.
+        checker_doc_request = routing.split_checker_doc_request(self.path)
+        if checker_doc_request:
+            self.__send_checker_doc(*checker_doc_request)
+            return
+
         self.auth_session = self.__check_session_cookie()
         username = self.auth_session.user if self.auth_session else 'Anonymous'
         LOG.debug("%s:%s -- [%s] GET %s", self.client_address[0],
@@ -189,6 +535,10 @@ class RequestHandler(SimpleHTTPRequestHandler):
 
         product_endpoint, path = routing.split_client_GET_request(self.path)
 
+        if product_endpoint is None and path == routing.METRICS_ENDPOINT:
+            self.__send_metrics()
+            return
+
         if self.server.manager.is_enabled and not self.auth_session \
                 and routing.is_protected_GET_entrypoint(path):
             # If necessary, prompt the user for authentication.
@@ -234,6 +584,11 @@ class RequestHandler(SimpleHTTPRequestHandler):
                     self.end_headers()
                     return
 
+            export_api_ver = routing.split_export_request(path)
+            if export_api_ver is not None:
+                self.__export_reports(product, export_api_ver)
+                return
+
             if path == '' and not self.__has_access_permission(product):
                 LOG.warning("User '%s' does not have permission to access "
                             "the '%s' product.", username, product_endpoint)
@@ -301,8 +656,6 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 LOG.debug("Serving product list as homepage.")
                 self.path = '/products.html'
 
-            self.send_response(200)  # 200 OK
-
         SimpleHTTPRequestHandler.do_GET(self)  # Actual serving of file.
 
     def __check_prod_db(self, product_endpoint):
@@ -353,7 +706,41 @@ class RequestHandler(SimpleHTTPRequestHandler):
 
     def do_POST(self):
         """
-        Handles POST queries, which are usually Thrift messages.
+        Handles POST queries, which are usually Thrift messages, and records
+        the metrics of the request.
+        """
+        slow_request_threshold = self.server.manager.slow_request_threshold
+        self.__request_metrics = self.server.metrics.start_request(
+            'unknown', 'unknown', keep_statements=slow_request_threshold > 0)
+        try:
+            self.__handle_thrift_request()
+        finally:
+            self.server.metrics.finish_request(self.__request_metrics,
+                                               self.__response_length,
+                                               slow_request_threshold)
+            self.__request_metrics = None
+
+    def __label_request_metrics(self, request_endpoint, product, processor,
+                                body, protocol_factory):
+        """
+        Set the labels of the metrics of the current request. Only the known
+        Thrift methods are used as labels, so the number of the recorded
+        histograms does not depend on the requests of the clients.
+        """
+        try:
+            method, _, _ = protocol_factory.getProtocol(
+                TTransport.TMemoryBuffer(body)).readMessageBegin()
+        except Exception:
+            method = None
+
+        self.__request_metrics.endpoint = request_endpoint
+        self.__request_metrics.method = method \
+            if method in processor._processMap else 'unknown'
+        self.__request_metrics.product = product.endpoint if product else ''
+
+    def __handle_thrift_request(self):
+        """
+        Handles a Thrift message.
         """
 
         client_host, client_port = self.client_address
@@ -363,18 +750,24 @@ class RequestHandler(SimpleHTTPRequestHandler):
                  self.path)
 
         # Create new thrift handler.
-        checker_md_docs = self.server.checker_md_docs
-        checker_md_docs_map = self.server.checker_md_docs_map
         version = self.server.version
 
-        protocol_factory = TJSONProtocol.TJSONProtocolFactory()
+        content_type = \
+            self.headers.get('Content-Type', '').split(';')[0].strip()
+        protocol_factory = THRIFT_PROTOCOLS.get(content_type)
+        if protocol_factory:
+            self.__thrift_content_type = content_type
+        else:
+            protocol_factory = TJSONProtocol.TJSONProtocolFactory()
+            self.__thrift_content_type = THRIFT_JSON_CONTENT_TYPE
+
         input_protocol_factory = protocol_factory
         output_protocol_factory = protocol_factory
 
-        itrans = TTransport.TFileObjectTransport(self.rfile)
-        itrans = TTransport.TBufferedTransport(itrans,
-                                               int(self.headers[
-                                                   'Content-Length']))
+        # The whole body is read, so the next request of a persistent
+        # connection starts at the right place even if the request fails.
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        itrans = TTransport.TMemoryBuffer(body)
         otrans = TTransport.TMemoryBuffer()
 
         iprot = input_protocol_factory.getProtocol(itrans)
@@ -449,10 +842,11 @@ class RequestHandler(SimpleHTTPRequestHandler):
                             product,
                             self.auth_session,
                             self.server.config_session,
-                            checker_md_docs,
-                            checker_md_docs_map,
+                            self.server.checker_docs,
                             version,
-                            self.server.context)
+                            self.server.context,
+                            self.server.store_queue,
+                            self.server.parse_pool)
                         processor = ReportAPI_v6.Processor(acc_handler)
                     else:
                         LOG.debug("This API endpoint does not exist.")
@@ -467,14 +861,10 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 self.send_thrift_exception(error_msg, iprot, oprot, otrans)
                 return
 
+            self.__label_request_metrics(request_endpoint, product, processor,
+                                         body, input_protocol_factory)
             processor.process(iprot, oprot)
-            result = otrans.getvalue()
-
-            self.send_response(200)
-            self.send_header("content-type", "application/x-thrift")
-            self.send_header("Content-Length", len(result))
-            self.end_headers()
-            self.wfile.write(result)
+            self.__send_thrift_response(otrans.getvalue())
             return
 
         except Exception as exn:
@@ -482,11 +872,14 @@ class RequestHandler(SimpleHTTPRequestHandler):
             import traceback
             traceback.print_exc()
 
-            cstringio_buf = itrans.cstringio_buf.getvalue()
-            if cstringio_buf:
-                itrans = TTransport.TMemoryBuffer(cstringio_buf)
+            if body:
+                itrans = TTransport.TMemoryBuffer(body)
                 iprot = input_protocol_factory.getProtocol(itrans)
 
+            # Drop the partially written response.
+            otrans = TTransport.TMemoryBuffer()
+            oprot = output_protocol_factory.getProtocol(otrans)
+
             self.send_thrift_exception(str(exn), iprot, oprot, otrans)
             return
 
@@ -526,9 +919,20 @@ class Product(object):
     # connect() call so the next could be made.
     CONNECT_RETRY_TIMEOUT = 300
 
-    def __init__(self, orm_object, context, check_env):
+    def __init__(self, orm_object, context, check_env, source_blob_dir=None,
+                 source_cache=None, pool_config=None):
         """
         Set up a new managed product object for the configuration given.
+
+        If source_blob_dir is given, the source file contents of the product
+        are stored in a content-addressed blob store under this directory
+        instead of the product database.
+
+        The source_cache holds the decompressed source files. It can be
+        shared by the products, because it is keyed by content hash.
+
+        The pool_config contains the connection pool settings of the
+        product database engine.
         """
         self.__id = orm_object.id
         self.__endpoint = orm_object.endpoint
@@ -540,6 +944,11 @@ class Product(object):
         self.__engine = None
         self.__session = None
         self.__db_status = DBStatus.MISSING
+        self.__source_blob_dir = source_blob_dir
+        self.__blob_store = None
+        self.__content_hash_filter = ContentHashFilter()
+        self.__source_cache = source_cache or SourceCache(0)
+        self.__pool_config = pool_config
 
         self.__last_connect_attempt = None
 
@@ -561,6 +970,13 @@ class Product(object):
         """
         return self.__display_name
 
+    @property
+    def connection_string(self):
+        """
+        Returns the connection string of the product database.
+        """
+        return self.__connection_string
+
     @property
     def session_factory(self):
         """
@@ -569,6 +985,39 @@ class Product(object):
         """
         return self.__session
 
+    @property
+    def blob_store(self):
+        """
+        Returns the source blob store of the product, or None if the source
+        file contents are stored in the product database.
+        """
+        return self.__blob_store
+
+    @property
+    def content_hash_filter(self):
+        """
+        Returns the filter of the source file content hashes which are stored
+        in the product database.
+        """
+        return self.__content_hash_filter
+
+    @property
+    def source_cache(self):
+        """
+        Returns the cache of the decompressed source files.
+        """
+        return self.__source_cache
+
+    @property
+    def pool_stats(self):
+        """
+        Returns the statistics of the connection pool of the product
+        database, or None if the product is not connected.
+        """
+        if self.__engine is None:
+            return None
+        return database.get_pool_stats(self.__engine)
+
     @property
     def driver_name(self):
         """
@@ -619,7 +1068,10 @@ class Product(object):
             LOG.debug("Trying to connect to the database")
 
             # Create the SQLAlchemy engine.
-            self.__engine = sql_server.create_engine()
+            if self.__engine is not None:
+                self.__engine.dispose()
+
+            self.__engine = sql_server.create_engine(self.__pool_config)
             LOG.debug(self.__engine)
 
             self.__session = sessionmaker(bind=self.__engine)
@@ -632,12 +1084,43 @@ class Product(object):
                 LOG.debug("Initializing new database schema.")
                 self.__db_status = sql_server.connect(init_db)
 
+            if self.__source_blob_dir and self.__db_status == DBStatus.OK:
+                self.__blob_store = self.__open_blob_store()
+
         except Exception as ex:
             LOG.exception("The database for product '%s' cannot be"
                           " connected to.", self.endpoint)
             self.__db_status = DBStatus.FAILED_TO_CONNECT
             self.__last_connect_attempt = (datetime.datetime.now(), str(ex))
 
+    def __open_blob_store(self):
+        """
+        Returns the source blob store of the product database.
+
+        The blob store belongs to the database and not to the endpoint, so
+        its directory is named after the identifier of the database which
+        does not change when the product is renamed or the database is moved.
+        """
+        with DBSession(self.__session) as session:
+            db_id = session.query(DBIdentifier).get(1)
+            if db_id is None:
+                try:
+                    session.add(DBIdentifier(uuid.uuid4().hex))
+                    session.commit()
+                except sqlalchemy.exc.IntegrityError:
+                    # Another server process has generated it in the
+                    # meantime.
+                    session.rollback()
+
+                db_id = session.query(DBIdentifier).get(1)
+
+            identifier = db_id.identifier
+
+        blob_dir = os.path.join(self.__source_blob_dir, identifier)
+        LOG.debug("Source files of product '%s' are stored at '%s'.",
+                  self.endpoint, blob_dir)
+        return BlobStore(blob_dir)
+
     def get_details(self):
         """
         Get details for a product from the database.
@@ -665,6 +1148,14 @@ class Product(object):
 
         return num_of_runs, runs_in_progress, latest_store_to_product
 
+    def dispose_connections(self):
+        """
+        Closes the pooled database connections to the product's backend.
+        New connections are opened on demand.
+        """
+        if self.__engine:
+            self.__engine.dispose()
+
     def teardown(self):
         """
         Disposes the database connection to the product's backend.
@@ -696,7 +1187,13 @@ class Product(object):
                 db_cleanup.remove_unused_files(db.session)
                 db_cleanup.upgrade_severity_levels(db.session,
                                                    self.__context.severity_map)
+                db_cleanup.rebuild_run_report_summaries(db.session)
+                db_cleanup.rebuild_component_files(db.session)
                 db.session.commit()
+
+                if self.__blob_store:
+                    db_cleanup.remove_unused_blobs(db.session,
+                                                   self.__blob_store)
                 LOG.info("Garbage collection finished.")
                 return True
             except Exception as ex:
@@ -729,17 +1226,32 @@ class CCSimpleHttpServer(HTTPServer):
         self.config_directory = config_directory
         self.www_root = pckg_data['www_root']
         self.doc_root = pckg_data['doc_root']
-        self.checker_md_docs = pckg_data['checker_md_docs']
-        self.checker_md_docs_map = pckg_data['checker_md_docs_map']
         self.version = pckg_data['version']
         self.context = context
         self.check_env = check_env
         self.manager = manager
+        self.source_cache = SourceCache(self.manager.source_cache_size)
+        self.static_files = StaticFileCache()
+        self.checker_docs = CheckerDocs(pckg_data['checker_md_docs'],
+                                        pckg_data['checker_md_docs_map'],
+                                        self.version)
+
+        # The server processes share their metrics through files.
+        metrics_dir = os.path.join(config_directory, 'metrics') \
+            if self.manager.server_processes > 1 else None
+        self.metrics = Metrics(metrics_dir, self.get_metric_stats)
+
         self.__products = {}
 
+        # Set when the products may have been changed by another server
+        # process, see reload_products().
+        self.__products_changed = False
+        self.__products_lock = threading.Lock()
+
         # Create a database engine for the configuration database.
         LOG.debug("Creating database engine for CONFIG DATABASE...")
-        self.__engine = product_db_sql_server.create_engine()
+        self.__engine = product_db_sql_server.create_engine(
+            self.manager.get_database_pool_config())
         self.config_session = sessionmaker(bind=self.__engine)
         self.manager.set_database_connection(self.config_session)
 
@@ -763,8 +1275,14 @@ class CCSimpleHttpServer(HTTPServer):
                 if not product.cleanup_run_db():
                     LOG.warning("Cleaning database for %s Failed.", endpoint)
 
-        worker_processes = self.manager.worker_processes
-        self.__request_handlers = ThreadPool(processes=worker_processes)
+        # The threads are started by serve_forever(), so the server can be
+        # forked into multiple processes before.
+        self.__request_handlers = None
+        self.store_queue = None
+        self.parse_pool = None
+
+        # The persistent connections wait for their next request here.
+        self.__idle_connections = None
 
         try:
             HTTPServer.__init__(self, server_address,
@@ -789,25 +1307,85 @@ class CCSimpleHttpServer(HTTPServer):
             LOG.error("Couldn't start the server: %s", e.__str__())
             raise
 
+    def serve_forever(self, poll_interval=0.5):
+        """
+        Start the request handler and store worker threads, and handle the
+        requests until the server is terminated.
+        """
+        # The report parser processes are forked before any thread of this
+        # server process is started.
+        if self.manager.parse_processes > 1:
+            self.parse_pool = store_handler.ReportParserPool(
+                self.manager.parse_processes)
+
+        worker_processes = self.manager.worker_processes
+        self.__request_handlers = ThreadPool(processes=worker_processes)
+        self.store_queue = StoreQueue(
+            self.manager.store_workers,
+            os.path.join(self.config_directory, 'store_tasks'))
+
+        if self.manager.keepalive_timeout:
+            self.__idle_connections = IdleConnections(
+                self.manager.keepalive_timeout,
+                self.process_request,
+                self.shutdown_request)
+
+        HTTPServer.serve_forever(self, poll_interval)
+
+    def dispose_connections(self):
+        """
+        Close the pooled database connections of the server. The connections
+        must not be shared by forked processes, so they are closed before
+        forking. New connections are opened on demand.
+        """
+        self.__engine.dispose()
+        for product in self.__products.values():
+            product.dispose_connections()
+
     def terminate(self):
         """
         Terminating the server.
         """
         try:
             self.server_close()
+            self.manager.flush_session_accesses()
             self.__engine.dispose()
 
-            self.__request_handlers.terminate()
-            self.__request_handlers.join()
+            if self.__idle_connections:
+                self.__idle_connections.close()
+
+            if self.__request_handlers:
+                self.__request_handlers.terminate()
+                self.__request_handlers.join()
+
+            if self.store_queue:
+                self.store_queue.terminate()
+
+            if self.parse_pool:
+                self.parse_pool.terminate()
         except Exception as ex:
             LOG.error("Failed to shut down the WEB server!")
             LOG.error(str(ex))
             sys.exit(1)
 
+    def can_keep_alive(self):
+        """
+        Returns True if the connections can be kept open after the responses.
+        """
+        return bool(self.__idle_connections and
+                    self.__idle_connections.has_capacity())
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
     def process_request_thread(self, request, client_address):
         try:
             # Finish_request instantiates request handler class.
-            self.finish_request(request, client_address)
+            handler = self.finish_request(request, client_address)
+            if handler.keep_alive and self.__idle_connections and \
+                    self.__idle_connections.add(request, client_address):
+                return
+
             self.shutdown_request(request)
         except socket.error as serr:
             if serr[0] == errno.EPIPE:
@@ -838,7 +1416,11 @@ class CCSimpleHttpServer(HTTPServer):
 
         prod = Product(orm_product,
                        self.context,
-                       self.check_env)
+                       self.check_env,
+                       self.manager.get_source_blob_dir(),
+                       self.source_cache,
+                       self.manager.get_database_pool_config(
+                           orm_product.endpoint))
 
         # Update the product database status.
         prod.connect()
@@ -855,10 +1437,104 @@ class CCSimpleHttpServer(HTTPServer):
         """
         return len(self.__products)
 
+    def get_pool_stats(self):
+        """
+        Returns the statistics of the database connection pools of the
+        configuration database and of the connected products.
+        """
+        return {'config': database.get_pool_stats(self.__engine),
+                'products': {endpoint: product.pool_stats
+                             for endpoint, product in self.__products.items()}}
+
+    def get_metrics(self):
+        """
+        Returns the metrics of the API requests, and the statistics of the
+        caches and of the database connection pools of the server in the
+        Prometheus text format.
+        """
+        return self.metrics.export(self.get_metric_stats())
+
+    def get_metric_stats(self):
+        """
+        Returns the statistics of the caches and of the database connection
+        pools of the server process for the metrics.
+        """
+        stats = [('codechecker_source_cache', {}, self.source_cache.stats()),
+                 ('codechecker_static_file_cache', {},
+                  self.static_files.stats()),
+                 ('codechecker_checker_doc_cache', {},
+                  self.checker_docs.stats()),
+                 ('codechecker_permission_cache', {},
+                  permissions.PERMISSION_CACHE.stats())]
+
+        pool_stats = self.get_pool_stats()
+        stats.append(('codechecker_db_pool', {'database': 'config'},
+                      pool_stats['config']))
+        for endpoint, product_pool_stats in \
+                sorted(pool_stats['products'].items()):
+            if product_pool_stats:
+                stats.append(('codechecker_db_pool',
+                              {'database': 'product', 'product': endpoint},
+                              product_pool_stats))
+
+        return stats
+
+    def reload_products(self):
+        """
+        Check the connected products against the configuration database
+        before their next use, because they may have been changed or removed
+        by another server process. This is called by the reload signal
+        handler, so the check itself is done later by a request thread.
+        """
+        self.__products_changed = True
+
+    def notify_products_changed(self):
+        """
+        Make the other server processes reload their products after the
+        products were changed in the configuration database by this process.
+        The reload of the configuration is requested from the master
+        process, which forwards it to every server process.
+        """
+        if self.manager.server_processes > 1:
+            os.kill(os.getppid(), signal.SIGHUP)
+
+    def __sync_products(self):
+        """
+        Disconnect the products which were removed from the configuration
+        database, and reconnect the products which were changed there, if
+        reload_products() was called since the last check.
+        """
+        with self.__products_lock:
+            if not self.__products_changed:
+                return
+            self.__products_changed = False
+
+        cfg_sess = self.config_session()
+        try:
+            records = {record.endpoint: record
+                       for record in cfg_sess.query(ORMProduct)}
+
+            for endpoint, product in list(self.__products.items()):
+                record = records.get(endpoint)
+                if record is not None and record.id == product.id and \
+                        record.connection == product.connection_string and \
+                        record.display_name == product.name:
+                    continue
+
+                LOG.info("Product '%s' was changed in the configuration "
+                         "database. Reconnecting...", endpoint)
+                self.remove_product(endpoint)
+                if record is not None:
+                    self.add_product(record)
+        finally:
+            cfg_sess.close()
+
     def get_product(self, endpoint):
         """
         Get the product connection object for the given endpoint, or None.
         """
+        self.__sync_products()
+
         if endpoint in self.__products:
             return self.__products.get(endpoint)
 
@@ -894,6 +1570,8 @@ class CCSimpleHttpServer(HTTPServer):
         Returns the Product object for the only product connected to by the
         server, or None, if there are 0 or >= 2 products managed.
         """
+        self.__sync_products()
+
         return list(self.__products.items())[0][1] if self.num_products == 1 \
             else None
 
@@ -1035,16 +1713,31 @@ def start_server(config_directory, package_data, port, config_sql_server,
         http_server.terminate()
         sys.exit(128 + signum)
 
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    def reload_config():
+        """
+        Reloads server configuration file, drops the cached checker
+        documentations, and checks the products in the configuration
+        database again.
+        """
+        manager.reload_config()
+        http_server.checker_docs.reload()
+        http_server.reload_products()
 
     def reload_signal_handler(*args, **kwargs):
         """
         Reloads server configuration file.
         """
-        manager.reload_config()
+        reload_config()
 
-    signal.signal(signal.SIGHUP, reload_signal_handler)
+    def serve():
+        """
+        Handle the requests in this process until it is stopped.
+        """
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        signal.signal(signal.SIGHUP, reload_signal_handler)
+
+        http_server.serve_forever()
 
     try:
         instance_manager.register(os.getpid(),
@@ -1069,7 +1762,17 @@ def start_server(config_directory, package_data, port, config_sql_server,
             LOG.debug(ex.strerror)
 
     atexit.register(unregister_handler, os.getpid())
-    http_server.serve_forever()
+
+    server_processes = manager.server_processes
+    if server_processes > 1:
+        LOG.info("Starting %d server processes.", server_processes)
+
+        http_server.dispose_connections()
+        WorkerProcesses(server_processes, serve, reload_config).run()
+        http_server.server_close()
+    else:
+        serve()
+
     LOG.info("Webserver quit.")
 
 
@@ -10,12 +10,19 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import hashlib
+import heapq
+import itertools
 import json
+import multiprocessing
 import os
+import threading
+import time
 import uuid
 
+from sqlalchemy import and_, bindparam
+
 from codechecker_common.logger import get_logger
 from codechecker_common.util import load_json_or_empty
 
@@ -24,6 +31,7 @@ from codechecker_web.shared.version import SESSION_COOKIE_NAME as _SCN
 
 from .database.config_db_model import Session as SessionRecord
 from .database.config_db_model import SystemPermission
+from .database.database import DEFAULT_POOL_CONFIG
 
 UNSUPPORTED_METHODS = []
 
@@ -41,6 +49,17 @@ except ImportError:
 LOG = get_logger("server")
 SESSION_COOKIE_NAME = _SCN
 
+# Number of seconds for which the unknown session tokens are remembered, so
+# repeated requests with an invalid cookie do not query the database.
+UNKNOWN_TOKEN_TTL = 10
+
+# Maximum number of remembered unknown session tokens.
+UNKNOWN_TOKEN_CACHE_SIZE = 10000
+
+# The last access times of the sessions are written to the database in
+# batches at most this many seconds after the access.
+SESSION_ACCESS_FLUSH_INTERVAL = 10
+
 
 def generate_session_token():
     """
@@ -66,12 +85,211 @@ def get_worker_processes(scfg_dict, default=10):
     return worker_processes
 
 
+def get_server_processes(scfg_dict, default=1):
+    """
+    Return number of server processes from the config dictionary.
+
+    Return 'server_processes' field from the config dictionary or returns the
+    default value if this field is not set or the value is not positive.
+    """
+    server_processes = scfg_dict.get('server_processes', default)
+
+    if server_processes < 1:
+        LOG.warning("Number of server processes must be positive! Default "
+                    "value will be used: %s", default)
+        server_processes = default
+
+    return server_processes
+
+
+def get_store_workers(scfg_dict, default=2):
+    """
+    Return number of store workers from the config dictionary.
+
+    Return 'store_workers' field from the config dictionary or returns the
+    default value if this field is not set or the value is not positive.
+    """
+    store_workers = scfg_dict.get('store_workers', default)
+
+    if store_workers < 1:
+        LOG.warning("Number of store workers must be positive! Default "
+                    "value will be used: %s", default)
+        store_workers = default
+
+    return store_workers
+
+
+def get_parse_processes(scfg_dict, default):
+    """
+    Return number of report parser processes from the config dictionary.
+
+    Return 'parse_processes' field from the config dictionary or returns the
+    default value if this field is not set or the value is not positive.
+    """
+    parse_processes = scfg_dict.get('parse_processes', default)
+
+    if parse_processes < 1:
+        LOG.warning("Number of report parser processes must be positive! "
+                    "Default value will be used: %s", default)
+        parse_processes = default
+
+    return parse_processes
+
+
+def get_source_cache_size(scfg_dict, default=256 * 1024 * 1024):
+    """
+    Return the size of the source file cache from the config dictionary.
+
+    Return 'source_cache_size' field from the config dictionary or returns
+    the default value if this field is not set or the value is negative.
+    """
+    source_cache_size = scfg_dict.get('source_cache_size', default)
+
+    if source_cache_size < 0:
+        LOG.warning("Size of the source file cache must not be negative! "
+                    "Default value will be used: %s", default)
+        source_cache_size = default
+
+    return source_cache_size
+
+
+def get_keepalive_timeout(scfg_dict, default=15):
+    """
+    Return the idle timeout of the persistent HTTP connections.
+
+    Return 'keepalive_timeout' field from the config dictionary or returns
+    the default value if this field is not set or the value is negative.
+    The value 0 disables the persistent connections.
+    """
+    keepalive_timeout = scfg_dict.get('keepalive_timeout', default)
+
+    if keepalive_timeout < 0:
+        LOG.warning("Keep-alive timeout must not be negative! "
+                    "Default value will be used: %s", default)
+        keepalive_timeout = default
+
+    return keepalive_timeout
+
+
+def get_slow_request_threshold(scfg_dict, default=0):
+    """
+    Return the duration in seconds above which the API requests are logged
+    as slow requests.
+
+    Return 'slow_request_threshold' field from the config dictionary or
+    returns the default value if this field is not set or the value is
+    negative. The value 0 disables the slow request log.
+    """
+    slow_request_threshold = scfg_dict.get('slow_request_threshold', default)
+
+    if slow_request_threshold is None or slow_request_threshold < 0:
+        LOG.warning("Slow request threshold must not be negative! "
+                    "Default value will be used: %s", default)
+        slow_request_threshold = default
+
+    return slow_request_threshold
+
+
+def get_database_pool_config(scfg_dict):
+    """
+    Return the database connection pool settings from the config dictionary.
+
+    Return 'database_pool' field from the config dictionary. The settings of
+    the products can be overridden by the endpoints in its 'products' field.
+    Missing or invalid values are replaced by the default values.
+    """
+    pool_config = dict(scfg_dict.get('database_pool', {}))
+    product_configs = pool_config.pop('products', {})
+
+    def validate(config):
+        config = dict(config)
+        for key in ['pool_size', 'max_overflow', 'timeout', 'recycle']:
+            if key in config and config[key] < 0:
+                LOG.warning("Database pool setting '%s' must not be "
+                            "negative! Default value will be used: %s",
+                            key, DEFAULT_POOL_CONFIG[key])
+                del config[key]
+        return config
+
+    pool_config = validate(pool_config)
+    return pool_config, {endpoint: validate(dict(pool_config, **config))
+                         for endpoint, config in product_configs.items()}
+
+
+class _SessionAccessWriter(object):
+    """
+    Collects the last access times of the revalidated sessions and writes
+    them to the database in one batch, instead of updating the session record
+    on every revalidation. A timer writes the collected accesses at most
+    SESSION_ACCESS_FLUSH_INTERVAL seconds after the first of them, so the
+    other server processes do not see an active session as expired.
+    """
+
+    def __init__(self, database=None):
+        self.database = database
+
+        self.__lock = threading.Lock()
+        self.__accesses = {}
+        self.__timer = None
+
+    def add(self, session):
+        """
+        Register the last access of the given session. The flush of the
+        registered accesses is scheduled when the first of them is added.
+        """
+        with self.__lock:
+            self.__accesses[session.token] = (session.user,
+                                              session.last_access)
+            if self.__timer is None:
+                self.__timer = threading.Timer(SESSION_ACCESS_FLUSH_INTERVAL,
+                                               self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def flush(self):
+        """
+        Write the registered last access times to the database.
+        """
+        with self.__lock:
+            accesses, self.__accesses = self.__accesses, {}
+            timer, self.__timer = self.__timer, None
+
+        if timer:
+            timer.cancel()
+
+        if not accesses or not self.database:
+            return
+
+        records = SessionRecord.__table__
+        update = records.update() \
+            .where(and_(records.c.token == bindparam('b_token'),
+                        records.c.user_name == bindparam('b_user_name'))) \
+            .values(last_access=bindparam('b_last_access'))
+
+        transaction = None
+        try:
+            transaction = self.database()
+            transaction.execute(update, [
+                {'b_token': token,
+                 'b_user_name': user_name,
+                 'b_last_access': last_access}
+                for token, (user_name, last_access) in accesses.items()])
+            transaction.commit()
+        except Exception as e:
+            LOG.warning("Couldn't update usage timestamp of %d sessions",
+                        len(accesses))
+            LOG.warning(str(e))
+        finally:
+            if transaction:
+                transaction.close()
+
+
 class _Session(object):
     """A session for an authenticated, privileged client connection."""
 
     def __init__(self, token, username, groups,
-                 session_lifetime, refresh_time, is_root=False, database=None,
-                 last_access=None, can_expire=True):
+                 session_lifetime, refresh_time, is_root=False,
+                 access_writer=None, last_access=None, can_expire=True):
 
         self.token = token
         self.user = username
@@ -80,7 +298,7 @@ class _Session(object):
         self.session_lifetime = session_lifetime
         self.refresh_time = refresh_time if refresh_time else None
         self.__root = is_root
-        self.__database = database
+        self.__access_writer = access_writer
         self.__can_expire = can_expire
         self.last_access = last_access if last_access else datetime.now()
 
@@ -101,6 +319,10 @@ class _Session(object):
         return (datetime.now() - self.last_access).total_seconds() > \
             self.refresh_time
 
+    @property
+    def can_expire(self):
+        return self.__can_expire
+
     @property
     def is_alive(self):
         """
@@ -124,29 +346,12 @@ class _Session(object):
         if not self.is_alive:
             return
 
-        if self.__database and self.is_refresh_time_expire:
+        if self.__access_writer and self.is_refresh_time_expire:
             self.last_access = datetime.now()
 
-            # Update the timestamp in the database for the session's last
-            # access.
-            transaction = None
-            try:
-                transaction = self.__database()
-                record = transaction.query(SessionRecord) \
-                    .filter(SessionRecord.user_name == self.user) \
-                    .filter(SessionRecord.token == self.token) \
-                    .limit(1).one_or_none()
-
-                if record:
-                    record.last_access = self.last_access
-                    transaction.commit()
-            except Exception as e:
-                LOG.warning("Couldn't update usage timestamp of %s",
-                            self.token)
-                LOG.warning(str(e))
-            finally:
-                if transaction:
-                    transaction.close()
+            # The timestamp of the session's last access is written to the
+            # database later, together with the other sessions.
+            self.__access_writer.add(self)
 
 
 class SessionManager(object):
@@ -170,7 +375,19 @@ class SessionManager(object):
         """
         self.__database_connection = None
         self.__logins_since_prune = 0
-        self.__sessions = []
+        self.__sessions = {}
+        self.__lock = threading.RLock()
+
+        # Heap of the (deadline, sequence number, token, session) entries of
+        # the local sessions. A session has to be checked at its deadline:
+        # it expires or its refresh time elapses.
+        self.__session_deadlines = []
+        self.__session_sequence = itertools.count()
+
+        # Expiry times of the recently looked up unknown tokens.
+        self.__unknown_tokens = {}
+
+        self.__access_writer = _SessionAccessWriter()
         self.__session_salt = hashlib.sha1(session_salt).hexdigest()
         self.__configuration_file = configuration_file
 
@@ -181,7 +398,18 @@ class SessionManager(object):
         # handler for the server's stuff should be created, that can properly
         # instantiate SessionManager with the found configuration.
         self.__worker_processes = get_worker_processes(scfg_dict)
+        self.__server_processes = get_server_processes(scfg_dict)
+        self.__store_workers = get_store_workers(scfg_dict)
+        self.__parse_processes = get_parse_processes(
+            scfg_dict,
+            max(1, multiprocessing.cpu_count() // self.__server_processes))
         self.__max_run_count = scfg_dict.get('max_run_count', None)
+        self.__source_blob_dir = scfg_dict.get('source_blob_dir', None)
+        self.__source_cache_size = get_source_cache_size(scfg_dict)
+        self.__keepalive_timeout = get_keepalive_timeout(scfg_dict)
+        self.__slow_request_threshold = get_slow_request_threshold(scfg_dict)
+        self.__database_pool_config, self.__product_pool_configs = \
+            get_database_pool_config(scfg_dict)
         self.__store_config = scfg_dict.get('store', {})
         self.__auth_config = scfg_dict['authentication']
 
@@ -278,6 +506,14 @@ class SessionManager(object):
                 LOG.debug("Updating 'store' config from %s to %s",
                           prev_store_config, new_store_config)
 
+            prev_slow_request_threshold = self.__slow_request_threshold
+            new_slow_request_threshold = get_slow_request_threshold(cfg_dict)
+            if prev_slow_request_threshold != new_slow_request_threshold:
+                self.__slow_request_threshold = new_slow_request_threshold
+                LOG.debug("Changed 'slow_request_threshold' value from %s "
+                          "to %s", prev_slow_request_threshold,
+                          new_slow_request_threshold)
+
             update_sessions = False
             auth_fields_to_update = ['session_lifetime', 'refresh_time',
                                      'logins_until_cleanup']
@@ -294,11 +530,15 @@ class SessionManager(object):
             if update_sessions:
                 # Update configuration options of the already existing
                 # sessions.
-                for session in self.__sessions:
+                for session in self.__sessions.values():
                     session.session_lifetime = \
                         self.__auth_config['session_lifetime']
                     session.refresh_time = self.__auth_config['refresh_time']
 
+            if 'ldap' not in UNSUPPORTED_METHODS:
+                # The changed LDAP group memberships are looked up again.
+                cc_ldap.USER_CACHE.clear()
+
             LOG.info("Done.")
         except ValueError as ex:
             LOG.error("Couldn't reload server configuration file")
@@ -312,6 +552,30 @@ class SessionManager(object):
     def worker_processes(self):
         return self.__worker_processes
 
+    @property
+    def server_processes(self):
+        return self.__server_processes
+
+    @property
+    def store_workers(self):
+        return self.__store_workers
+
+    @property
+    def parse_processes(self):
+        return self.__parse_processes
+
+    @property
+    def source_cache_size(self):
+        return self.__source_cache_size
+
+    @property
+    def keepalive_timeout(self):
+        return self.__keepalive_timeout
+
+    @property
+    def slow_request_threshold(self):
+        return self.__slow_request_threshold
+
     def get_realm(self):
         return {
             "realm": self.__auth_config.get('realm_name'),
@@ -326,6 +590,7 @@ class SessionManager(object):
         Use None as connection's value to unset the database.
         """
         self.__database_connection = connection
+        self.__access_writer.database = connection
 
     def __handle_validation(self, auth_string):
         """
@@ -543,9 +808,55 @@ class SessionManager(object):
         return _Session(
             token, user_name, groups,
             self.__auth_config['session_lifetime'],
-            self.__refresh_time, is_root, self.__database_connection,
+            self.__refresh_time, is_root, self.__access_writer,
             last_access, can_expire)
 
+    @staticmethod
+    def __get_deadline(session):
+        """
+        Returns the time when the given local session has to be checked by
+        the cleanup.
+        """
+        seconds = [session.refresh_time or 0]
+        if session.can_expire:
+            seconds.append(session.session_lifetime)
+
+        return session.last_access + timedelta(seconds=min(seconds))
+
+    def __add_local_session(self, session):
+        """
+        Add the given session to the local in memory store.
+        """
+        with self.__lock:
+            self.__sessions[session.token] = session
+            self.__unknown_tokens.pop(session.token, None)
+
+            heapq.heappush(self.__session_deadlines,
+                           (self.__get_deadline(session),
+                            next(self.__session_sequence),
+                            session.token, session))
+
+    def __is_unknown_token(self, token):
+        """
+        Returns True if the given token was recently looked up but it was not
+        found.
+        """
+        expires_at = self.__unknown_tokens.get(token)
+        return expires_at is not None and expires_at > time.time()
+
+    def __add_unknown_token(self, token):
+        with self.__lock:
+            now = time.time()
+            if len(self.__unknown_tokens) >= UNKNOWN_TOKEN_CACHE_SIZE:
+                self.__unknown_tokens = {
+                    t: expires_at for t, expires_at
+                    in self.__unknown_tokens.items() if expires_at > now}
+
+                if len(self.__unknown_tokens) >= UNKNOWN_TOKEN_CACHE_SIZE:
+                    self.__unknown_tokens.clear()
+
+            self.__unknown_tokens[token] = now + UNKNOWN_TOKEN_TTL
+
     def create_or_get_session(self, auth_string):
         """
         Creates a new session for the given auth-string.
@@ -567,7 +878,7 @@ class SessionManager(object):
         if auth_token:
             local_session = self.__get_local_session_from_db(auth_token.token)
             local_session.revalidate()
-            self.__sessions.append(local_session)
+            self.__add_local_session(local_session)
             return local_session
 
         # Try to authenticate user with different authentication methods.
@@ -595,7 +906,7 @@ class SessionManager(object):
 
             local_session = self.__create_local_session(token, user_name,
                                                         groups, is_root)
-            self.__sessions.append(local_session)
+            self.__add_local_session(local_session)
 
             transaction = None
             if self.__database_connection:
@@ -622,6 +933,23 @@ class SessionManager(object):
         """
         return self.__max_run_count
 
+    def get_source_blob_dir(self):
+        """
+        Returns the directory of the source blob stores of the products. If
+        the value is None the source file contents are stored in the product
+        databases.
+        """
+        return self.__source_blob_dir
+
+    def get_database_pool_config(self, endpoint=None):
+        """
+        Returns the database connection pool settings of the product with
+        the given endpoint, or of the configuration database if no endpoint
+        is given.
+        """
+        return self.__product_pool_configs.get(endpoint,
+                                               self.__database_pool_config)
+
     def get_analysis_statistics_dir(self):
         """
         Get directory where the compressed analysis statistics files should be
@@ -694,22 +1022,35 @@ class SessionManager(object):
         if not self.is_enabled:
             return None
 
-        for sess in self.__sessions:
-            if sess.is_alive and sess.token == token:
-                # If the session is alive but the should be re-validated.
-                if sess.is_refresh_time_expire:
-                    sess.revalidate()
-                return sess
+        sess = self.__sessions.get(token)
+        if sess and sess.is_alive:
+            # If the session is alive but the should be re-validated.
+            if sess.is_refresh_time_expire:
+                # The session may have been removed from the database by
+                # another server process (e.g. at logout), so its record is
+                # checked when it is re-validated.
+                if self.__server_processes > 1 and \
+                        not self.__get_local_session_from_db(token):
+                    self.invalidate_local_session(token)
+                    self.__add_unknown_token(token)
+                    return None
+
+                sess.revalidate()
+            return sess
+
+        if self.__is_unknown_token(token):
+            return None
 
         # Try to get a local session from the database.
         local_session = self.__get_local_session_from_db(token)
         if local_session and local_session.is_alive:
-            self.__sessions.append(local_session)
+            self.__add_local_session(local_session)
             if local_session.is_refresh_time_expire:
                 local_session.revalidate()
             return local_session
 
         self.invalidate(token)
+        self.__add_unknown_token(token)
 
         return None
 
@@ -717,11 +1058,8 @@ class SessionManager(object):
         """
         Remove a user's previous session from the local in memory store.
         """
-        for session in self.__sessions[:]:
-            if session.token == token:
-                self.__sessions.remove(session)
-                return True
-        return False
+        with self.__lock:
+            return self.__sessions.pop(token, None) is not None
 
     def invalidate(self, token):
         """
@@ -756,10 +1094,39 @@ class SessionManager(object):
     def __cleanup_sessions(self):
         self.__logins_since_prune = 0
 
-        for s in self.__sessions:
-            if s.is_refresh_time_expire:
-                self.invalidate_local_session(s.token)
+        now = datetime.now()
+        expired_tokens = []
+        with self.__lock:
+            while self.__session_deadlines and \
+                    self.__session_deadlines[0][0] <= now:
+                _, _, token, session = \
+                    heapq.heappop(self.__session_deadlines)
+
+                if self.__sessions.get(token) is not session:
+                    # The session was removed or replaced meanwhile.
+                    continue
+
+                if not session.is_alive:
+                    expired_tokens.append(token)
+                elif session.is_refresh_time_expire:
+                    # The session is loaded again from the database when it
+                    # is used next time.
+                    del self.__sessions[token]
+                else:
+                    # The session was revalidated since it was added.
+                    heapq.heappush(self.__session_deadlines,
+                                   (self.__get_deadline(session),
+                                    next(self.__session_sequence),
+                                    token, session))
+
+        for token in expired_tokens:
+            self.invalidate(token)
+
+        self.__access_writer.flush()
 
-        for s in self.__sessions:
-            if not s.is_alive:
-                self.invalidate(s.token)
+    def flush_session_accesses(self):
+        """
+        Write the last access times of the revalidated sessions to the
+        database.
+        """
+        self.__access_writer.flush()
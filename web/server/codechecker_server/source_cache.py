@@ -0,0 +1,121 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+In-memory cache of the decompressed source file contents.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from array import array
+import re
+
+from codechecker_common.logger import get_logger
+
+from .cache import LRUCache
+
+LOG = get_logger('server')
+
+NEWLINE = re.compile(b'\n')
+
+
+class SourceFile(object):
+    """
+    Decompressed content of a source file with the offsets of its lines, so
+    single lines can be sliced out of the content without splitting it.
+    """
+
+    def __init__(self, content):
+        self.content = content
+
+        # Start offset of every line.
+        self.__line_offsets = array('L', [0])
+        self.__line_offsets.extend(m.end() for m in
+                                   NEWLINE.finditer(content))
+
+    @property
+    def line_count(self):
+        return len(self.__line_offsets)
+
+    @property
+    def size(self):
+        """
+        Approximate memory usage of the source file in bytes.
+        """
+        return len(self.content) + \
+            self.__line_offsets.itemsize * len(self.__line_offsets)
+
+    def get_line(self, line):
+        """
+        Returns the content of the given line without the line ending. The
+        lines are numbered from 1. An empty content is returned for lines
+        which are not in the file.
+        """
+        if line < 1 or line > len(self.__line_offsets):
+            return self.content[0:0]
+
+        start = self.__line_offsets[line - 1]
+        if line < len(self.__line_offsets):
+            end = self.__line_offsets[line] - 1
+        else:
+            end = len(self.content)
+
+        return self.content[start:end]
+
+
+class SourceCache(object):
+    """
+    Least recently used cache of the decompressed source files by their
+    content hash. The content of a content hash never changes, so the cached
+    source files never need to be invalidated, and the cache can be shared
+    by the products. The total size of the cached files is kept under the
+    given maximum size in bytes, the cache is disabled if it is 0.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.__files = LRUCache(max_size=max_size,
+                                get_size=lambda source_file: source_file.size)
+
+    def get(self, content_hash, load_content):
+        """
+        Returns the SourceFile of the given content hash. If it is not cached,
+        the decompressed content is loaded by the given function.
+        """
+        source_file = self.__files.get(content_hash)
+        if source_file is None:
+            # The content is loaded without holding the lock of the cache, so
+            # other requests are not blocked by the decompression.
+            source_file = SourceFile(load_content())
+            self.__files.put(content_hash, source_file)
+
+        return source_file
+
+    @property
+    def hits(self):
+        return self.__files.hits
+
+    @property
+    def misses(self):
+        return self.__files.misses
+
+    @property
+    def size(self):
+        """
+        Total size of the cached source files in bytes.
+        """
+        return self.__files.size
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+        """
+        stats = self.__files.stats()
+        return {'hits': stats['hits'],
+                'misses': stats['misses'],
+                'files': stats['entries'],
+                'size': stats['size'],
+                'max_size': self.max_size}
@@ -0,0 +1,181 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+In-memory cache of the static files of the web interface.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+import zlib
+
+from codechecker_common.logger import get_logger
+
+from .cache import LRUCache
+
+LOG = get_logger('server')
+
+# Default memory limit of the cache and the size limit of the cached files
+# in bytes.
+STATIC_CACHE_SIZE = 64 * 1024 * 1024
+MAX_STATIC_FILE_SIZE = 8 * 1024 * 1024
+
+# Files smaller than this are not worth compressing.
+COMPRESSION_MIN_SIZE = 1024
+
+# The content types which are compressed if the file has no precompressed
+# sibling.
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/.*|application/(x-)?javascript|application/json|'
+    r'image/svg\+xml)$')
+
+# The names of the fingerprinted files contain the hash of their content,
+# e.g. 'bundle.3f2a9c1d.js', so they never change.
+FINGERPRINTED_NAME = re.compile(r'[.\-][0-9a-f]{8,}\.[A-Za-z0-9]+$')
+
+
+class StaticFile(object):
+    """
+    Content of a static file, compressed with gzip too if it is worth it.
+    """
+
+    def __init__(self, path, mtime, file_size, content, gzip_content):
+        self.path = path
+        self.mtime = mtime
+        self.file_size = file_size
+        self.content = content
+        self.gzip_content = gzip_content
+
+        self.content_type = mimetypes.guess_type(path)[0] or \
+            'application/octet-stream'
+
+        # The representations of the file have different strong ETags.
+        digest = hashlib.sha1(content).hexdigest()
+        self.etag = '"{0}"'.format(digest)
+        self.gzip_etag = '"{0}-gzip"'.format(digest)
+
+        if FINGERPRINTED_NAME.search(os.path.basename(path)):
+            self.cache_control = 'public, max-age=31536000, immutable'
+        else:
+            # The browsers have to revalidate the file by its ETag.
+            self.cache_control = 'no-cache'
+
+    @property
+    def size(self):
+        """
+        Approximate memory usage of the static file in bytes.
+        """
+        return len(self.content) + len(self.gzip_content or b'')
+
+    @staticmethod
+    def load(path, file_stat):
+        """
+        Loads the given file. The gzip compressed content is read from the
+        precompressed '.gz' sibling of the file if it is not older than the
+        file, otherwise the compressible files are compressed in memory.
+        """
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        gzip_content = None
+        try:
+            gzip_stat = os.stat(path + '.gz')
+            if gzip_stat.st_mtime >= file_stat.st_mtime:
+                with open(path + '.gz', 'rb') as f:
+                    gzip_content = f.read()
+        except (IOError, OSError):
+            pass
+
+        static_file = StaticFile(path, file_stat.st_mtime, file_stat.st_size,
+                                 content, gzip_content)
+
+        if static_file.gzip_content is None and \
+                len(content) >= COMPRESSION_MIN_SIZE and \
+                COMPRESSIBLE_TYPES.match(static_file.content_type):
+            compressor = zlib.compressobj(9, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            static_file.gzip_content = \
+                compressor.compress(content) + compressor.flush()
+
+        return static_file
+
+
+class StaticFileCache(object):
+    """
+    Least recently used cache of the static files by their path. The cached
+    files are checked against the modification time and the size of the
+    files, so the changed files are loaded again. The total size of the
+    cached files is kept under the given maximum size in bytes. Files larger
+    than the given maximum file size are not cached.
+    """
+
+    def __init__(self, max_size=STATIC_CACHE_SIZE,
+                 max_file_size=MAX_STATIC_FILE_SIZE):
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.__files = LRUCache(max_size=max_size,
+                                get_size=lambda static_file: static_file.size)
+
+    def get(self, path):
+        """
+        Returns the StaticFile of the given path, or None if the path is not
+        a regular file or it is too large to be cached.
+        """
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+
+        if not stat.S_ISREG(file_stat.st_mode) or \
+                file_stat.st_size > self.max_file_size:
+            return None
+
+        static_file = self.__files.get(
+            path,
+            lambda cached: cached.mtime == file_stat.st_mtime and
+            cached.file_size == file_stat.st_size)
+        if static_file is not None:
+            return static_file
+
+        try:
+            static_file = StaticFile.load(path, file_stat)
+        except (IOError, OSError) as ex:
+            LOG.debug("Failed to load static file '%s': %s", path, ex)
+            return None
+
+        self.__files.put(path, static_file)
+        return static_file
+
+    @property
+    def hits(self):
+        return self.__files.hits
+
+    @property
+    def misses(self):
+        return self.__files.misses
+
+    @property
+    def size(self):
+        """
+        Total size of the cached static files in bytes.
+        """
+        return self.__files.size
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+        """
+        stats = self.__files.stats()
+        return {'hits': stats['hits'],
+                'misses': stats['misses'],
+                'files': stats['entries'],
+                'size': stats['size'],
+                'max_size': self.max_size}
@@ -0,0 +1,348 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Queue of the store operations which are processed by a dedicated pool of
+store workers in the background of the server.
+
+The state of the store operations is saved into a task directory too, so
+every process of a multi-process server can report the outcome of the store
+operations which were submitted to any of the processes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import deque
+from multiprocessing.pool import ThreadPool
+import errno
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+from codeCheckerDBAccess_v6.ttypes import StoreTaskStatus
+from shared.ttypes import ErrorCode, RequestFailed
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
+TOKEN_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _is_process_alive(pid):
+    """
+    Returns True if a process with the given ID is running.
+    """
+    try:
+        os.kill(pid, 0)
+    except OSError as oerr:
+        return oerr.errno != errno.ESRCH
+
+    return True
+
+
+class StoreTask(object):
+    """
+    A store operation which was submitted to the store queue.
+    """
+
+    def __init__(self, token, product_id, run_name, store_func,
+                 on_change=None):
+        self.token = token
+        self.product_id = product_id
+        self.run_name = run_name
+        self.status = StoreTaskStatus.ENQUEUED
+        self.enqueued_at = time.time()
+        self.finished_at = None
+        self.run_id = None
+        self.error = None
+        self.pid = os.getpid()
+
+        self.__store_func = store_func
+        self.__on_change = on_change
+        self.__finished = threading.Event()
+
+    @staticmethod
+    def from_state(state):
+        """
+        Returns a finished or a running task of another process from its
+        state which was returned by to_state().
+        """
+        task = StoreTask(state['token'], state['product_id'],
+                         state['run_name'], None)
+        task.status = state['status']
+        task.enqueued_at = state['enqueued_at']
+        task.finished_at = state['finished_at']
+        task.run_id = state['run_id']
+        task.pid = state['pid']
+
+        error = state.get('error')
+        if error:
+            task.error = RequestFailed(
+                error['code'], error['message'], error['info'])
+
+        if task.status in (StoreTaskStatus.COMPLETED,
+                           StoreTaskStatus.FAILED):
+            task.__finished.set()
+
+        return task
+
+    def to_state(self):
+        """
+        Returns the state of the task as a JSON serializable dict.
+        """
+        error = None
+        if self.error:
+            error = {
+                'code': getattr(self.error, 'errorCode',
+                                ErrorCode.GENERAL),
+                'message': getattr(self.error, 'message', str(self.error)),
+                'info': getattr(self.error, 'extraInfo', None)}
+
+        return {'token': self.token,
+                'product_id': self.product_id,
+                'run_name': self.run_name,
+                'status': self.status,
+                'enqueued_at': self.enqueued_at,
+                'finished_at': self.finished_at,
+                'run_id': self.run_id,
+                'pid': self.pid,
+                'error': error}
+
+    @property
+    def is_finished(self):
+        return self.__finished.is_set()
+
+    def execute(self):
+        """
+        Executes the store function of the task and records its outcome.
+        """
+        self.status = StoreTaskStatus.RUNNING
+        self.__changed()
+        try:
+            self.run_id = self.__store_func()
+            self.status = StoreTaskStatus.COMPLETED
+        except Exception as ex:
+            LOG.error("Storing into run '%s' failed: %s", self.run_name, ex)
+            self.error = ex
+            self.status = StoreTaskStatus.FAILED
+        finally:
+            # Release the references of the store function (e.g. the request
+            # handler) as the task is kept around for the status queries.
+            self.__store_func = None
+            self.finished_at = time.time()
+            self.__changed()
+            self.__finished.set()
+
+    def __changed(self):
+        if self.__on_change:
+            try:
+                self.__on_change(self)
+            except Exception as ex:
+                LOG.error("Failed to save the state of the store into run "
+                          "'%s': %s", self.run_name, ex)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the task is finished or the timeout (in seconds) expires.
+        Returns True if the task has finished.
+        """
+        # Event.wait() without a timeout can not be interrupted by signals in
+        # Python 2, so the waiting is done in short steps.
+        deadline = time.time() + timeout if timeout is not None else None
+        while not self.__finished.wait(1):
+            if deadline is not None and time.time() >= deadline:
+                return False
+
+        return True
+
+
+class StoreQueue(object):
+    """
+    Processes the submitted store operations on a pool of store workers.
+
+    The store operations into the same run of a product are serialized: an
+    operation is started only after the previous operation into the same run
+    has finished, in the order of their submission. Operations into different
+    runs are processed concurrently, limited by the number of workers.
+    """
+
+    # Finished tasks are kept for this many seconds, so the clients can query
+    # their outcome.
+    FINISHED_TASK_LIFETIME = 60 * 60
+
+    def __init__(self, workers, task_dir=None):
+        """
+        If task_dir is given, the state of the tasks is saved into this
+        directory, so the server processes which share it can query the
+        tasks of each other.
+        """
+        self.__workers = ThreadPool(processes=workers)
+        self.__lock = threading.Lock()
+        self.__task_dir = task_dir
+
+        if task_dir:
+            try:
+                os.makedirs(task_dir)
+            except OSError as oerr:
+                if oerr.errno != errno.EEXIST:
+                    raise
+
+        # Token -> StoreTask of every task which is not expired yet.
+        self.__tasks = {}
+
+        # (product ID, run name) -> the tasks waiting for the task into the
+        # same run which is being processed.
+        self.__run_queues = {}
+
+    def submit(self, product_id, run_name, store_func):
+        """
+        Submits a store operation into the given run of the given product.
+        store_func is called without arguments by a store worker and it
+        should return the ID of the stored run.
+        """
+        on_change = self.__save if self.__task_dir else None
+        task = StoreTask(uuid.uuid4().hex, product_id, run_name, store_func,
+                         on_change)
+        key = (product_id, run_name)
+
+        if self.__task_dir:
+            self.__remove_expired_task_files()
+            self.__save(task)
+
+        with self.__lock:
+            self.__remove_expired_tasks()
+            self.__tasks[task.token] = task
+
+            waiting = self.__run_queues.get(key)
+            if waiting is not None:
+                LOG.debug("Store into run '%s' is queued after %d other "
+                          "store(s) into the same run.", run_name,
+                          len(waiting) + 1)
+                waiting.append(task)
+            else:
+                self.__run_queues[key] = deque()
+                self.__workers.apply_async(self.__execute, (task,))
+
+        return task
+
+    def get(self, product_id, token):
+        """
+        Returns the task of the given token if it belongs to the given product
+        and it has not expired yet, otherwise None.
+        """
+        with self.__lock:
+            task = self.__tasks.get(token)
+
+        if not task and self.__task_dir:
+            task = self.__load(token)
+
+        return task if task and task.product_id == product_id else None
+
+    def terminate(self):
+        """
+        Stops the store workers. Store operations which are in progress are
+        abandoned, their run locks expire in the database.
+        """
+        self.__workers.terminate()
+        self.__workers.join()
+
+    def __execute(self, task):
+        """
+        Executes the given task on a store worker and starts the next task
+        which is waiting for the same run.
+        """
+        try:
+            task.execute()
+        finally:
+            key = (task.product_id, task.run_name)
+            with self.__lock:
+                waiting = self.__run_queues[key]
+                if waiting:
+                    self.__workers.apply_async(self.__execute,
+                                               (waiting.popleft(),))
+                else:
+                    del self.__run_queues[key]
+
+    def __task_file(self, token):
+        return os.path.join(self.__task_dir, token + '.json')
+
+    def __save(self, task):
+        """
+        Saves the state of the given task into the task directory. The state
+        is written to a temporary file first which is renamed to its final
+        place, so the other processes never read a partially written state.
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + task.token,
+                                        dir=self.__task_dir)
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(task.to_state(), tmp_file)
+            os.rename(tmp_path, self.__task_file(task.token))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def __load(self, token):
+        """
+        Returns the task of the given token from the task directory, or None
+        if it does not exist. A task whose server process has exited before
+        finishing the task is reported as failed.
+        """
+        if not TOKEN_PATTERN.match(token):
+            return None
+
+        try:
+            with open(self.__task_file(token)) as task_file:
+                task = StoreTask.from_state(json.load(task_file))
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+        if not task.is_finished and not _is_process_alive(task.pid):
+            task.status = StoreTaskStatus.FAILED
+            task.error = RequestFailed(
+                ErrorCode.GENERAL,
+                "The server process which stored the run has exited before "
+                "finishing the store.")
+
+        return task
+
+    def __remove_expired_task_files(self):
+        """
+        Removes the saved states of the tasks which were not changed for
+        longer than the lifetime of the finished tasks, and which are not
+        in progress anymore.
+        """
+        expired_at = time.time() - StoreQueue.FINISHED_TASK_LIFETIME
+        for file_name in os.listdir(self.__task_dir):
+            token, ext = os.path.splitext(file_name)
+            path = os.path.join(self.__task_dir, file_name)
+            try:
+                if ext != '.json' or os.path.getmtime(path) >= expired_at:
+                    continue
+
+                task = self.__load(token)
+                if task is None or task.status in (StoreTaskStatus.COMPLETED,
+                                                   StoreTaskStatus.FAILED):
+                    os.remove(path)
+            except OSError:
+                # The file was removed by another process.
+                pass
+
+    def __remove_expired_tasks(self):
+        """
+        Removes the finished tasks whose outcome does not need to be kept
+        anymore. Must be called with the lock held.
+        """
+        expired_at = time.time() - StoreQueue.FINISHED_TASK_LIFETIME
+        expired = [token for token, task in self.__tasks.items()
+                   if task.is_finished and task.finished_at < expired_at]
+        for token in expired:
+            del self.__tasks[token]
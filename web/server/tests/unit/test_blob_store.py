@@ -0,0 +1,158 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the source blob store. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server.api import store_handler
+from codechecker_server.api.report_server import get_source_file_content
+from codechecker_server.database import db_cleanup
+from codechecker_server.database.blob_store import BlobStore
+from codechecker_server.database.run_db_model import CC_META, FileContent
+
+
+class BlobStoreTest(unittest.TestCase):
+    """
+    Test storing and removing source file contents in the blob store.
+    """
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.mkdtemp()
+        self.__store = BlobStore(os.path.join(self.__tmp_dir, 'blobs'))
+
+    def tearDown(self):
+        shutil.rmtree(self.__tmp_dir)
+
+    def test_put_and_get(self):
+        """
+        Test that the stored contents can be read back.
+        """
+        content = b'int main() {}\n' * 10000
+        compressed = zlib.compress(content, zlib.Z_BEST_COMPRESSION)
+
+        self.assertFalse(self.__store.exists('abcdef'))
+        self.assertEqual(self.__store.put('abcdef', compressed),
+                         len(compressed))
+        self.assertTrue(self.__store.exists('abcdef'))
+        self.assertEqual(self.__store.path('abcdef'),
+                         os.path.join(self.__store.root,
+                                      'ab', 'cd', 'abcdef'))
+        self.assertEqual(b''.join(self.__store.iter_content('abcdef')),
+                         content)
+
+        # Storing the same content again is harmless.
+        self.__store.put('abcdef', compressed)
+        self.assertEqual(list(self.__store.iter_hashes()), ['abcdef'])
+
+        self.__store.remove('abcdef')
+        self.__store.remove('abcdef')
+        self.assertFalse(self.__store.exists('abcdef'))
+        self.assertEqual(list(self.__store.iter_hashes()), [])
+
+    def test_iter_hashes_older_than(self):
+        """
+        Test that recently written blobs are not listed as old ones.
+        """
+        self.__store.put('aaaaaa', zlib.compress(b'a'))
+        self.__store.put('bbbbbb', zlib.compress(b'b'))
+
+        old = os.path.getmtime(self.__store.path('aaaaaa')) - 3600
+        os.utime(self.__store.path('aaaaaa'), (old, old))
+
+        self.assertEqual(sorted(self.__store.iter_hashes()),
+                         ['aaaaaa', 'bbbbbb'])
+        self.assertEqual(list(self.__store.iter_hashes(60)), ['aaaaaa'])
+
+    def test_store_and_cleanup(self):
+        """
+        Test storing file contents into the blob store and removing the
+        blobs which are not referenced by the database.
+        """
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        try:
+            source_file = os.path.join(self.__tmp_dir, 'main.cpp')
+            with open(source_file, 'w') as f:
+                f.write('int main() {}\n')
+
+            session.add(FileContent('db_hash', zlib.compress(b'in db')))
+            session.commit()
+
+            store_handler.add_file_records(
+                session, [('/a/main.cpp', 'blob_hash', source_file)],
+                blob_store=self.__store)
+
+            content = session.query(FileContent).get('blob_hash')
+            self.assertIsNone(content.content)
+            self.assertEqual(content.blob_size,
+                             os.path.getsize(
+                                 self.__store.path('blob_hash')))
+
+            self.assertEqual(
+                get_source_file_content(session, 'blob_hash', self.__store),
+                b'int main() {}\n')
+            self.assertEqual(
+                get_source_file_content(session, 'db_hash', self.__store),
+                b'in db')
+
+            self.__store.put('unused_hash', zlib.compress(b'unused'))
+            old = os.path.getmtime(self.__store.path('unused_hash')) - \
+                2 * db_cleanup.RUN_LOCK_TIMEOUT_IN_DATABASE
+            for content_hash in ['unused_hash', 'blob_hash']:
+                os.utime(self.__store.path(content_hash), (old, old))
+
+            db_cleanup.remove_unused_blobs(session, self.__store)
+
+            self.assertFalse(self.__store.exists('unused_hash'))
+            self.assertTrue(self.__store.exists('blob_hash'))
+        finally:
+            session.close()
+
+    def test_remove_with_records(self):
+        """
+        Test that the blobs are removed together with their file content
+        records, except the recently written ones.
+        """
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        try:
+            session.add(FileContent('db_hash', zlib.compress(b'in db')))
+            for content_hash in ['old_hash', 'new_hash']:
+                size = self.__store.put(content_hash,
+                                        zlib.compress(b'in blob'))
+                session.add(FileContent(content_hash, None, size))
+            session.commit()
+
+            old = os.path.getmtime(self.__store.path('old_hash')) - \
+                2 * db_cleanup.RUN_LOCK_TIMEOUT_IN_DATABASE
+            os.utime(self.__store.path('old_hash'), (old, old))
+
+            unused_blobs = db_cleanup.remove_unused_files(session)
+            self.assertEqual(sorted(unused_blobs), ['new_hash', 'old_hash'])
+            session.commit()
+            self.assertEqual(session.query(FileContent).count(), 0)
+
+            self.assertEqual(
+                db_cleanup.remove_blobs(session, self.__store, unused_blobs),
+                1)
+            self.assertFalse(self.__store.exists('old_hash'))
+            self.assertTrue(self.__store.exists('new_hash'))
+        finally:
+            session.close()
@@ -0,0 +1,88 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the bounded cache of the server. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+from codechecker_server.cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    """
+    Test the limits, the expiry and the invalidation of the cache.
+    """
+
+    def test_limits(self):
+        """
+        The least recently used values are evicted over the limits, and the
+        values over the size limit are not cached.
+        """
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+        cache = LRUCache(max_size=10, get_size=len)
+        cache.put('a', 'x' * 4)
+        cache.put('b', 'x' * 4)
+        cache.put('a', 'x' * 6)
+        self.assertEqual(cache.size, 10)
+
+        cache.put('c', 'x' * 11)
+        self.assertIsNone(cache.get('c'))
+
+        cache.put('c', 'x' * 5)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.size, 5)
+
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 3,
+                                         'entries': 1, 'size': 5})
+
+    def test_expiry(self):
+        """
+        The values expire after their time to live, and nothing is cached
+        with a time to live which is not positive.
+        """
+        cache = LRUCache(ttl=60)
+        cache.put('a', 1)
+        cache.put('b', 2, ttl=-1)
+        cache.put('c', 3, ttl=0)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('c'))
+
+        cache = LRUCache(ttl=0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_invalidation(self):
+        """
+        The invalid values are dropped, and the values loaded before a
+        clear() are not cached.
+        """
+        cache = LRUCache()
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a', lambda value: value == 2))
+        self.assertIsNone(cache.get('a'))
+
+        generation = cache.generation
+        cache.clear()
+        cache.put('a', 1, generation=generation)
+        self.assertIsNone(cache.get('a'))
+
+        cache.put('a', 1, generation=cache.generation)
+        self.assertEqual(cache.get('a'), 1)
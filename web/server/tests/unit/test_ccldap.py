@@ -25,7 +25,9 @@ class CCLDAPTest(unittest.TestCase):
     service_user = ('cn=service_user,ou=example,o=test',
                     {'cn': ['service_user'], 'userPassword': ['servicepw']})
     user2 = ('cn=user2,ou=other,o=test',
-             {'cn': ['user2'], 'userPassword': ['user2pw']})
+             {'cn': ['user2'], 'userPassword': ['user2pw'],
+              'memberOf': ['cn=developers,ou=groups,o=test',
+                           'cn=admins,ou=elsewhere,o=test']})
 
     # This is the content of our mock LDAP directory.
     # It takes the form {dn: {attr: [value, ...], ...}, ...}.
@@ -51,6 +53,8 @@ class CCLDAPTest(unittest.TestCase):
         cls.mockldap = MockLdap(cls.directory)
 
     def setUp(self):
+        cc_ldap.USER_CACHE.clear()
+
         # Patch ldap.initialize
         self.mockldap.start()
         self.ldapobj = self.mockldap['ldap://localhost/']
@@ -151,3 +155,60 @@ class CCLDAPTest(unittest.TestCase):
         Try to authenticate with empty password.
         """
         self.assertFalse(cc_ldap.auth_user(self.ldap_config, 'user2', ''))
+
+    def test_cached_user(self):
+        """
+        The DN of the user is cached, but the password is checked at every
+        login.
+        """
+        self.assertTrue(cc_ldap.auth_user(self.ldap_config,
+                                          'user2',
+                                          'user2pw'))
+        searches = self.ldapobj.methods_called().count('search_s')
+
+        self.assertTrue(cc_ldap.auth_user(self.ldap_config,
+                                          'user2',
+                                          'user2pw'))
+        self.assertFalse(cc_ldap.auth_user(self.ldap_config,
+                                           'user2',
+                                           'wrong_password'))
+        self.assertEqual(self.ldapobj.methods_called().count('search_s'),
+                         searches)
+
+        cc_ldap.USER_CACHE.clear()
+        self.assertTrue(cc_ldap.auth_user(self.ldap_config,
+                                          'user2',
+                                          'user2pw'))
+        self.assertGreater(self.ldapobj.methods_called().count('search_s'),
+                           searches)
+
+    def test_member_of_groups(self):
+        """
+        The groups are read from the account of the user found by the login.
+        """
+        ldap_config = dict(self.ldap_config,
+                           memberOfAttr='memberOf',
+                           groupBase='ou=groups,o=test')
+
+        self.assertTrue(cc_ldap.auth_user(ldap_config, 'user2', 'user2pw'))
+        searches = self.ldapobj.methods_called().count('search_s')
+
+        self.assertEqual(cc_ldap.get_groups(ldap_config, 'user2', 'user2pw'),
+                         ['developers'])
+        self.assertEqual(self.ldapobj.methods_called().count('search_s'),
+                         searches)
+
+    def test_cache_timeout(self):
+        """
+        The default cache timeout is used if the configured one is not an
+        integer.
+        """
+        for timeout in [None, '60', 1.5, True]:
+            ldap_config = dict(self.ldap_config, cacheTimeout=timeout)
+            self.assertEqual(cc_ldap.get_cache_timeout(ldap_config),
+                             cc_ldap.DEFAULT_CACHE_TIMEOUT)
+
+        self.assertEqual(cc_ldap.get_cache_timeout(self.ldap_config),
+                         cc_ldap.DEFAULT_CACHE_TIMEOUT)
+        self.assertEqual(cc_ldap.get_cache_timeout(
+            dict(self.ldap_config, cacheTimeout=0)), 0)
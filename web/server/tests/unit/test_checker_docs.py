@@ -0,0 +1,114 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the cache of the checker documentations. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from codechecker_server.checker_docs import CheckerDocs
+
+
+class CheckerDocsTest(unittest.TestCase):
+    """
+    Test the loading, the ETags and the reloading of the checker
+    documentations.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.map_file = os.path.join(self.tmp_dir, 'checker_doc_map.json')
+        self.__write_map({'core.DivideZero': 'core.DivideZero.md',
+                          'missing.Checker': 'missing.Checker.md'})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __write_map(self, doc_map):
+        with open(self.map_file, 'w') as f:
+            json.dump(doc_map, f)
+
+    def __write_doc(self, name, content):
+        with io.open(os.path.join(self.tmp_dir, name), 'w',
+                     encoding='utf-8') as f:
+            f.write(content)
+
+    def test_documentation(self):
+        """
+        The documentation files are read, and the checkers without
+        documentation get a link to the homepage of their analyzer.
+        """
+        self.__write_doc('core.DivideZero.md', u'# Division by zero \u00f7\n')
+        docs = CheckerDocs(self.tmp_dir, self.map_file, 'v6.10')
+
+        doc = docs.get('core.DivideZero')
+        self.assertEqual(doc.content, u'# Division by zero \u00f7\n')
+        self.assertEqual(doc.data, u'# Division by zero \u00f7\n'
+                         .encode('utf-8'))
+        self.assertIsNone(doc.gzip_data)
+
+        self.assertIn('No documentation found', docs.get('unknown').content)
+        self.assertIn('ClangSA', docs.get('missing.Checker').content)
+        self.assertIn('ClangTidy', docs.get('bugprone-foo').content)
+
+        self.__write_doc('core.DivideZero.md', u'x' * 2048)
+        docs.reload()
+        doc = docs.get('core.DivideZero')
+        self.assertEqual(zlib.decompress(doc.gzip_data, 16 + zlib.MAX_WBITS),
+                         b'x' * 2048)
+        self.assertNotEqual(doc.etag, doc.gzip_etag)
+
+    def test_etag(self):
+        """
+        The ETag changes with the version of the package and with the content
+        of the documentation.
+        """
+        self.__write_doc('core.DivideZero.md', u'Old')
+        docs = CheckerDocs(self.tmp_dir, self.map_file, 'v6.10')
+        etag = docs.get('core.DivideZero').etag
+
+        self.assertEqual(
+            CheckerDocs(self.tmp_dir, self.map_file, 'v6.10')
+            .get('core.DivideZero').etag, etag)
+        self.assertNotEqual(
+            CheckerDocs(self.tmp_dir, self.map_file, 'v6.11')
+            .get('core.DivideZero').etag, etag)
+        self.assertNotEqual(docs.get('unknown').etag, etag)
+
+        self.__write_doc('core.DivideZero.md', u'New')
+        docs.reload()
+        self.assertNotEqual(docs.get('core.DivideZero').etag, etag)
+
+    def test_cache(self):
+        """
+        The documentations are cached until the reload, and the least
+        recently used ones are evicted over the limit.
+        """
+        self.__write_doc('core.DivideZero.md', u'Old')
+        docs = CheckerDocs(self.tmp_dir, self.map_file, 'v6.10', max_docs=2)
+
+        doc = docs.get('core.DivideZero')
+        self.__write_doc('core.DivideZero.md', u'New')
+        self.__write_map({})
+        self.assertIs(docs.get('core.DivideZero'), doc)
+        self.assertEqual(docs.stats()['hits'], 1)
+
+        docs.get('a')
+        docs.get('b')
+        self.assertEqual(docs.stats()['documents'], 2)
+        self.assertIsNot(docs.get('core.DivideZero'), doc)
+
+        docs.reload()
+        self.assertEqual(docs.stats()['documents'], 0)
+        self.assertIn('No documentation found',
+                      docs.get('core.DivideZero').content)
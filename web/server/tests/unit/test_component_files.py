@@ -0,0 +1,112 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the mapping of the source components to their files. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codeCheckerDBAccess_v6.ttypes import ReportFilter, Severity
+
+from codechecker_server.api import report_server
+from codechecker_server.database import component_files
+from codechecker_server.database.run_db_model import CC_META, \
+    ComponentFile, File, Report, Run, SourceComponent
+
+
+class ComponentFilesTest(unittest.TestCase):
+    """
+    Filtering by source components uses the files mapped to the components.
+    """
+
+    components = {'lib': '+/src/lib/*\n-/src/lib/test/*',
+                  'main': '+/src/main.cpp',
+                  'not_test': '-*/test/*'}
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        run = Run('run', '6.0', '')
+        self.session.add(run)
+
+        for name, value in self.components.items():
+            self.session.add(SourceComponent(name, value))
+
+        self.session.flush()
+        self.run_id = run.id
+
+        self.file_ids = self.__add_files(['/src/main.cpp',
+                                          '/src/lib/a.cpp',
+                                          '/src/lib/test/a_test.cpp'])
+
+        for name, value in self.components.items():
+            component_files.update_component_files(self.session, name,
+                                                   value)
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def __add_files(self, file_paths):
+        file_ids = {}
+        for file_path in file_paths:
+            source = File(file_path, 'hash')
+            self.session.add(source)
+            self.session.flush()
+
+            self.session.add(Report(self.run_id, file_path, source.id,
+                                    'msg', 'checker', 'core', 'type', 1, 1,
+                                    Severity.LOW, 'new', datetime.now(), 1))
+            file_ids[file_path] = source.id
+
+        return file_ids
+
+    def __filtered_files(self, component_names):
+        report_filter = ReportFilter(componentNames=component_names)
+        filter_expression = report_server.process_report_filter(
+            self.session, report_filter)
+
+        q = report_server.get_filtered_reports_query(
+            self.session, filter_expression, [self.run_id])
+        return set(r.bug_id for r in q)
+
+    def test_component_filter(self):
+        """
+        The reports are filtered by the files of the components.
+        """
+        self.assertEqual(self.__filtered_files(['lib']),
+                         set(['/src/lib/a.cpp']))
+        self.assertEqual(self.__filtered_files(['main', 'lib']),
+                         set(['/src/main.cpp', '/src/lib/a.cpp']))
+        self.assertEqual(self.__filtered_files(['not_test']),
+                         set(['/src/main.cpp', '/src/lib/a.cpp']))
+        self.assertEqual(self.__filtered_files(['unknown']), set())
+
+    def test_new_files_and_changed_component(self):
+        """
+        New files and changed component values update the mapping.
+        """
+        new_ids = self.__add_files(['/src/lib/b.cpp',
+                                    '/src/lib/test/b_test.cpp'])
+        for row in component_files.get_component_file_rows(
+                self.session, list(new_ids.values())):
+            self.session.add(ComponentFile(**row))
+
+        self.assertEqual(self.__filtered_files(['lib']),
+                         set(['/src/lib/a.cpp', '/src/lib/b.cpp']))
+
+        component_files.update_component_files(self.session, 'lib',
+                                               '+/src/lib/test/*')
+        self.assertEqual(self.__filtered_files(['lib']),
+                         set(['/src/lib/test/a_test.cpp',
+                              '/src/lib/test/b_test.cpp']))
@@ -0,0 +1,86 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the filter of the stored content hashes. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from hashlib import sha256
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server.api import store_handler
+from codechecker_server.database.content_hash_filter import BloomFilter, \
+    ContentHashFilter
+from codechecker_server.database.run_db_model import CC_META, FileContent
+
+
+def content_hash(i):
+    return sha256(str(i).encode('utf-8')).hexdigest()
+
+
+class ContentHashFilterTest(unittest.TestCase):
+    """
+    Test the Bloom filter of the content hashes.
+    """
+
+    def test_bloom_filter(self):
+        """
+        The added values are always found and the false positive rate stays
+        close to the requested one.
+        """
+        bloom_filter = BloomFilter(1000, 0.01)
+
+        added = [content_hash(i) for i in range(1000)]
+        for value in added:
+            bloom_filter.add(value)
+
+        self.assertTrue(all(value in bloom_filter for value in added))
+
+        false_positives = sum(1 for i in range(1000, 11000)
+                              if content_hash(i) in bloom_filter)
+        self.assertLess(false_positives, 300)
+
+    def test_missing_content_hashes(self):
+        """
+        The filter is built from the database and it knows the hashes which
+        are added later.
+        """
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        try:
+            stored = [content_hash(i) for i in range(1200)]
+            for value in stored:
+                session.add(FileContent(value, b''))
+            session.commit()
+
+            hash_filter = ContentHashFilter()
+
+            # Hashes added before the filter is built are not recorded.
+            hash_filter.add(['not_stored'])
+
+            queried = stored[::2] + [content_hash(i)
+                                     for i in range(5000, 6000)]
+            candidates = hash_filter.get_candidates(session, queried)
+
+            self.assertTrue(set(stored[::2]).issubset(candidates))
+            self.assertNotIn('not_stored', candidates)
+            self.assertLess(len(candidates), len(queried))
+            self.assertEqual(
+                store_handler.get_existing_content_hashes(session,
+                                                          candidates),
+                set(stored[::2]))
+
+            hash_filter.add(['new_hash'])
+            self.assertEqual(hash_filter.get_candidates(session,
+                                                        ['new_hash']),
+                             ['new_hash'])
+        finally:
+            session.close()
@@ -0,0 +1,87 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the pooled database engines. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_server import session_manager
+from codechecker_server.database import database
+
+
+class DatabasePoolTest(unittest.TestCase):
+    """
+    Test the connection pool settings of the database engines.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.sql_server = database.SQLiteDatabase(
+            os.path.join(self.tmp_dir, 'test.sqlite'), None, None)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_not_pooled(self):
+        """
+        The connections are not kept open by default.
+        """
+        engine = self.sql_server.create_engine()
+        engine.execute('SELECT 1')
+
+        self.assertEqual(database.get_pool_stats(engine),
+                         {'pool': 'NullPool'})
+        self.assertEqual(engine.execute('PRAGMA journal_mode').scalar(),
+                         'delete')
+        engine.dispose()
+
+    def test_pooled(self):
+        """
+        The pooled connections are reused and use write-ahead logging.
+        """
+        engine = self.sql_server.create_engine({'enabled': True,
+                                                'pool_size': 2})
+
+        connection = engine.connect()
+        self.assertEqual(connection.execute('PRAGMA journal_mode').scalar(),
+                         'wal')
+        self.assertEqual(
+            connection.execute('PRAGMA foreign_keys').scalar(), 1)
+
+        stats = database.get_pool_stats(engine)
+        self.assertEqual(stats['pool'], 'QueuePool')
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['checked_out'], 1)
+
+        connection.close()
+        stats = database.get_pool_stats(engine)
+        self.assertEqual(stats['checked_out'], 0)
+        self.assertEqual(stats['checked_in'], 1)
+        engine.dispose()
+
+    def test_config(self):
+        """
+        The settings of the products override the common settings.
+        """
+        pool_config, product_configs = \
+            session_manager.get_database_pool_config({
+                'database_pool': {
+                    'enabled': True,
+                    'pool_size': 4,
+                    'max_overflow': -1,
+                    'products': {'Default': {'pool_size': 8}}}})
+
+        self.assertEqual(pool_config, {'enabled': True, 'pool_size': 4})
+        self.assertEqual(product_configs, {
+            'Default': {'enabled': True, 'pool_size': 8}})
+
+        self.assertEqual(session_manager.get_database_pool_config({}),
+                         ({}, {}))
@@ -0,0 +1,95 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the watcher of the idle persistent connections. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import socket
+import threading
+import unittest
+
+from codechecker_server.keep_alive import IdleConnections
+
+
+class IdleConnectionsTest(unittest.TestCase):
+    """
+    Test handing back and closing the idle connections.
+    """
+
+    def setUp(self):
+        self.events = []
+        self.event = threading.Event()
+        self.sockets = []
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+
+    def __create_watcher(self, timeout, max_connections=10):
+        def on_readable(request, client_address):
+            self.events.append(('readable', request, client_address))
+            self.event.set()
+
+        def on_close(request):
+            self.events.append(('close', request))
+            self.event.set()
+
+        return IdleConnections(timeout, on_readable, on_close,
+                               max_connections)
+
+    def __socketpair(self):
+        server_side, client_side = socket.socketpair()
+        self.sockets.extend([server_side, client_side])
+        return server_side, client_side
+
+    def test_readable(self):
+        """
+        The connections are handed back when the next request arrives.
+        """
+        watcher = self.__create_watcher(60)
+        server_side, client_side = self.__socketpair()
+
+        self.assertTrue(watcher.add(server_side, 'client'))
+        self.assertEqual(len(watcher), 1)
+
+        client_side.sendall(b'POST / HTTP/1.1\r\n')
+        self.assertTrue(self.event.wait(5))
+        self.assertEqual(self.events, [('readable', server_side, 'client')])
+        self.assertEqual(len(watcher), 0)
+
+        watcher.close()
+
+    def test_timeout(self):
+        """
+        The connections are closed when the idle timeout elapses.
+        """
+        watcher = self.__create_watcher(0.1)
+        server_side, _ = self.__socketpair()
+
+        watcher.add(server_side, 'client')
+        self.assertTrue(self.event.wait(5))
+        self.assertEqual(self.events, [('close', server_side)])
+
+        watcher.close()
+
+    def test_capacity(self):
+        """
+        No more connections are kept open than the limit, and the remaining
+        ones are closed by close().
+        """
+        watcher = self.__create_watcher(60, 1)
+        first, _ = self.__socketpair()
+        second, _ = self.__socketpair()
+
+        self.assertTrue(watcher.has_capacity())
+        self.assertTrue(watcher.add(first, 'first'))
+        self.assertFalse(watcher.has_capacity())
+        self.assertFalse(watcher.add(second, 'second'))
+
+        watcher.close()
+        self.assertEqual(self.events, [('close', first)])
+        self.assertFalse(watcher.add(second, 'second'))
@@ -0,0 +1,180 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the metrics of the API requests. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from codechecker_server import metrics
+from codechecker_server.database import database
+
+
+class MetricsTest(unittest.TestCase):
+    """
+    Test recording and exporting the metrics of the requests.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_database_queries(self):
+        """
+        The queries are recorded in the metrics of the request of the thread
+        which runs them.
+        """
+        sql_server = database.SQLiteDatabase(
+            os.path.join(self.tmp_dir, 'test.sqlite'), None, None)
+        engine = sql_server.create_engine()
+
+        # The queries outside of the requests are not recorded.
+        engine.execute('SELECT 1')
+
+        request_metrics = metrics.Metrics()
+        request = request_metrics.start_request(
+            'CodeCheckerService', 'getRunData', 'Default',
+            keep_statements=True)
+        self.assertIs(metrics.current_request(), request)
+
+        engine.execute('SELECT 1')
+        engine.execute('SELECT 2')
+
+        request_metrics.finish_request(request, 100)
+        self.assertIsNone(metrics.current_request())
+
+        self.assertEqual(request.queries, 2)
+        self.assertGreater(request.db_time, 0)
+        self.assertEqual(sorted(statement for _, statement
+                                in request.statements),
+                         ['SELECT 1', 'SELECT 2'])
+        engine.dispose()
+
+    def test_slowest_statements(self):
+        """
+        Only the slowest statements are kept for the slow request log.
+        """
+        request = metrics.RequestMetrics('Products', 'getProducts', '', True)
+        for i in range(metrics.SLOW_REQUEST_STATEMENTS + 10):
+            request.record_query('SELECT {0}'.format(i), i)
+
+        statements = request.statements
+        self.assertEqual(len(statements), metrics.SLOW_REQUEST_STATEMENTS)
+        self.assertEqual(statements[0][1], 'SELECT {0}'.format(
+            metrics.SLOW_REQUEST_STATEMENTS + 9))
+        self.assertEqual(request.queries, metrics.SLOW_REQUEST_STATEMENTS + 10)
+
+        request = metrics.RequestMetrics('Products', 'getProducts', '', False)
+        request.record_query('SELECT 1', 1)
+        self.assertEqual(request.statements, [])
+
+    def test_export(self):
+        """
+        The histograms and the statistics are exported in the Prometheus
+        text format.
+        """
+        request_metrics = metrics.Metrics()
+        for response_bytes in [100, 2000]:
+            request = request_metrics.start_request(
+                'CodeCheckerService', 'getRunData', 'Default')
+            request.record_query('SELECT 1', 0.2)
+            request_metrics.finish_request(request, response_bytes)
+
+        lines = request_metrics.export([
+            ('codechecker_source_cache', {},
+             {'hits': 3, 'size': 10, 'pool': 'QueuePool'}),
+            ('codechecker_db_pool', {'database': 'config'},
+             {'checked_out': 1})]).splitlines()
+
+        labels = 'endpoint="CodeCheckerService",method="getRunData",' \
+                 'product="Default"'
+        self.assertIn('# TYPE codechecker_response_bytes histogram', lines)
+        self.assertIn('codechecker_response_bytes_bucket{' + labels +
+                      ',le="256"} 1', lines)
+        self.assertIn('codechecker_response_bytes_bucket{' + labels +
+                      ',le="4096"} 2', lines)
+        self.assertIn('codechecker_response_bytes_bucket{' + labels +
+                      ',le="+Inf"} 2', lines)
+        self.assertIn('codechecker_response_bytes_sum{' + labels + '} 2100',
+                      lines)
+        self.assertIn('codechecker_request_queries_count{' + labels + '} 2',
+                      lines)
+        self.assertIn('codechecker_request_db_duration_seconds_bucket{' +
+                      labels + ',le="0.1"} 0', lines)
+        self.assertIn('codechecker_request_db_duration_seconds_bucket{' +
+                      labels + ',le="0.25"} 2', lines)
+
+        self.assertIn('# TYPE codechecker_source_cache_hits_total counter',
+                      lines)
+        self.assertIn('codechecker_source_cache_hits_total 3', lines)
+        self.assertIn('codechecker_source_cache_size 10', lines)
+        self.assertIn('codechecker_db_pool_checked_out{database="config"} 1',
+                      lines)
+        self.assertFalse([line for line in lines if 'QueuePool' in line])
+
+    def test_export_of_processes(self):
+        """
+        The metrics and the statistics of the server processes which share a
+        metrics directory are summed. The gauges of the exited processes are
+        skipped, and the settings are not summed.
+        """
+        request_metrics = metrics.Metrics(
+            os.path.join(self.tmp_dir, 'metrics'),
+            lambda: [('codechecker_source_cache', {},
+                      {'hits': 3, 'size': 10, 'max_size': 100})])
+
+        def record(response_bytes):
+            request = request_metrics.start_request(
+                'CodeCheckerService', 'getRunData', 'Default')
+            request_metrics.finish_request(request, response_bytes)
+
+        pid = os.fork()
+        if not pid:
+            record(100)
+            request_metrics.save()
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        # This process keeps running until the metrics are exported.
+        read_fd, write_fd = os.pipe()
+        running_pid = os.fork()
+        if not running_pid:
+            os.close(write_fd)
+            request_metrics.save()
+            os.read(read_fd, 1)
+            os._exit(0)
+        os.close(read_fd)
+
+        try:
+            metrics_dir = os.path.join(self.tmp_dir, 'metrics')
+            while not os.path.exists(os.path.join(
+                    metrics_dir, '{0}.json'.format(running_pid))):
+                time.sleep(0.01)
+
+            record(2000)
+            lines = request_metrics.export().splitlines()
+        finally:
+            os.close(write_fd)
+            os.waitpid(running_pid, 0)
+
+        labels = 'endpoint="CodeCheckerService",method="getRunData",' \
+                 'product="Default"'
+        self.assertIn('codechecker_response_bytes_bucket{' + labels +
+                      ',le="256"} 1', lines)
+        self.assertIn('codechecker_response_bytes_count{' + labels + '} 2',
+                      lines)
+        self.assertIn('codechecker_response_bytes_sum{' + labels + '} 2100',
+                      lines)
+        self.assertIn('codechecker_source_cache_hits_total 9', lines)
+        self.assertIn('codechecker_source_cache_size 20', lines)
+        self.assertIn('codechecker_source_cache_max_size 100', lines)
@@ -0,0 +1,115 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the cache of the permission decisions. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server import permissions
+from codechecker_server.database.config_db_model import CC_META, Product
+from codechecker_server.session_manager import _Session
+
+
+class PermissionCacheTest(unittest.TestCase):
+    """
+    Test caching and invalidating the decisions of require_permission().
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        product = Product('product', 'sqlite:///product.sqlite')
+        self.session.add(product)
+        self.session.commit()
+
+        self.args = {'config_db_session': self.session,
+                     'productID': product.id}
+        self.user = _Session('token', 'user', ['group'], 300, 60)
+
+        permissions.PERMISSION_CACHE.invalidate()
+
+    def tearDown(self):
+        permissions.PERMISSION_CACHE.invalidate()
+        self.session.close()
+
+    def __has_access(self):
+        return permissions.require_permission(permissions.PRODUCT_ACCESS,
+                                              self.args, self.user)
+
+    def test_cached_decision(self):
+        """
+        The decision is cached until the cache is invalidated.
+        """
+        cache = permissions.PERMISSION_CACHE
+        hits, misses = cache.hits, cache.misses
+
+        self.assertFalse(self.__has_access())
+        self.assertEqual(cache.misses, misses + 1)
+
+        handler = permissions.PRODUCT_STORE(self.session,
+                                            self.args['productID'])
+        handler.add_permission('group', True)
+        self.session.commit()
+
+        # The stale decision is returned until the cache is invalidated.
+        self.assertFalse(self.__has_access())
+        self.assertEqual(cache.hits, hits + 1)
+
+        cache.invalidate()
+        self.assertTrue(self.__has_access())
+
+        # Other users and other products are not affected by the decision.
+        self.user = _Session('token', 'other', [], 300, 60)
+        self.assertFalse(self.__has_access())
+
+        self.args['productID'] += 1
+        self.user = _Session('token', 'user', ['group'], 300, 60)
+        self.assertFalse(self.__has_access())
+
+    def test_expiry(self):
+        """
+        The decisions are not cached longer than the time to live.
+        """
+        cache = permissions.PermissionCache(0, 10)
+        cache.put('key', permissions.PRODUCT_ACCESS, True)
+        self.assertIsNone(cache.get('key', permissions.PRODUCT_ACCESS))
+
+        cache = permissions.PermissionCache(60, 2)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, permissions.PRODUCT_ACCESS, True)
+
+        self.assertLessEqual(cache.stats()['keys'], 2)
+        self.assertTrue(cache.get('c', permissions.PRODUCT_ACCESS))
+        self.assertIsNone(cache.get('c', permissions.PRODUCT_STORE))
+
+    def test_invalidated_decision(self):
+        """
+        A decision made before an invalidation of the cache is not cached.
+        """
+        cache = permissions.PermissionCache(60, 10)
+        generation = cache.generation
+
+        cache.invalidate()
+        cache.put('key', permissions.PRODUCT_ACCESS, True, generation)
+        self.assertIsNone(cache.get('key', permissions.PRODUCT_ACCESS))
+
+        cache.put('key', permissions.PRODUCT_ACCESS, True, cache.generation)
+        self.assertTrue(cache.get('key', permissions.PRODUCT_ACCESS))
+
+    def test_no_authentication(self):
+        """
+        Everything is permitted if the authentication is disabled.
+        """
+        self.user = None
+        self.assertTrue(self.__has_access())
+        self.assertEqual(permissions.PERMISSION_CACHE.stats()['keys'], 0)
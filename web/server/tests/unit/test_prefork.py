@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the master of the forked server processes. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import unittest
+
+from codechecker_server.prefork import WorkerProcesses
+
+
+class WorkerProcessesTest(unittest.TestCase):
+    """
+    Test restarting, reloading and stopping the worker processes.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.handlers = {signum: signal.getsignal(signum) for signum in
+                         [signal.SIGINT, signal.SIGTERM, signal.SIGHUP]}
+        self.reloads = 0
+
+    def tearDown(self):
+        for signum, handler in self.handlers.items():
+            signal.signal(signum, handler)
+        shutil.rmtree(self.tmp_dir)
+
+    def __serve(self):
+        """
+        Records the start and the reloads of the worker in files named after
+        its PID.
+        """
+        pid = str(os.getpid())
+
+        def reload_handler(signum, frame):
+            open(os.path.join(self.tmp_dir, pid + '.reload'), 'w').close()
+
+        signal.signal(signal.SIGHUP, reload_handler)
+        open(os.path.join(self.tmp_dir, pid), 'w').close()
+
+        while True:
+            time.sleep(1)
+
+    def __reload_config(self):
+        self.reloads += 1
+
+    def __wait_for_files(self, suffix, count):
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            files = [f for f in os.listdir(self.tmp_dir) if f.endswith(suffix)]
+            if len(files) >= count:
+                return files
+            time.sleep(0.05)
+
+        self.fail("Timed out waiting for the worker processes.")
+
+    def test_supervise(self):
+        """
+        The exited workers are restarted, the reloads are forwarded to the
+        workers, and the workers are stopped with the master.
+        """
+        processes = WorkerProcesses(2, self.__serve, self.__reload_config)
+        processes.RESTART_DELAY = 0
+        errors = []
+
+        def control():
+            try:
+                started = self.__wait_for_files('', 2)
+                os.kill(int(started[0]), signal.SIGKILL)
+                self.__wait_for_files('', 3)
+
+                os.kill(os.getpid(), signal.SIGHUP)
+                self.__wait_for_files('.reload', 2)
+            except Exception as ex:
+                errors.append(ex)
+            finally:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=control)
+        thread.start()
+        processes.run()
+        thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.reloads, 1)
+
+        files = os.listdir(self.tmp_dir)
+        self.assertEqual(len([f for f in files if '.' not in f]), 3)
+        self.assertEqual(len([f for f in files if f.endswith('.reload')]), 2)
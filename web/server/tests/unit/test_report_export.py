@@ -0,0 +1,149 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the newline-delimited JSON export of the reports. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import json
+import shutil
+import tempfile
+import unittest
+import zlib
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codeCheckerDBAccess_v6.ttypes import Severity
+
+from codechecker_server.api import report_export
+from codechecker_server.database.blob_store import BlobStore
+from codechecker_server.database.run_db_model import BugPathEvent, \
+    CC_META, File, FileContent, Report, ReviewStatus, Run
+
+
+class ReportExportTest(unittest.TestCase):
+    """
+    Test exporting the filtered reports with their details and sources.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        run = Run('run', '6.0', '')
+        other_run = Run('other_run', '6.0', '')
+        self.session.add_all([run, other_run])
+
+        for content_hash in ['hash1', 'hash2']:
+            self.session.add(FileContent(
+                content_hash, zlib.compress(content_hash.encode('utf-8'))))
+
+        main = File('/src/main.cpp', 'hash1')
+        util = File('/src/util.cpp', 'hash2')
+        self.session.add_all([main, util])
+        self.session.flush()
+
+        for i in range(5):
+            report = Report(run.id, 'bug' + str(i), main.id, 'msg',
+                            'checker', 'core', 'type', i, 1,
+                            Severity.HIGH if i % 2 else Severity.LOW,
+                            'new', datetime.now(), 1)
+            self.session.add(report)
+            self.session.flush()
+
+            # The bug paths lead through the other source file.
+            self.session.add(BugPathEvent(1, 1, 1, 1, 0, 'event', util.id,
+                                          report.id))
+
+        self.session.add(Report(other_run.id, 'other', util.id, 'msg',
+                                'checker', 'core', 'type', 1, 1,
+                                Severity.LOW, 'new', datetime.now(), 1))
+
+        self.session.add(ReviewStatus(bug_hash='bug1',
+                                      status='confirmed',
+                                      author='user',
+                                      message=b'',
+                                      date=datetime.now()))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def __export(self, query, with_details=False, with_sources=False,
+                 blob_store=None):
+        run_ids, report_filter = report_export.get_export_filter(
+            self.session, query)
+        data = b''.join(report_export.export_reports(
+            self.session, run_ids, report_filter, with_details,
+            with_sources, blob_store))
+        return [json.loads(line.decode('utf-8'))
+                for line in data.split(b'\n') if line]
+
+    def test_filter(self):
+        """
+        The reports are filtered by the query parameters.
+        """
+        reports = self.__export({'run': ['run'], 'severity': ['high']})
+        self.assertEqual([r['bugHash'] for r in reports], ['bug1', 'bug3'])
+        self.assertEqual(reports[0]['reviewStatus'], 'CONFIRMED')
+        self.assertEqual(reports[1]['reviewStatus'], 'UNREVIEWED')
+        self.assertNotIn('details', reports[0])
+
+        self.assertEqual(len(self.__export({})), 6)
+
+        with self.assertRaises(ValueError):
+            self.__export({'severity': ['unknown']})
+
+    def test_details_and_sources(self):
+        """
+        Every source file is exported once before the first report which
+        refers to it.
+        """
+        original_chunk_size = report_export.EXPORT_CHUNK_SIZE
+        report_export.EXPORT_CHUNK_SIZE = 2
+        try:
+            lines = self.__export({}, True, True)
+        finally:
+            report_export.EXPORT_CHUNK_SIZE = original_chunk_size
+
+        self.assertEqual([line['type'] for line in lines],
+                         ['file', 'file'] + ['report'] * 6)
+        self.assertEqual(sorted(line['content'] for line in lines[:2]),
+                         ['hash1', 'hash2'])
+
+        report = lines[2]
+        self.assertEqual(report['details']['pathEvents'][0]['filePath'],
+                         '/src/util.cpp')
+
+    def test_sources_from_blob_store(self):
+        """
+        The source files in the blob store are streamed into the export in
+        chunks, even if a chunk ends inside a multi-byte character.
+        """
+        content = u'// \u00e1rv\u00edzt\u0171r\u0151 "t\u00fck\u00f6r"\n'
+        tmp_dir = tempfile.mkdtemp()
+        original_chunk_size = BlobStore.READ_CHUNK_SIZE
+        BlobStore.READ_CHUNK_SIZE = 3
+        try:
+            blob_store = BlobStore(tmp_dir)
+            blob_store.put('hash1', zlib.compress(content.encode('utf-8')))
+            self.session.query(FileContent) \
+                .filter(FileContent.content_hash == 'hash1') \
+                .update({'content': None, 'blob_size': 1})
+            self.session.commit()
+
+            lines = self.__export({}, False, True, blob_store)
+        finally:
+            BlobStore.READ_CHUNK_SIZE = original_chunk_size
+            shutil.rmtree(tmp_dir)
+
+        files = dict((line['filePath'], line['content'])
+                     for line in lines if line['type'] == 'file')
+        self.assertEqual(files['/src/main.cpp'], content)
+        self.assertEqual(files['/src/util.cpp'], 'hash2')
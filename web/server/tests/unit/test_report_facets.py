@@ -0,0 +1,178 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test counting the report facets. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime, timedelta
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codeCheckerDBAccess_v6.ttypes import DetectionStatus, DiffType, \
+    ReportFilter, ReviewStatus as ReviewStatusEnum, Severity
+
+from codechecker_server.api import report_server
+from codechecker_server.database.run_db_model import CC_META, File, \
+    Report, ReviewStatus, Run, RunHistory
+
+
+class ReportFacetsTest(unittest.TestCase):
+    """
+    The facets counted on a temporary table of the filtered reports are the
+    same as the facets counted directly on the filtering query.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        now = datetime.now()
+        run = Run('run', '6.0', '')
+        self.session.add(run)
+        self.session.flush()
+
+        self.session.add(RunHistory(run.id, 'v1', 'user',
+                                    now - timedelta(hours=1), None, None))
+
+        main = File('/src/main.cpp', 'hash1')
+        util = File('/src/util.cpp', 'hash2')
+        self.session.add_all([main, util])
+        self.session.flush()
+
+        reports = [
+            ('bug1', main.id, 'core.DivideZero', 'Division by zero',
+             Severity.HIGH, 'new'),
+            ('bug1', main.id, 'core.DivideZero', 'Division by zero',
+             Severity.HIGH, 'unresolved'),
+            ('bug2', util.id, 'core.NullDereference', 'Null dereference',
+             Severity.HIGH, 'new'),
+            ('bug3', util.id, 'deadcode.DeadStores', 'Dead store',
+             Severity.LOW, 'resolved')]
+        for bug_id, file_id, checker, msg, severity, status in reports:
+            self.session.add(Report(run.id, bug_id, file_id, msg, checker,
+                                    'core', 'type', 1, 1, severity, status,
+                                    now - timedelta(days=1), 1))
+
+        self.session.add(ReviewStatus(bug_hash='bug2',
+                                      status='false_positive',
+                                      author='user',
+                                      message=b'',
+                                      date=now))
+
+        # A newer run where bug1 is fixed and bug4 has appeared.
+        new_run = Run('new_run', '6.0', '')
+        self.session.add(new_run)
+        self.session.flush()
+        for bug_id in ['bug2', 'bug3', 'bug4']:
+            self.session.add(Report(new_run.id, bug_id, util.id, 'msg',
+                                    'checker', 'core', 'type', 1, 1,
+                                    Severity.LOW, 'new', now, 1))
+
+        self.session.commit()
+
+        self.run_ids = [run.id]
+        self.new_run_ids = [new_run.id]
+
+    def tearDown(self):
+        self.session.close()
+
+    def __count_facets(self, reports, is_unique):
+        session = self.session
+        return [
+            report_server.get_report_count(session, reports, is_unique),
+            report_server.get_severity_counts(session, reports, is_unique),
+            sorted((c.name, c.severity, c.count) for c in
+                   report_server.get_checker_counts(session, reports,
+                                                    is_unique, None, 0)),
+            report_server.get_checker_msg_counts(session, reports,
+                                                 is_unique, None, 0),
+            dict(report_server.get_review_status_counts(session, reports,
+                                                        is_unique)),
+            report_server.get_detection_status_counts(session, reports),
+            report_server.get_file_counts(session, reports, is_unique,
+                                          None, 0),
+            [(t.name, t.count) for t in
+             report_server.get_run_history_tag_counts(session, reports,
+                                                      is_unique,
+                                                      self.run_ids)]]
+
+    def test_facets(self):
+        """
+        Count every facet of the reports.
+        """
+        for is_unique in [False, True]:
+            report_filter = ReportFilter(isUnique=is_unique)
+            filter_expression = report_server.process_report_filter(
+                self.session, report_filter)
+            reports_q = report_server.get_filtered_reports_query(
+                self.session, filter_expression, self.run_ids)
+
+            direct = self.__count_facets(reports_q.subquery(), is_unique)
+
+            tmp_table = report_server.create_temporary_report_table(
+                self.session, reports_q)
+            try:
+                materialized = self.__count_facets(tmp_table, is_unique)
+            finally:
+                tmp_table.drop(bind=self.session.connection())
+
+            self.assertEqual(direct, materialized)
+
+        report_count, severities, checkers, checker_msgs, review_statuses, \
+            detection_statuses, files, tags = direct
+
+        # The last iteration counted the unique reports.
+        self.assertEqual(report_count, 3)
+        self.assertEqual(severities, {Severity.HIGH: 2, Severity.LOW: 1})
+        self.assertEqual(checkers,
+                         [('core.DivideZero', Severity.HIGH, 1),
+                          ('core.NullDereference', Severity.HIGH, 1),
+                          ('deadcode.DeadStores', Severity.LOW, 1)])
+        self.assertEqual(checker_msgs['Division by zero'], 1)
+        self.assertEqual(review_statuses,
+                         {ReviewStatusEnum.UNREVIEWED: 2,
+                          ReviewStatusEnum.FALSE_POSITIVE: 1})
+        self.assertEqual(detection_statuses,
+                         {DetectionStatus.NEW: 2,
+                          DetectionStatus.UNRESOLVED: 1,
+                          DetectionStatus.RESOLVED: 1})
+        self.assertEqual(files, {'/src/main.cpp': 1, '/src/util.cpp': 2})
+        self.assertEqual(tags, [('v1', 3)])
+
+    def test_run_diff(self):
+        """
+        The comparison of the runs is evaluated by the database.
+        """
+        base = report_server.get_report_hashes(self.session, self.run_ids,
+                                               None)
+        new = report_server.get_report_hashes(self.session,
+                                              self.new_run_ids, None)
+
+        expected = {DiffType.NEW: (set(['bug4']), self.new_run_ids),
+                    DiffType.RESOLVED: (set(['bug1']), self.run_ids),
+                    DiffType.UNRESOLVED: (set(['bug2', 'bug3']),
+                                          self.new_run_ids)}
+
+        for diff_type, (hashes, run_ids) in expected.items():
+            diff_hashes, diff_run_ids = \
+                report_server.get_diff_hashes_for_query(
+                    self.run_ids, base, self.new_run_ids, new, diff_type)
+
+            self.assertEqual(diff_run_ids, run_ids)
+            self.assertEqual(set(h for h, in diff_hashes), hashes)
+
+            filter_expression = report_server.process_report_filter(
+                self.session, None)
+            reports = report_server.get_filtered_reports_query(
+                self.session, filter_expression, diff_run_ids, True,
+                diff_hashes)
+            self.assertEqual(set(r.bug_id for r in reports), hashes)
+
+            self.assertTrue(self.session.query(diff_hashes.exists()).scalar())
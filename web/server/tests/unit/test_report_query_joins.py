@@ -0,0 +1,104 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the joins and the string filters of the report queries. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codeCheckerDBAccess_v6.ttypes import ReportFilter, \
+    ReviewStatus as ReviewStatusEnum
+
+from codechecker_server.api import report_server
+from codechecker_server.database.run_db_model import CC_META, File, \
+    Report, ReviewStatus, Run
+
+
+class ReportQueryJoinsTest(unittest.TestCase):
+    """
+    The files and the review statuses are joined to the report queries only
+    if they are needed.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        run = Run('run', '6.0', '')
+        main = File('/src/main.cpp', 'hash1')
+        self.session.add_all([run, main])
+        self.session.flush()
+
+        for bug_id, checker in [('bug1', 'core.DivideZero'),
+                                ('bug2', 'core.NullDereference'),
+                                ('Bug3', 'deadcode.DeadStores')]:
+            self.session.add(Report(run.id, bug_id, main.id, 'msg', checker,
+                                    'core', 'type', 1, 1, 1, 'new',
+                                    datetime.now(), 1))
+
+        self.session.add(ReviewStatus(bug_hash='bug2',
+                                      status='confirmed',
+                                      author='user',
+                                      message=b'',
+                                      date=datetime.now()))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def __query(self, report_filter):
+        filter_expression = report_server.process_report_filter(
+            self.session, report_filter)
+        return report_server.filter_report_filter(
+            self.session.query(Report.bug_id), filter_expression) \
+            .order_by(Report.bug_id)
+
+    def test_joins(self):
+        """
+        Only the tables needed by the filter are joined.
+        """
+        q = self.__query(ReportFilter(checkerName=['core.*']))
+        self.assertNotIn('JOIN', str(q))
+        self.assertEqual([r[0] for r in q], ['bug1', 'bug2'])
+
+        q = self.__query(ReportFilter(
+            reviewStatus=[ReviewStatusEnum.CONFIRMED]))
+        self.assertIn('JOIN review_statuses', str(q))
+        self.assertNotIn('JOIN files', str(q))
+        self.assertEqual([r[0] for r in q], ['bug2'])
+
+        q = self.__query(ReportFilter(filepath=['*main*']))
+        self.assertIn('JOIN files', str(q))
+        self.assertNotIn('JOIN review_statuses', str(q))
+        self.assertEqual(q.count(), 3)
+
+        q = report_server.join_report_tables(
+            self.session.query(Report.bug_id), File.filepath)
+        self.assertIn('JOIN files', str(q))
+
+    def test_exact_values(self):
+        """
+        The values without wildcards are compared for equality.
+        """
+        q = self.__query(ReportFilter(reportHash=['bug1']))
+        self.assertNotIn('LIKE', str(q).upper())
+        self.assertEqual([r[0] for r in q], ['bug1'])
+
+        q = self.__query(ReportFilter(reportHash=['bug1', 'bug2']))
+        self.assertIn(' IN ', str(q))
+        self.assertEqual([r[0] for r in q], ['bug1', 'bug2'])
+
+        q = self.__query(ReportFilter(reportHash=['bug1', 'bug*']))
+        self.assertEqual([r[0] for r in q], ['Bug3', 'bug1', 'bug2'])
+
+        q = self.__query(ReportFilter(checkerName=['deadcode.DeadStores']))
+        self.assertEqual([r[0] for r in q], ['Bug3'])
@@ -0,0 +1,119 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the maintenance of the run report summaries. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from codeCheckerDBAccess_v6.ttypes import Severity
+
+from codechecker_server.database import report_summary
+from codechecker_server.database.run_db_model import CC_META, File, \
+    Report, ReviewStatus, Run, RunReportSummary
+
+
+class RunReportSummaryTest(unittest.TestCase):
+    """
+    The summaries follow the changes of the review statuses and they are the
+    same as the ones which are rebuilt from the reports.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        run_a = Run('run_a', '6.0', '')
+        run_b = Run('run_b', '6.0', '')
+        source = File('/src/main.cpp', 'hash')
+        self.session.add_all([run_a, run_b, source])
+        self.session.flush()
+
+        reports = [(run_a.id, 'bug1', 'new'),
+                   (run_a.id, 'bug2', 'new'),
+                   (run_a.id, 'bug3', 'resolved'),
+                   (run_b.id, 'bug1', 'unresolved')]
+        for run_id, bug_id, status in reports:
+            self.session.add(Report(run_id, bug_id, source.id, 'msg',
+                                    'checker', 'core', 'type', 1, 1,
+                                    Severity.LOW, status, datetime.now(), 1))
+
+        self.session.add(ReviewStatus(bug_hash='bug2',
+                                      status='false_positive',
+                                      author='user',
+                                      message=b'',
+                                      date=datetime.now()))
+        self.session.commit()
+
+        self.run_a = run_a.id
+        self.run_b = run_b.id
+
+    def tearDown(self):
+        self.session.close()
+
+    def __summaries(self):
+        return set((s.run_id, s.detection_status, s.review_status,
+                    s.report_count)
+                   for s in self.session.query(RunReportSummary)
+                   if s.report_count)
+
+    def test_rebuild(self):
+        """
+        The reports are counted by run, detection and review status.
+        """
+        report_summary.update_run_report_summaries(self.session)
+
+        self.assertEqual(self.__summaries(), set([
+            (self.run_a, 'new', 'unreviewed', 1),
+            (self.run_a, 'new', 'false_positive', 1),
+            (self.run_a, 'resolved', 'unreviewed', 1),
+            (self.run_b, 'unresolved', 'unreviewed', 1)]))
+
+        # Rebuilding a single run keeps the summaries of the others.
+        self.session.query(Report) \
+            .filter(Report.run_id == self.run_a,
+                    Report.detection_status == 'resolved') \
+            .delete(synchronize_session=False)
+        report_summary.update_run_report_summaries(self.session,
+                                                   [self.run_a])
+
+        self.assertEqual(self.__summaries(), set([
+            (self.run_a, 'new', 'unreviewed', 1),
+            (self.run_a, 'new', 'false_positive', 1),
+            (self.run_b, 'unresolved', 'unreviewed', 1)]))
+
+    def test_change_review_status(self):
+        """
+        Changing the review status of a bug moves its reports in every run.
+        """
+        report_summary.update_run_report_summaries(self.session)
+
+        self.session.add(ReviewStatus(bug_hash='bug1',
+                                      status='confirmed',
+                                      author='user',
+                                      message=b'',
+                                      date=datetime.now()))
+        report_summary.change_review_status(self.session, 'bug1', None,
+                                            'confirmed')
+        report_summary.change_review_status(self.session, 'bug2',
+                                            'false_positive',
+                                            'false_positive')
+
+        changed = self.__summaries()
+        self.assertEqual(changed, set([
+            (self.run_a, 'new', 'confirmed', 1),
+            (self.run_a, 'new', 'false_positive', 1),
+            (self.run_a, 'resolved', 'unreviewed', 1),
+            (self.run_b, 'unresolved', 'confirmed', 1)]))
+
+        report_summary.update_run_report_summaries(self.session)
+        self.assertEqual(self.__summaries(), changed)
@@ -11,8 +11,11 @@ from __future__ import absolute_import
 
 import unittest
 
+from codechecker_server.routing import get_public_static_path
+from codechecker_server.routing import split_checker_doc_request
 from codechecker_server.routing import split_client_GET_request
 from codechecker_server.routing import split_client_POST_request
+from codechecker_server.routing import split_export_request
 
 
 def GET(path):
@@ -65,3 +68,55 @@ class request_routingTest(unittest.TestCase):
 
         self.assertEqual(POST('/DummyProduct/v0.0/FoobarService'),
                          ('DummyProduct', '0.0', 'FoobarService'))
+
+    def testExport(self):
+        """
+        Test if the server recognizes the report export requests.
+        """
+
+        product, path = GET('/Default/v6.24/Export?run=a&severity=HIGH')
+        self.assertEqual(product, 'Default')
+        self.assertEqual(split_export_request(path), '6.24')
+
+        self.assertIsNone(split_export_request('Export'))
+        self.assertIsNone(split_export_request('v6/Export'))
+        self.assertIsNone(split_export_request('v6.24/scripts/Export'))
+        self.assertIsNone(split_export_request('index.html'))
+
+    def testPublicStatic(self):
+        """
+        Test if the server recognizes the public static file requests.
+        """
+
+        self.assertEqual(get_public_static_path('/scripts/version.js'),
+                         '/scripts/version.js')
+        self.assertEqual(get_public_static_path('/Default/style/a.css?v=1'),
+                         '/style/a.css')
+        self.assertEqual(get_public_static_path('/Default/login.html'),
+                         '/login.html')
+
+        self.assertIsNone(get_public_static_path('/'))
+        self.assertIsNone(get_public_static_path('/index.html'))
+        self.assertIsNone(get_public_static_path('/Default/'))
+        self.assertIsNone(get_public_static_path('/Default/products.html'))
+        self.assertIsNone(get_public_static_path('/Default/v6.26/Export'))
+
+    def testCheckerDoc(self):
+        """
+        Test if the server recognizes the checker documentation requests.
+        """
+
+        self.assertEqual(
+            split_checker_doc_request('/Default/v6.26/CheckerDoc?checker='
+                                      'core.DivideZero'),
+            ('6.26', 'core.DivideZero'))
+        self.assertEqual(
+            split_checker_doc_request('/v6.26/CheckerDoc?checker=a%2Bb'),
+            ('6.26', 'a+b'))
+        self.assertEqual(split_checker_doc_request('/v6.26/CheckerDoc'),
+                         ('6.26', ''))
+
+        self.assertIsNone(split_checker_doc_request('/v6/CheckerDoc'))
+        self.assertIsNone(split_checker_doc_request('/Default/CheckerDoc'))
+        self.assertIsNone(
+            split_checker_doc_request('/Default/v6.26/CheckerDoc/x'))
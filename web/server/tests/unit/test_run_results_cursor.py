@@ -0,0 +1,116 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the cursor based pagination of the run results. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+import shared
+from codeCheckerDBAccess_v6.ttypes import Order, Severity, SortMode, \
+    SortType
+
+from codechecker_server.api import report_server
+from codechecker_server.database.run_db_model import CC_META, File, \
+    Report, ReviewStatus, Run
+
+
+class RunResultsCursorTest(unittest.TestCase):
+    """
+    Paging the reports by the cursors gives the same reports in the same
+    order as a single query.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        run = Run('run', '6.0', '')
+        main = File('/src/main.cpp', 'hash1')
+        util = File('/src/util.cpp', 'hash2')
+        self.session.add_all([run, main, util])
+        self.session.flush()
+
+        severities = [Severity.HIGH, Severity.LOW, Severity.MEDIUM]
+        for i in range(20):
+            source = main if i % 2 else util
+            self.session.add(Report(run.id, 'bug' + str(i), source.id,
+                                    'msg', 'checker' + str(i % 4), 'core',
+                                    'type', i % 5, 1, severities[i % 3],
+                                    'new', datetime.now(), 1))
+
+        for i, status in [(1, 'false_positive'), (2, 'confirmed'),
+                          (7, 'intentional'), (12, 'confirmed')]:
+            self.session.add(ReviewStatus(bug_hash='bug' + str(i),
+                                          status=status,
+                                          author='user',
+                                          message=b'',
+                                          date=datetime.now()))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def __query(self, keys):
+        q = self.session.query(Report.bug_id, *[c for c, _ in keys]) \
+            .outerjoin(File, Report.file_id == File.id) \
+            .outerjoin(ReviewStatus, ReviewStatus.bug_hash == Report.bug_id)
+
+        for column, order in keys:
+            q = q.order_by(column.asc() if order == Order.ASC
+                           else column.desc())
+        return q
+
+    def test_pages(self):
+        """
+        Page through the reports in different sort orders.
+        """
+        for sort_types in [[SortMode(SortType.SEVERITY, Order.DESC)],
+                           [SortMode(SortType.FILENAME, Order.ASC)],
+                           [SortMode(SortType.REVIEW_STATUS, Order.ASC)],
+                           [SortMode(SortType.REVIEW_STATUS, Order.DESC),
+                            SortMode(SortType.CHECKER_NAME, Order.ASC)]]:
+            sort_types, sort_type_map, _ = \
+                report_server.get_sort_map(sort_types)
+            keys = report_server.get_sort_keys(sort_types, sort_type_map,
+                                               Report.id)
+
+            expected = [r[0] for r in self.__query(keys)]
+
+            paged = []
+            cursor = None
+            while True:
+                q = self.__query(keys)
+                if cursor:
+                    q = q.filter(report_server.get_keyset_filter(
+                        keys, report_server.decode_cursor(cursor, len(keys)),
+                        False))
+
+                page = q.limit(3).all()
+                paged.extend(r[0] for r in page)
+                if len(page) < 3:
+                    break
+
+                cursor = report_server.encode_cursor(page[-1][1:])
+
+            self.assertEqual(paged, expected)
+
+    def test_invalid_cursor(self):
+        """
+        Cursors which do not belong to the sort keys are rejected.
+        """
+        cursor = report_server.encode_cursor([1, 2])
+        self.assertEqual(report_server.decode_cursor(cursor, 2), [1, 2])
+
+        for cursor in [cursor, 'not a cursor']:
+            with self.assertRaises(shared.ttypes.RequestFailed):
+                report_server.decode_cursor(cursor, 3)
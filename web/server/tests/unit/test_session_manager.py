@@ -0,0 +1,198 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the local session store of the session manager. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from codechecker_server import session_manager
+from codechecker_server.database.config_db_model import CC_META, \
+    Session as SessionRecord
+
+
+class SessionManagerTest(unittest.TestCase):
+    """
+    Test looking up, revalidating and cleaning up the sessions.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.auth_string = 'root:secret'
+
+        # The in-memory database is shared with the timer thread which
+        # writes the last access times.
+        engine = sqlalchemy.create_engine(
+            'sqlite://',
+            connect_args={'check_same_thread': False},
+            poolclass=StaticPool)
+        CC_META.create_all(engine)
+        self.database = sessionmaker(bind=engine)
+        self.db_sessions = 0
+
+        self.manager = self.__create_manager(60)
+
+    def __create_manager(self, refresh_time, server_processes=1):
+        config_file = os.path.join(self.tmp_dir, 'server_config.json')
+        with open(config_file, 'w') as config:
+            json.dump({'authentication': {'enabled': True,
+                                          'session_lifetime': 300,
+                                          'refresh_time': refresh_time,
+                                          'logins_until_cleanup': 1},
+                       'server_processes': server_processes},
+                      config)
+        os.chmod(config_file, 0o600)
+
+        manager = session_manager.SessionManager(
+            config_file, 'salt',
+            hashlib.sha256(self.auth_string).hexdigest(), force_auth=True)
+
+        def connect():
+            self.db_sessions += 1
+            return self.database()
+
+        manager.set_database_connection(connect)
+        return manager
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __get_last_access(self, token):
+        transaction = self.database()
+        try:
+            return transaction.query(SessionRecord.last_access) \
+                .filter(SessionRecord.token == token).scalar()
+        finally:
+            transaction.close()
+
+    def test_lookup(self):
+        """
+        The local sessions are found without querying the database, and the
+        unknown tokens are remembered.
+        """
+        session = self.manager.create_or_get_session(self.auth_string)
+        self.assertTrue(session.is_root)
+
+        db_sessions = self.db_sessions
+        self.assertIs(self.manager.get_session(session.token), session)
+        self.assertEqual(self.db_sessions, db_sessions)
+
+        self.assertIsNone(self.manager.get_session('unknown'))
+        db_sessions = self.db_sessions
+        self.assertIsNone(self.manager.get_session('unknown'))
+        self.assertEqual(self.db_sessions, db_sessions)
+
+        # Sessions removed from the memory are loaded from the database.
+        self.assertTrue(self.manager.invalidate_local_session(session.token))
+        self.assertFalse(self.manager.invalidate_local_session(session.token))
+        self.assertEqual(self.manager.get_session(session.token).user,
+                         'root')
+
+    def test_write_behind(self):
+        """
+        The last access times are written to the database in batches.
+        """
+        session = self.manager.create_or_get_session(self.auth_string)
+        stored_last_access = self.__get_last_access(session.token)
+
+        session.last_access = datetime.now() - timedelta(seconds=120)
+        session.revalidate()
+        self.assertGreater(session.last_access, stored_last_access)
+        self.assertEqual(self.__get_last_access(session.token),
+                         stored_last_access)
+
+        self.manager.flush_session_accesses()
+        self.assertEqual(self.__get_last_access(session.token),
+                         session.last_access)
+
+    def test_timed_flush(self):
+        """
+        The last access times are written to the database by a timer even if
+        no other session is accessed.
+        """
+        session = self.manager.create_or_get_session(self.auth_string)
+
+        original_interval = session_manager.SESSION_ACCESS_FLUSH_INTERVAL
+        session_manager.SESSION_ACCESS_FLUSH_INTERVAL = 0.1
+        try:
+            session.last_access = datetime.now() - timedelta(seconds=120)
+            session.revalidate()
+        finally:
+            session_manager.SESSION_ACCESS_FLUSH_INTERVAL = original_interval
+
+        deadline = time.time() + 10
+        while self.__get_last_access(session.token) != session.last_access \
+                and time.time() < deadline:
+            time.sleep(0.05)
+
+        self.assertEqual(self.__get_last_access(session.token),
+                         session.last_access)
+
+    def test_cleanup(self):
+        """
+        The sessions are removed from the memory by the cleanup at login
+        when their refresh time elapses, and they are removed from the
+        database too when they expire.
+        """
+        manager = self.__create_manager(0)
+        session = manager.create_or_get_session(self.auth_string)
+
+        # The session is loaded again from the database.
+        new_session = manager.create_or_get_session(self.auth_string)
+        self.assertIsNot(new_session, session)
+        self.assertEqual(new_session.token, session.token)
+
+        transaction = self.database()
+        transaction.query(SessionRecord).update(
+            {SessionRecord.last_access:
+             datetime.now() - timedelta(seconds=600)})
+        transaction.commit()
+        transaction.close()
+        new_session.last_access = datetime.now() - timedelta(seconds=600)
+
+        # The expired session is replaced by a new one.
+        newest_session = manager.create_or_get_session(self.auth_string)
+        self.assertNotEqual(newest_session.token, session.token)
+        self.assertIsNone(manager.get_session(session.token))
+
+    def test_invalidated_by_other_process(self):
+        """
+        In the multi-process mode the local sessions are checked in the
+        database when their refresh time elapses, so the sessions removed by
+        another server process are not accepted afterwards.
+        """
+        manager = self.__create_manager(60, server_processes=2)
+        other_manager = self.__create_manager(60, server_processes=2)
+
+        session = manager.create_or_get_session(self.auth_string)
+        self.assertIs(manager.get_session(session.token), session)
+        self.assertTrue(other_manager.invalidate(session.token))
+
+        # The session is accepted until its refresh time elapses.
+        self.assertIs(manager.get_session(session.token), session)
+
+        session.last_access = datetime.now() - timedelta(seconds=120)
+        self.assertIsNone(manager.get_session(session.token))
+        self.assertIsNone(manager.get_session(session.token))
+
+        # A session which is still in the database is re-validated.
+        session = manager.create_or_get_session(self.auth_string)
+        session.last_access = datetime.now() - timedelta(seconds=120)
+        self.assertIs(manager.get_session(session.token), session)
+        self.assertGreater(session.last_access,
+                           datetime.now() - timedelta(seconds=60))
@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the cache of the decompressed source files. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+from codechecker_server.source_cache import SourceCache, SourceFile
+
+
+class SourceCacheTest(unittest.TestCase):
+    """
+    Test the line index and the eviction of the source file cache.
+    """
+
+    def test_lines(self):
+        """
+        The lines are the same as the ones of the split content.
+        """
+        for content in [b'', b'a', b'a\n', b'first\n\nthird\nlast',
+                        b'\n\n']:
+            source_file = SourceFile(content)
+            lines = content.split(b'\n')
+
+            self.assertEqual(source_file.line_count, len(lines))
+            for line in range(1, len(lines) + 3):
+                expected = b'' if len(lines) < line else lines[line - 1]
+                self.assertEqual(source_file.get_line(line), expected)
+
+            self.assertEqual(source_file.get_line(0), b'')
+
+    def test_eviction(self):
+        """
+        The least recently used files are evicted over the size limit.
+        """
+        size = SourceFile(b'x' * 100).size
+        cache = SourceCache(2 * size)
+        loads = []
+
+        def get(content_hash):
+            def load():
+                loads.append(content_hash)
+                return content_hash.encode('utf-8') * 100
+            return cache.get(content_hash, load).content
+
+        self.assertEqual(get('a'), b'a' * 100)
+        get('b')
+        get('a')
+        get('c')
+
+        # 'b' was the least recently used file when 'c' was added.
+        get('a')
+        get('b')
+
+        self.assertEqual(loads, ['a', 'b', 'c', 'b'])
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.size, 2 * size)
+
+    def test_disabled(self):
+        """
+        Nothing is cached if the size of the cache is 0.
+        """
+        cache = SourceCache(0)
+        cache.get('a', lambda: b'a')
+        cache.get('a', lambda: b'a')
+
+        self.assertEqual(cache.stats()['files'], 0)
+        self.assertEqual(cache.misses, 2)
@@ -0,0 +1,111 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the cache of the static files. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from codechecker_server.static_cache import StaticFileCache
+
+
+class StaticFileCacheTest(unittest.TestCase):
+    """
+    Test the compression, the caching headers and the invalidation of the
+    static file cache.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __write(self, name, content, mtime=None):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+        return path
+
+    def test_compression(self):
+        """
+        The compressible files are compressed unless they have an up-to-date
+        precompressed sibling.
+        """
+        cache = StaticFileCache()
+        content = b'var x = 1;\n' * 200
+
+        script = cache.get(self.__write('app.js', content))
+        self.assertEqual(script.content, content)
+        self.assertEqual(zlib.decompress(script.gzip_content,
+                                         16 + zlib.MAX_WBITS), content)
+        self.assertNotEqual(script.etag, script.gzip_etag)
+
+        self.assertIsNone(
+            cache.get(self.__write('small.js', b'var x;')).gzip_content)
+        self.assertIsNone(
+            cache.get(self.__write('image.png', content)).gzip_content)
+
+        self.__write('style.css', content, 1000)
+        self.__write('style.css.gz', b'precompressed', 2000)
+        self.assertEqual(
+            cache.get(os.path.join(self.tmp_dir, 'style.css')).gzip_content,
+            b'precompressed')
+
+        self.__write('old.css', content, 2000)
+        self.__write('old.css.gz', b'precompressed', 1000)
+        self.assertNotEqual(
+            cache.get(os.path.join(self.tmp_dir, 'old.css')).gzip_content,
+            b'precompressed')
+
+        self.assertIsNone(cache.get(self.tmp_dir))
+        self.assertIsNone(cache.get(os.path.join(self.tmp_dir, 'missing')))
+
+    def test_cache_control(self):
+        """
+        Only the fingerprinted files can be cached without revalidation.
+        """
+        cache = StaticFileCache()
+
+        self.assertEqual(
+            cache.get(self.__write('app.js', b'x')).cache_control,
+            'no-cache')
+        self.assertIn(
+            'immutable',
+            cache.get(self.__write('app.3f2a9c1d.js', b'x')).cache_control)
+
+    def test_invalidation(self):
+        """
+        The changed files are loaded again, and the least recently used files
+        are evicted over the size limit.
+        """
+        cache = StaticFileCache(max_size=20, max_file_size=10)
+
+        path = self.__write('a.txt', b'aaaa', 1000)
+        etag = cache.get(path).etag
+        self.assertIs(cache.get(path), cache.get(path))
+        self.assertEqual(cache.hits, 2)
+
+        self.__write('a.txt', b'bbbb', 2000)
+        self.assertEqual(cache.get(path).content, b'bbbb')
+        self.assertNotEqual(cache.get(path).etag, etag)
+
+        self.assertIsNone(cache.get(self.__write('large.txt', b'x' * 11)))
+
+        for name in ['b.txt', 'c.txt', 'd.txt', 'e.txt', 'f.txt']:
+            cache.get(self.__write(name, b'xxxx'))
+
+        self.assertLessEqual(cache.size, 20)
+        self.assertEqual(cache.stats()['files'], 5)
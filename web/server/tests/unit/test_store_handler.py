@@ -9,13 +9,20 @@ from __future__ import division
 from __future__ import absolute_import
 
 import os
+import shutil
+import tempfile
 import unittest
 
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
 from codeCheckerDBAccess_v6 import ttypes
 
-from codechecker_common import plist_parser
+from codechecker_common import plist_parser, skiplist_handler
 
 from codechecker_server.api import store_handler
+from codechecker_server.database.run_db_model import CC_META, File, \
+    FileContent
 
 
 class StoreHandler(unittest.TestCase):
@@ -144,3 +151,128 @@ class StoreHandler(unittest.TestCase):
                                                              files)
         self.assertEqual(path, report3_path)
         self.assertEqual(events, report3_events)
+
+    def test_parse_report_file(self):
+        """
+        Test the pre-processing of the reports of a plist file before store.
+        """
+        clang50_trunk_plist = os.path.join(
+            self.__plist_test_files, 'clang-5.0-trunk.plist')
+        files, reports = plist_parser.parse_plist_file(clang50_trunk_plist,
+                                                       None,
+                                                       False)
+
+        file_ids = {}
+        for i, file_name in enumerate(files, 1):
+            file_ids[file_name] = i
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            plist_file = os.path.join(tmp_dir, 'clang-5.0-trunk.plist')
+            shutil.copy(clang50_trunk_plist, plist_file)
+
+            skip_handler = skiplist_handler.SkipListHandler()
+            parsed_reports = store_handler.parse_report_file(plist_file,
+                                                             tmp_dir,
+                                                             file_ids,
+                                                             skip_handler)
+            self.assertEqual(len(parsed_reports), len(reports))
+
+            path1, events1, _ = store_handler.collect_paths_events(
+                reports[0], file_ids, files)
+            self.assertEqual(parsed_reports[0].bug_paths, path1)
+            self.assertEqual(parsed_reports[0].bug_events, events1)
+            self.assertEqual(parsed_reports[0].main['check_name'],
+                             reports[0].main['check_name'])
+
+            # Source files are not available in the temporary directory.
+            self.assertIsNone(parsed_reports[0].src_comment_data)
+
+            skip_handler = skiplist_handler.SkipListHandler("-*")
+            parsed_reports = store_handler.parse_report_file(plist_file,
+                                                             tmp_dir,
+                                                             file_ids,
+                                                             skip_handler)
+            self.assertEqual(parsed_reports, [])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_parse_report_files_in_parallel(self):
+        """
+        Parsing the report files in a pool of worker processes should give
+        the same result in the same order as parsing them one by one.
+        """
+        plists = ['clang-3.7.plist', 'clang-3.8-trunk.plist',
+                  'clang-4.0.plist', 'clang-5.0-trunk.plist']
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_ids = {}
+            for plist in plists:
+                plist_file = os.path.join(tmp_dir, plist)
+                shutil.copy(os.path.join(self.__plist_test_files, plist),
+                            plist_file)
+
+                files, _ = plist_parser.parse_plist_file(plist_file, None,
+                                                         False)
+                for file_name in files:
+                    file_ids.setdefault(file_name, len(file_ids) + 1)
+
+            serial = store_handler.parse_report_files(tmp_dir, tmp_dir,
+                                                      file_ids, "")
+
+            pool = store_handler.ReportParserPool(2)
+            try:
+                parallel = store_handler.parse_report_files(
+                    tmp_dir, tmp_dir, file_ids, "", pool)
+            finally:
+                pool.terminate()
+
+            self.assertEqual(len(serial), len(plists))
+            self.assertEqual([[r.path_hash for r in reports]
+                              for reports in serial],
+                             [[r.path_hash for r in reports]
+                              for reports in parallel])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_add_file_records(self):
+        """
+        Test adding file records and file contents in batches.
+        """
+        engine = sqlalchemy.create_engine('sqlite://')
+        CC_META.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            source_file = os.path.join(tmp_dir, 'main.cpp')
+            with open(source_file, 'w') as f:
+                f.write('int main() {}\n')
+
+            session.add(FileContent('stored_hash', b'content'))
+            session.commit()
+
+            files = [('/a/main.cpp', 'new_hash', source_file),
+                     ('/b/main.cpp', 'new_hash', source_file),
+                     ('/a/stored.cpp', 'stored_hash', None),
+                     ('/a/missing.cpp', 'missing_hash', None)]
+
+            file_ids = store_handler.add_file_records(session, files)
+
+            self.assertEqual(len(file_ids), 3)
+            self.assertNotIn(('/a/missing.cpp', 'missing_hash'), file_ids)
+            self.assertEqual(session.query(FileContent).count(), 2)
+            self.assertEqual(session.query(File).count(), 3)
+
+            record = session.query(File).get(
+                file_ids[('/b/main.cpp', 'new_hash')])
+            self.assertEqual(record.filename, 'main.cpp')
+
+            # Adding the same files again should not create new records.
+            self.assertEqual(store_handler.add_file_records(session, files),
+                             file_ids)
+            self.assertEqual(session.query(File).count(), 3)
+        finally:
+            session.close()
+            shutil.rmtree(tmp_dir)
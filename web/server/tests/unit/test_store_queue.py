@@ -0,0 +1,176 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Test the store queue of the server. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from codeCheckerDBAccess_v6.ttypes import StoreTaskStatus
+from shared.ttypes import ErrorCode, RequestFailed
+
+from codechecker_server.store_queue import StoreQueue
+
+
+class StoreQueueTest(unittest.TestCase):
+    """
+    Test the scheduling of the store operations.
+    """
+
+    def setUp(self):
+        self.__queue = StoreQueue(2)
+
+    def tearDown(self):
+        self.__queue.terminate()
+
+    def test_same_run_serialized(self):
+        """
+        Stores into the same run are executed one after the other, in the
+        order of their submission.
+        """
+        release = threading.Event()
+        order = []
+
+        def store(run_id):
+            def func():
+                if run_id == 1:
+                    release.wait(10)
+                order.append(run_id)
+                return run_id
+            return func
+
+        tasks = [self.__queue.submit(1, 'run', store(i)) for i in (1, 2, 3)]
+
+        self.assertFalse(tasks[1].wait(0.1))
+        self.assertEqual(tasks[1].status, StoreTaskStatus.ENQUEUED)
+
+        release.set()
+        for task in tasks:
+            self.assertTrue(task.wait(10))
+            self.assertEqual(task.status, StoreTaskStatus.COMPLETED)
+
+        self.assertEqual(order, [1, 2, 3])
+        self.assertEqual([t.run_id for t in tasks], [1, 2, 3])
+
+    def test_different_runs_concurrent(self):
+        """
+        Stores into different runs do not wait for each other.
+        """
+        release = threading.Event()
+        blocked = self.__queue.submit(1, 'run_a', lambda: release.wait(10))
+        other = self.__queue.submit(1, 'run_b', lambda: 42)
+
+        self.assertTrue(other.wait(10))
+        self.assertEqual(other.run_id, 42)
+        self.assertFalse(blocked.is_finished)
+
+        release.set()
+        self.assertTrue(blocked.wait(10))
+
+    def test_failure_and_lookup(self):
+        """
+        The error of a failed store is kept, and the tasks can be looked up
+        only by the product they belong to.
+        """
+        def fail():
+            raise ValueError("broken")
+
+        task = self.__queue.submit(1, 'run', fail)
+        self.assertTrue(task.wait(10))
+        self.assertEqual(task.status, StoreTaskStatus.FAILED)
+        self.assertIsInstance(task.error, ValueError)
+
+        self.assertIs(self.__queue.get(1, task.token), task)
+        self.assertIsNone(self.__queue.get(2, task.token))
+        self.assertIsNone(self.__queue.get(1, 'unknown'))
+
+        # The failure does not block the next store into the same run.
+        task = self.__queue.submit(1, 'run', lambda: 1)
+        self.assertTrue(task.wait(10))
+        self.assertEqual(task.status, StoreTaskStatus.COMPLETED)
+
+
+class SharedStoreQueueTest(unittest.TestCase):
+    """
+    Test the store queues of the server processes which share their task
+    directory.
+    """
+
+    def setUp(self):
+        self.__task_dir = tempfile.mkdtemp()
+        self.__queues = [StoreQueue(1, self.__task_dir) for _ in range(2)]
+
+    def tearDown(self):
+        for queue in self.__queues:
+            queue.terminate()
+        shutil.rmtree(self.__task_dir)
+
+    def test_task_of_other_process(self):
+        """
+        The state of a task can be queried from the other store queue.
+        """
+        release = threading.Event()
+        task = self.__queues[0].submit(1, 'run', lambda: release.wait(10))
+
+        other = self.__queues[1].get(1, task.token)
+        self.assertIsNotNone(other)
+        self.assertFalse(other.is_finished)
+        self.assertIsNone(self.__queues[1].get(2, task.token))
+
+        release.set()
+        self.assertTrue(task.wait(10))
+
+        other = self.__queues[1].get(1, task.token)
+        self.assertEqual(other.status, StoreTaskStatus.COMPLETED)
+        self.assertTrue(other.run_id)
+        self.assertTrue(other.is_finished)
+
+    def test_failure_of_other_process(self):
+        """
+        The error of a failed task is reported by the other store queue.
+        """
+        def fail():
+            raise RequestFailed(
+                ErrorCode.SOURCE_FILE, "broken", ["info"])
+
+        task = self.__queues[0].submit(1, 'run', fail)
+        self.assertTrue(task.wait(10))
+
+        other = self.__queues[1].get(1, task.token)
+        self.assertEqual(other.status, StoreTaskStatus.FAILED)
+        self.assertEqual(other.error.errorCode,
+                         ErrorCode.SOURCE_FILE)
+        self.assertEqual(other.error.message, "broken")
+        self.assertEqual(other.error.extraInfo, ["info"])
+
+    def test_exited_process(self):
+        """
+        An unfinished task of a process which has exited is reported as
+        failed.
+        """
+        pid = os.fork()
+        if not pid:
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        token = 'a' * 32
+        with open(os.path.join(self.__task_dir, token + '.json'), 'w') as f:
+            json.dump({'token': token, 'product_id': 1, 'run_name': 'run',
+                       'status': StoreTaskStatus.RUNNING,
+                       'enqueued_at': 0, 'finished_at': None, 'run_id': None,
+                       'pid': pid, 'error': None}, f)
+
+        task = self.__queues[0].get(1, token)
+        self.assertEqual(task.status, StoreTaskStatus.FAILED)
+        self.assertTrue(task.error.message)
+
+        self.assertIsNone(self.__queues[0].get(1, '../' + token))
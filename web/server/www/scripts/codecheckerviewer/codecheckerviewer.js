@@ -241,13 +241,14 @@ function (declare, cookie, topic, Lightbox, Dialog, Button, BorderContainer,
             },
           };
 
-      try {
-        CC_SERVICE.getCheckerDoc(checkerId, function (documentation) {
+      // The documentations are fetched by plain GET requests, so the browser
+      // can cache them and revalidate them by their ETag.
+      $.get('v' + CC_API_VERSION + '/CheckerDoc', { checker : checkerId },
+        function (documentation) {
           docDialog.set('title', 'Documentation for <b>' + checkerId + '</b>');
           docDialog.set('content', marked(documentation, markedOptions));
           docDialog.show();
-        });
-      } catch (ex) { util.handleThriftException(ex); }
+        }, 'text').fail(function (xhr) { util.handleAjaxFailure(xhr); });
     });
 
     topic.subscribe('showReviewComment', function (reviewData) {
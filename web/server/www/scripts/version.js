@@ -1,2 +1,2 @@
-CC_API_VERSION = '6.21';
+CC_API_VERSION = '6.26';
 CC_AUTH_COOKIE_NAME = '__ccPrivilegedAccessToken';
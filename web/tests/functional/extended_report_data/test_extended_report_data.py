@@ -81,3 +81,18 @@ class TestExtendedReportData(unittest.TestCase):
 
         file_name = os.path.basename(extended_data.filePath)
         self.assertEqual(file_name, "macros.cpp")
+
+    def test_report_details_batch(self):
+        """
+        Test whether the details of multiple reports can be queried at once.
+        """
+        reports = self.__get_run_results('notes') + \
+            self.__get_run_results('macros')
+        report_ids = [report.reportId for report in reports]
+
+        details = self._cc_client.getReportDetailsBatch(report_ids)
+        self.assertEqual(set(details.keys()), set(report_ids))
+
+        for report_id in report_ids:
+            self.assertEqual(details[report_id],
+                             self._cc_client.getReportDetails(report_id))